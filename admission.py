@@ -0,0 +1,425 @@
+"""
+Admission control and resource limits for parsing uploads.
+
+check_upload looks only at cheap metadata before any parser runs: the
+byte size, a PDF's declared page count and object count, a DOCX's zip
+directory (entry count, sizes, compression ratios). Anything over the
+limits is refused with an UploadRejected that says why.
+
+Files that pass are parsed in worker processes with a memory cap
+(RLIMIT_AS, for the life of the worker) and a CPU-time cap per job
+(RLIMIT_CPU, moved forward before every job). Going over either ends
+that job with an UploadRejected, not the whole server. The limit
+exceptions derive from BaseException so a parser's own broad
+`except Exception` can't swallow them. Sandbox is a
+small pool of such workers for callers that parse in-process otherwise
+(the Streamlit app); the upload API and the screening CLI already run on
+a pool and install the same limits in their workers.
+"""
+import contextlib
+import multiprocessing
+import os
+import queue
+import re
+import signal
+import threading
+import time
+import zipfile
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import instrumentation
+from extraction import DOCX_MIME, MAX_BYTES, MAX_DOCX_XML_BYTES, MAX_PAGES, PDF_MIME, ExtractionLimitError
+
+MAX_PDF_OBJECTS = int(os.environ.get("RESUME_MAX_PDF_OBJECTS", 200_000))
+MAX_ZIP_ENTRIES = int(os.environ.get("RESUME_MAX_ZIP_ENTRIES", 1000))
+MAX_ZIP_RATIO = float(os.environ.get("RESUME_MAX_ZIP_RATIO", 100))
+MAX_ZIP_BYTES = int(os.environ.get("RESUME_MAX_ZIP_BYTES", 256 * 1024 * 1024))
+# Small XML parts compress very well, so the ratio is only checked above this
+RATIO_MIN_BYTES = 1024 * 1024
+
+SANDBOX_MEMORY_MB = int(os.environ.get("RESUME_SANDBOX_MEMORY_MB", 1024))
+SANDBOX_CPU_SECONDS = float(os.environ.get("RESUME_SANDBOX_CPU_SECONDS", 30))
+SANDBOX_TIMEOUT = float(os.environ.get("RESUME_SANDBOX_TIMEOUT_SECONDS", 60))
+# Extra wait in the parent for a worker to report its own timeout
+TIMEOUT_GRACE = 5
+SANDBOX_WORKERS = int(os.environ.get("RESUME_SANDBOX_WORKERS", min(os.cpu_count() or 1, 4)))
+
+_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+_SIZE = re.compile(rb"/Size\s+(\d+)")
+_PAGES = re.compile(rb"/Type\s*/Pages\b")
+_COUNT = re.compile(rb"/Count\s+(\d+)")
+
+
+class UploadRejected(Exception):
+    """
+    An upload that was refused or could not be parsed.
+
+    reason is a short code (file_too_large, unsupported_type, not_a_pdf,
+    too_many_pages, too_many_objects, not_a_docx, too_many_entries,
+    encrypted, compression_ratio, uncompressed_too_large, too_much_text,
+    limit_exceeded, memory_limit, cpu_limit, timeout, crashed, unreadable), message
+    is for people, details has the numbers behind the decision.
+    """
+
+    def __init__(self, reason, message, **details):
+        super().__init__(message)
+        self.reason = reason
+        self.message = message
+        self.details = details
+
+    def __reduce__(self):
+        # Keeps details when the rejection crosses a process boundary
+        return _rebuild_rejection, (self.reason, self.message, self.details)
+
+    def to_dict(self):
+        return {"reason": self.reason, "message": self.message, **self.details}
+
+
+def _rebuild_rejection(reason, message, details):
+    return UploadRejected(reason, message, **details)
+
+
+# BaseException, like KeyboardInterrupt: raised from a signal handler at
+# any point in the parser, and only guarded() may turn them into a result
+class CpuLimitExceeded(BaseException):
+    pass
+
+
+class TimeLimitExceeded(BaseException):
+    pass
+
+
+LIMIT_ERRORS = (CpuLimitExceeded, TimeLimitExceeded)
+
+
+def check_pdf(data, max_pages=MAX_PAGES, max_objects=MAX_PDF_OBJECTS):
+    """
+    Declared page and object counts of a PDF, read with regexes instead of
+    a parser. Counts hidden in compressed object streams can't be seen this
+    way; the page limit is checked again by the extractor in that case.
+    """
+    if b"%PDF-" not in data[:1024]:
+        raise UploadRejected("not_a_pdf", "File is not a PDF")
+
+    startxref = _STARTXREF.findall(data[-2048:])
+    if startxref and int(startxref[-1]) >= len(data):
+        raise UploadRejected("unreadable", "PDF cross-reference offset points past the end of the file")
+
+    objects = max((int(size) for size in _SIZE.findall(data)), default=0)
+    if max_objects is not None and objects > max_objects:
+        raise UploadRejected("too_many_objects", f"PDF declares {objects} objects, limit is {max_objects}",
+                             objects=objects, limit=max_objects)
+
+    # /Count of every page tree node, looked up within its own object
+    pages = 0
+    for match in _PAGES.finditer(data):
+        start = data.rfind(b" obj", 0, match.start())
+        end = data.find(b"endobj", match.end())
+        if start < 0 or end < 0:
+            continue
+        pages = max([pages] + [int(count) for count in _COUNT.findall(data, start, end)])
+    if max_pages is not None and pages > max_pages:
+        raise UploadRejected("too_many_pages", f"PDF has {pages} pages, limit is {max_pages} pages",
+                             pages=pages, limit=max_pages)
+
+
+def check_docx(data, max_entries=MAX_ZIP_ENTRIES, max_ratio=MAX_ZIP_RATIO,
+               max_zip_bytes=MAX_ZIP_BYTES, max_xml_bytes=MAX_DOCX_XML_BYTES):
+    """
+    Zip directory checks for a DOCX; nothing is decompressed
+    """
+    if not data.startswith(b"PK\x03\x04"):
+        raise UploadRejected("not_a_docx", "File is not a Word document")
+    try:
+        with zipfile.ZipFile(BytesIO(data)) as archive:
+            entries = archive.infolist()
+    except zipfile.BadZipFile as e:
+        raise UploadRejected("not_a_docx", f"File is not a Word document: {e}")
+
+    if len(entries) > max_entries:
+        raise UploadRejected("too_many_entries", f"DOCX has {len(entries)} parts, limit is {max_entries}",
+                             entries=len(entries), limit=max_entries)
+    if not any(info.filename == "[Content_Types].xml" for info in entries):
+        raise UploadRejected("not_a_docx", "File is not a Word document: no [Content_Types].xml")
+
+    total = xml = 0
+    for info in entries:
+        if info.flag_bits & 0x1:
+            raise UploadRejected("encrypted", "DOCX is encrypted")
+        ratio = info.file_size / max(info.compress_size, 1)
+        if info.file_size > RATIO_MIN_BYTES and ratio > max_ratio:
+            raise UploadRejected("compression_ratio",
+                                 f"{info.filename} expands {ratio:.0f}x, limit is {max_ratio:.0f}x",
+                                 part=info.filename, ratio=round(ratio, 1), limit=max_ratio)
+        total += info.file_size
+        if info.filename.endswith(".xml"):
+            xml += info.file_size
+
+    if max_zip_bytes is not None and total > max_zip_bytes:
+        raise UploadRejected("uncompressed_too_large", f"DOCX expands to {total} bytes, limit is {max_zip_bytes}",
+                             uncompressed=total, limit=max_zip_bytes)
+    if max_xml_bytes is not None and xml > max_xml_bytes:
+        raise UploadRejected("too_much_text", f"DOCX text is {xml} bytes uncompressed, limit is {max_xml_bytes}",
+                             uncompressed=xml, limit=max_xml_bytes)
+
+
+def check_upload(data, file_type, max_bytes=MAX_BYTES, max_pages=MAX_PAGES, **_):
+    """
+    Refuse an upload from its metadata alone. Extra keyword arguments
+    (the extractor's limits) are accepted and ignored.
+    """
+    if max_bytes is not None and len(data) > max_bytes:
+        raise UploadRejected("file_too_large", f"File is {len(data)} bytes, limit is {max_bytes} bytes",
+                             size=len(data), limit=max_bytes)
+    if file_type == PDF_MIME:
+        check_pdf(data, max_pages)
+    elif file_type == DOCX_MIME:
+        check_docx(data)
+    else:
+        raise UploadRejected("unsupported_type", "Only PDF and DOCX files are supported", file_type=file_type)
+
+
+def rejection_for(error):
+    """
+    UploadRejected describing an exception raised while parsing
+    """
+    if isinstance(error, UploadRejected):
+        return error
+    if isinstance(error, ExtractionLimitError):
+        return UploadRejected("limit_exceeded", str(error))
+    if isinstance(error, MemoryError):
+        if _worker_memory_mb is None:
+            return UploadRejected("memory_limit", "Parsing ran out of memory")
+        return UploadRejected("memory_limit", f"Parsing needed more than {_worker_memory_mb} MB of memory",
+                              limit_mb=_worker_memory_mb)
+    if isinstance(error, TimeLimitExceeded):
+        return UploadRejected("timeout", f"Parsing took longer than {error.args[0]:g}s", limit_seconds=error.args[0])
+    if isinstance(error, CpuLimitExceeded):
+        return UploadRejected("cpu_limit", f"Parsing used more than {error.args[0]:g}s of CPU time",
+                              limit_seconds=error.args[0])
+    return UploadRejected("unreadable", f"Could not read the file: {error}")
+
+
+# Address space cap of this process, when it is a limited worker
+_worker_memory_mb = None
+
+
+def limit_worker(memory_mb=SANDBOX_MEMORY_MB):
+    """
+    Pool initializer: cap the worker's address space. Only on platforms
+    with the resource module.
+    """
+    global _worker_memory_mb
+    try:
+        import resource
+    except ImportError:
+        return
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+        _worker_memory_mb = memory_mb
+
+
+@contextlib.contextmanager
+def cpu_limit(seconds=SANDBOX_CPU_SECONDS):
+    """
+    Allow the current process `seconds` more CPU time. RLIMIT_CPU counts
+    the whole life of the process, so the soft limit is set relative to
+    what has been used so far and lifted again afterwards.
+    """
+    try:
+        import resource
+    except ImportError:
+        yield
+        return
+    if not seconds or threading.current_thread() is not threading.main_thread():
+        # SIGXCPU handlers only run in the main thread
+        yield
+        return
+    def _raise_cpu_limit(signum, frame):
+        raise CpuLimitExceeded(seconds)
+
+    signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    soft = int(usage.ru_utime + usage.ru_stime + seconds) + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    """
+    Raise TimeLimitExceeded after `seconds` of wall time. SIGALRM only
+    exists on Unix and is only delivered to the main thread; elsewhere
+    there is no limit.
+    """
+    if not seconds or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _raise_time_limit(signum, frame):
+        raise TimeLimitExceeded(seconds)
+
+    signal.signal(signal.SIGALRM, _raise_time_limit)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def guarded(fn, *args, cpu_seconds=SANDBOX_CPU_SECONDS, timeout=None, **kwargs):
+    """
+    Run fn in a limited worker, with an optional wall-clock timeout.
+    Hitting a limit, or any parser error, raises UploadRejected.
+    """
+    try:
+        with time_limit(timeout), cpu_limit(cpu_seconds):
+            return fn(*args, **kwargs)
+    except (Exception, *LIMIT_ERRORS) as e:
+        raise rejection_for(e) from None
+
+
+def _sandboxed(fn, args, kwargs, cpu_seconds, timeout):
+    result = guarded(fn, *args, cpu_seconds=cpu_seconds, timeout=timeout, **kwargs)
+    return result, instrumentation.drain() if instrumentation.is_enabled() else None
+
+
+def _sandboxed_stream(fn, args, kwargs, cpu_seconds, timeout, results):
+    # Items go out through a manager queue as fn yields them; None ends
+    # the stream, the job's own result says whether it failed
+    try:
+        with time_limit(timeout), cpu_limit(cpu_seconds):
+            for item in fn(*args, **kwargs):
+                results.put(item)
+    except (Exception, *LIMIT_ERRORS) as e:
+        raise rejection_for(e) from None
+    finally:
+        results.put(None)
+    return instrumentation.drain() if instrumentation.is_enabled() else None
+
+
+class Sandbox:
+    """
+    Pool of spawned, resource-limited worker processes for parsing.
+
+    A job gets timeout seconds of wall time in its worker; a worker that
+    doesn't stop by itself a few seconds later (stuck in C code, where
+    the alarm can't interrupt it) is killed along with its pool.
+    """
+
+    def __init__(self, workers=SANDBOX_WORKERS, memory_mb=SANDBOX_MEMORY_MB, cpu_seconds=SANDBOX_CPU_SECONDS,
+                 timeout=SANDBOX_TIMEOUT):
+        self.workers = workers
+        self.memory_mb = memory_mb
+        self.cpu_seconds = cpu_seconds
+        self.timeout = timeout
+        self._pool = None
+        self._manager = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the Streamlit server is multi-threaded
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=limit_worker,
+                    initargs=(self.memory_mb,)
+                )
+            return self._pool
+
+    def _reset(self, pool, kill=False):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        processes = list((pool._processes or {}).values()) if kill else []
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def _deadline(self):
+        return time.monotonic() + self.timeout + TIMEOUT_GRACE if self.timeout else None
+
+    def _result(self, pool, future, deadline):
+        """
+        future's result, or UploadRejected when it failed or ran past
+        deadline
+        """
+        try:
+            return future.result(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+        except TimeoutError:
+            # Still waiting for a worker is not the job's fault, but it
+            # has had its time all the same
+            if not future.cancel() and not future.done():
+                self._reset(pool, kill=True)
+            raise UploadRejected("timeout", f"Parsing took longer than {self.timeout:g}s",
+                                 limit_seconds=self.timeout)
+        except CancelledError:
+            # Queued on a pool that another job's timeout took down
+            raise UploadRejected("crashed", "The parser was restarted while the file was waiting")
+        except BrokenProcessPool:
+            # Killed by the kernel (hard limit, OOM) or crashed in C code
+            self._reset(pool)
+            raise UploadRejected("crashed", "The parser process died while reading the file")
+
+    def run(self, fn, *args, **kwargs):
+        """
+        fn(*args, **kwargs) in a worker; fn and its arguments must be
+        picklable. Raises UploadRejected if the job hit a limit, failed,
+        or took its worker down.
+        """
+        pool = self._get_pool()
+        deadline = self._deadline()
+        future = pool.submit(_sandboxed, fn, args, kwargs, self.cpu_seconds, self.timeout)
+        result, stats = self._result(pool, future, deadline)
+        if stats:
+            instrumentation.merge(stats)
+        return result
+
+    def stream(self, fn, *args, **kwargs):
+        """
+        Like run() for a generator function: yields what fn yields in the
+        worker, as soon as it is produced
+        """
+        pool = self._get_pool()
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+            results = self._manager.Queue()
+        deadline = self._deadline()
+        future = pool.submit(_sandboxed_stream, fn, args, kwargs, self.cpu_seconds, self.timeout, results)
+        while True:
+            try:
+                item = results.get(timeout=0.1)
+            except queue.Empty:
+                # A worker that died never sends the end marker
+                if future.done() and results.empty():
+                    break
+                if deadline is not None and time.monotonic() > deadline:
+                    break
+                continue
+            if item is None:
+                break
+            yield item
+        stats = self._result(pool, future, deadline)
+        if stats:
+            instrumentation.merge(stats)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+            manager, self._manager = self._manager, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        if manager is not None:
+            manager.shutdown()
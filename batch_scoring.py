@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from job_index import MATCH_THRESHOLD
+
+# Resumes scored per matrix product, bounds the size of the intermediate
+# count matrix before thresholding
+CHUNK_SIZE = 16384
+
+
+class BatchScorer:
+    """
+    Scores many resumes against every job of a job database at once.
+
+    Resumes and jobs are encoded as sparse skill-incidence matrices, so the
+    matched-skill count of every resume x job pair is one matrix product.
+    The scores are exactly the ones suggest_jobs computes.
+    """
+
+    def __init__(self, job_db, threshold=MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.job_names = list(job_db)
+        self.required_skills = [tuple(job_db[name]["required_skills"]) for name in self.job_names]
+        self.descriptions = [job_db[name]["description"] for name in self.job_names]
+
+        self.vocabulary = sorted({skill for required in self.required_skills for skill in required})
+        self.skill_ids = {skill: i for i, skill in enumerate(self.vocabulary)}
+
+        # Job x skill counts; a skill listed twice counts twice, as in suggest_jobs
+        rows, cols = [], []
+        for job_id, required in enumerate(self.required_skills):
+            rows.extend([job_id] * len(required))
+            cols.extend(self.skill_ids[skill] for skill in required)
+        self.job_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(self.job_names), len(self.vocabulary))
+        )
+        self.required_counts = np.array([len(r) for r in self.required_skills], dtype=np.float64)
+
+        self._jobs_t = self.job_matrix.T.tocsr()
+
+    def encode(self, resume_skill_lists):
+        """
+        Resume x skill incidence matrix (CSR, 0/1). Skills no job asks for
+        are dropped since they can never count towards a match.
+        """
+        indptr = [0]
+        indices = []
+        for skills in resume_skill_lists:
+            indices.extend(sorted({self.skill_ids[s] for s in skills if s in self.skill_ids}))
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=(len(indptr) - 1, len(self.vocabulary))
+        )
+
+    def match_counts(self, resumes):
+        """
+        Sparse resume x job matrix of matched required skill counts; only
+        pairs sharing at least one skill are stored
+        """
+        return (resumes @ self._jobs_t).tocsr()
+
+    def score(self, resume_skill_lists, chunk_size=CHUNK_SIZE):
+        """
+        Resume x job match scores above the threshold, as a CSR matrix.
+
+        The work is proportional to the resume x job pairs that share a
+        skill, not to resumes x jobs. Resumes are processed in chunks so the
+        unthresholded counts of only one chunk are held at a time.
+        """
+        resumes = self.encode(resume_skill_lists)
+        blocks = []
+        for start in range(0, resumes.shape[0], chunk_size):
+            scores = self.match_counts(resumes[start:start + chunk_size]).astype(np.float64)
+            # Same float64 division as suggest_jobs, so scores compare equal
+            scores.data /= self.required_counts[scores.indices]
+            scores.data[scores.data <= self.threshold] = 0.0
+            scores.eliminate_zeros()
+            blocks.append(scores)
+        if not blocks:
+            return sparse.csr_matrix((0, len(self.job_names)))
+        return sparse.vstack(blocks, format="csr")
+
+    def suggestions(self, scores, skills, row):
+        """
+        suggest_jobs-style dict for one resume from its row of scores
+        """
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        job_ids = scores.indices[start:end]
+        job_scores = scores.data[start:end]
+        order = np.lexsort((job_ids, -job_scores))
+
+        found = set(skills)
+        suggested_jobs = {}
+        for i in order:
+            job_id = job_ids[i]
+            required = self.required_skills[job_id]
+            suggested_jobs[self.job_names[job_id]] = {
+                "match_score": float(job_scores[i]),
+                "matched_skills": [skill for skill in required if skill in found],
+                "missing_skills": [skill for skill in required if skill not in found],
+                "description": self.descriptions[job_id]
+            }
+        return suggested_jobs
+
+    def to_frame(self, scores, resume_ids=None):
+        """
+        Long-form DataFrame with one row per scored resume x job pair
+        """
+        coo = scores.tocoo()
+        missing = self.required_counts[coo.col] - np.rint(coo.data * self.required_counts[coo.col])
+        resumes = coo.row if resume_ids is None else np.asarray(resume_ids)[coo.row]
+        return pd.DataFrame({
+            "resume": resumes,
+            "job": np.asarray(self.job_names, dtype=object)[coo.col],
+            "match_score": coo.data,
+            "matched_count": self.required_counts[coo.col] - missing,
+            "missing_count": missing,
+        })
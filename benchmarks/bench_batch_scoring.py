@@ -0,0 +1,47 @@
+"""
+Time BatchScorer on a synthetic catalogue.
+
+    python benchmarks/bench_batch_scoring.py --resumes 100000 --jobs 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_scoring import BatchScorer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=100_000)
+    parser.add_argument("--jobs", type=int, default=10_000)
+    parser.add_argument("--skills", type=int, default=2_000, help="size of the skill vocabulary")
+    parser.add_argument("--skills-per-job", type=int, default=5)
+    parser.add_argument("--skills-per-resume", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = [f"skill-{i}" for i in range(args.skills)]
+    job_db = {
+        f"job-{i}": {"required_skills": rng.sample(vocabulary, args.skills_per_job), "description": ""}
+        for i in range(args.jobs)
+    }
+    resumes = [rng.sample(vocabulary, args.skills_per_resume) for _ in range(args.resumes)]
+
+    start = time.perf_counter()
+    scorer = BatchScorer(job_db)
+    built = time.perf_counter()
+    scores = scorer.score(resumes)
+    scored = time.perf_counter()
+
+    print(f"index build: {built - start:.3f}s")
+    print(f"score {args.resumes} x {args.jobs}: {scored - built:.3f}s "
+          f"({args.resumes / (scored - built):,.0f} resumes/s, {scores.nnz:,} matches)")
+
+
+if __name__ == "__main__":
+    main()
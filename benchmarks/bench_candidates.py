@@ -0,0 +1,114 @@
+"""
+Query time of the candidate index against rescanning every candidate.
+
+    python benchmarks/bench_candidates.py --candidates 10000 100000
+
+index    CandidateIndex.rank_role: bitset filters and bit-sliced top-k
+rescan   a loop over all candidates' skill sets per query, what ranking
+         the stored analyses would cost without an index
+
+Each query ranks one JOB_DATABASE role for one tenant; half of them also
+filter on location, resume score or a required skill.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candidate_index import CandidateIndex
+from job_index import MATCH_THRESHOLD
+from pipeline import JOB_DATABASE, calculate_resume_score
+from skill_matcher import COMMON_SKILLS
+
+TENANTS = ["acme", "globex", "initech"]
+LOCATIONS = ["Bangalore", "Pune", "Delhi", "Mumbai", "Hyderabad", "Remote"]
+
+
+def make_candidates(count, rng):
+    candidates = []
+    for i in range(count):
+        skills = rng.sample(COMMON_SKILLS, rng.randint(2, 15))
+        candidates.append({
+            "tenant": rng.choice(TENANTS),
+            "hash": f"{i:064x}",
+            "skills": skills,
+            "resume_score": calculate_resume_score(skills),
+            "location": rng.choice(LOCATIONS)
+        })
+    return candidates
+
+
+def make_queries(count, rng):
+    queries = []
+    for _ in range(count):
+        filters = {}
+        if rng.random() < 0.5:
+            kind = rng.choice(["location", "min_score", "skills"])
+            filters[kind] = {"location": rng.choice(LOCATIONS), "min_score": 40,
+                             "skills": [rng.choice(COMMON_SKILLS)]}[kind]
+        queries.append((rng.choice(list(JOB_DATABASE)), rng.choice(TENANTS), filters))
+    return queries
+
+
+def rescan(candidates, role, tenant, k, location=None, min_score=None, skills=None):
+    required = JOB_DATABASE[role]["required_skills"]
+    scored = []
+    for position, candidate in enumerate(candidates):
+        if candidate["tenant"] != tenant:
+            continue
+        if location and candidate["location"].lower() != location.lower():
+            continue
+        if min_score and candidate["resume_score"] < min_score:
+            continue
+        found = set(candidate["skills"])
+        if skills and not found.issuperset(skills):
+            continue
+        matched = sum(skill in found for skill in required)
+        if matched / len(required) > MATCH_THRESHOLD:
+            scored.append((-matched, -candidate["resume_score"], position))
+    scored.sort()
+    return scored[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    queries = make_queries(args.queries, rng)
+    print(f"{'candidates':>10} {'load s':>7} {'method':<7} {'median ms':>10} {'p95 ms':>8}")
+    for count in args.candidates:
+        candidates = make_candidates(count, rng)
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            index = CandidateIndex(os.path.join(tmp, "candidates.db"), JOB_DATABASE)
+            for tenant in TENANTS:
+                index.add_many(tenant, [c for c in candidates if c["tenant"] == tenant])
+            loaded = time.perf_counter() - start
+
+            for label, run in (
+                ("index", lambda role, tenant, filters: index.rank_role(role, tenant, args.k, **filters)),
+                ("rescan", lambda role, tenant, filters: rescan(candidates, role, tenant, args.k, **filters))
+            ):
+                samples = []
+                for role, tenant, filters in queries:
+                    start = time.perf_counter()
+                    run(role, tenant, filters)
+                    samples.append(time.perf_counter() - start)
+                samples.sort()
+                print(f"{count:>10} {loaded:>7.2f} {label:<7} {statistics.median(samples) * 1000:>10.3f} "
+                      f"{samples[int(len(samples) * 0.95)] * 1000:>8.3f}")
+            index.close()
+
+
+if __name__ == "__main__":
+    main()
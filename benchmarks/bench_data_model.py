@@ -0,0 +1,118 @@
+"""
+Memory of the job index and of kept matches, before and after the
+interned data model.
+
+    python benchmarks/bench_data_model.py --roles 1000 10000 --resumes 100
+
+dicts      the index as it was before data_model.py: names, tuples of
+           skill strings and skill -> list of job ids, with matches kept
+           as suggest_jobs dicts
+interned   JobIndex over a SkillVocabulary: JobRecords, array posting
+           lists, and matches kept as MatchResults
+
+Memory is measured with tracemalloc: "retained" is what is still
+allocated once the index (or the matches for every resume) is built,
+"peak" the high-water mark while building it. The skill and role name
+strings are shared by both and created before measuring.
+"""
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_index import MATCH_THRESHOLD, JobIndex
+from skill_matcher import COMMON_SKILLS
+
+
+class DictJobIndex:
+    """
+    The job index before data_model.py
+    """
+
+    def __init__(self, job_db):
+        self.job_names = list(job_db)
+        self.required_skills = [tuple(job_db[name]["required_skills"]) for name in self.job_names]
+        self.descriptions = [job_db[name]["description"] for name in self.job_names]
+
+        self.skill_jobs = {}
+        for job_id, required in enumerate(self.required_skills):
+            for skill in required:
+                self.skill_jobs.setdefault(skill, []).append(job_id)
+
+    def match(self, found_skills, threshold=MATCH_THRESHOLD):
+        found = set(found_skills)
+        counts = {}
+        for skill in found:
+            for job_id in self.skill_jobs.get(skill, ()):
+                counts[job_id] = counts.get(job_id, 0) + 1
+        matches = []
+        for job_id, matched in counts.items():
+            required = self.required_skills[job_id]
+            if matched / len(required) > threshold:
+                matches.append({
+                    "match_score": matched / len(required),
+                    "matched_skills": [skill for skill in required if skill in found],
+                    "missing_skills": [skill for skill in required if skill not in found],
+                    "description": self.descriptions[job_id]
+                })
+        return matches
+
+
+def make_job_db(roles, rng):
+    return {
+        f"Role {i}": {"required_skills": rng.sample(COMMON_SKILLS, rng.randint(3, 8)),
+                      "description": f"Description of role {i}"}
+        for i in range(roles)
+    }
+
+
+def measure(build):
+    """
+    (result, retained bytes, peak bytes) of build()
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, retained - before, peak - before
+
+
+def run(roles, resumes, seed):
+    rng = random.Random(seed)
+    job_db = make_job_db(roles, rng)
+    resume_skills = [rng.sample(COMMON_SKILLS, rng.randint(5, 20)) for _ in range(resumes)]
+
+    rows = {}
+    for label, index_class in [("dicts", DictJobIndex), ("interned", JobIndex)]:
+        index, index_bytes, index_peak = measure(lambda: index_class(job_db))
+        matches, match_bytes, match_peak = measure(lambda: [index.match(skills) for skills in resume_skills])
+        kept = sum(len(found) for found in matches)
+        rows[label] = (index_bytes, index_peak, match_bytes, match_peak, kept)
+        del index, matches
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--roles", type=int, nargs="+", default=[1000, 10000], help="roles in the job database")
+    parser.add_argument("--resumes", type=int, default=100, help="resumes whose matches are kept")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for roles in args.roles:
+        rows = run(roles, args.resumes, args.seed)
+        print(f"\n{roles} roles, matches of {args.resumes} resumes")
+        print(f"  {'':<10} {'index':>12} {'index peak':>12} {'matches':>12} {'match peak':>12} {'per match':>10}")
+        for label, (index_bytes, index_peak, match_bytes, match_peak, kept) in rows.items():
+            print(f"  {label:<10} {index_bytes / 1024:9.0f} KiB {index_peak / 1024:9.0f} KiB "
+                  f"{match_bytes / 1024:9.0f} KiB {match_peak / 1024:9.0f} KiB {match_bytes / max(kept, 1):8.0f} B")
+
+
+if __name__ == "__main__":
+    main()
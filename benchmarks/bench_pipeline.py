@@ -0,0 +1,173 @@
+"""
+Per-stage benchmark of the resume analysis pipeline on synthetic resumes.
+
+    python benchmarks/bench_pipeline.py -o bench_results.json
+    python benchmarks/bench_pipeline.py --quick --compare bench_results.json
+
+Every combination of format (pdf, docx), size (pages) and skill density is
+run --docs times. Each stage is timed separately and reported as
+throughput and p50/p95/p99 latency. get_real_jobs is timed against a
+fresh JobFeed over the configured sources, once with its cache cleared
+(cold, the sources are queried) and once more for the same skills (warm,
+a cache hit), so the process-wide feed's cache does not hide the fetch.
+Results are written as JSON together
+with the git commit, so runs on different commits can be compared with
+--compare.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from extraction import DOCX_MIME, PDF_MIME
+from job_sources import JobFeed
+from pipeline import (JOB_FEED, JOB_INDEX, extract_skills, extract_text_from_bytes, generate_skill_gap_analysis,
+                      suggest_jobs)
+from synthetic import make_resume
+
+FILE_TYPES = {"pdf": PDF_MIME, "docx": DOCX_MIME}
+STAGES = ["extract_text_from_file", "extract_skills", "suggest_jobs", "generate_skill_gap_analysis",
+          "get_real_jobs_cold", "get_real_jobs_warm"]
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(samples):
+    total = sum(samples)
+    return {
+        "runs": len(samples),
+        "throughput_per_s": len(samples) / total if total else None,
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+def run_case(file_format, pages, density, docs, workers):
+    timings = {stage: [] for stage in STAGES}
+    total_bytes = 0
+    feed = JobFeed(JOB_FEED.sources)
+    for seed in range(docs):
+        data = make_resume(file_format, pages, density, seed)
+        total_bytes += len(data)
+
+        start = time.perf_counter()
+        text = extract_text_from_bytes(data, FILE_TYPES[file_format], workers=workers)
+        timings["extract_text_from_file"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        skills = extract_skills(text)
+        timings["extract_skills"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        jobs = suggest_jobs(skills, JOB_INDEX)
+        timings["suggest_jobs"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        generate_skill_gap_analysis(skills, jobs)
+        timings["generate_skill_gap_analysis"].append(time.perf_counter() - start)
+
+        feed.clear()
+        start = time.perf_counter()
+        feed.get_jobs(skills)
+        timings["get_real_jobs_cold"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        feed.get_jobs(skills)
+        timings["get_real_jobs_warm"].append(time.perf_counter() - start)
+
+    return {
+        "format": file_format,
+        "pages": pages,
+        "density": density,
+        "avg_bytes": total_bytes // docs,
+        "stages": {stage: summarize(samples) for stage, samples in timings.items()},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_case(case, baseline=None):
+    print(f"\n{case['format']} {case['pages']}p {case['density']} "
+          f"({case['avg_bytes'] / 1024:.0f} KiB, peak RSS {case['peak_rss_mb']:.0f} MiB)")
+    for stage, s in case["stages"].items():
+        line = (f"  {stage:<30} {s['throughput_per_s']:10.1f}/s  p50 {s['p50_ms']:9.3f} ms  "
+                f"p95 {s['p95_ms']:9.3f} ms  p99 {s['p99_ms']:9.3f} ms")
+        if baseline and stage in baseline["stages"] and baseline["stages"][stage]["p50_ms"]:
+            line += f"  ({s['p50_ms'] / baseline['stages'][stage]['p50_ms']:.2f}x p50 vs baseline)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--docs", type=int, default=20, help="documents per case")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20, 50])
+    parser.add_argument("--formats", nargs="+", default=["pdf", "docx"], choices=sorted(FILE_TYPES))
+    parser.add_argument("--densities", nargs="+", default=["sparse", "dense"])
+    parser.add_argument("--workers", type=int, default=1, help="PDF extraction processes")
+    parser.add_argument("--quick", action="store_true", help="3 docs per case, 1 and 5 pages")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.docs, args.pages = 3, [1, 5]
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            for case in json.load(f)["cases"]:
+                baseline[(case["format"], case["pages"], case["density"])] = case
+
+    cases = []
+    for file_format in args.formats:
+        for pages in args.pages:
+            for density in args.densities:
+                case = run_case(file_format, pages, density, args.docs, args.workers)
+                cases.append(case)
+                print_case(case, baseline.get((file_format, pages, density)))
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "docs_per_case": args.docs,
+        "workers": args.workers,
+        "cases": cases,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
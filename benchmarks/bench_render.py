@@ -0,0 +1,182 @@
+"""
+Cost of rendering the results section, per element vs batched HTML.
+
+    python benchmarks/bench_render.py --jobs 10 100 1000
+
+per element  the results section as app.py used to draw it, one
+             st.markdown/st.write/st.expander per line, skill group, job
+             box and resource
+batched      rendering.report_html + real_jobs_html + tips_html, one
+             st.markdown each
+
+Both run in bare mode (no server), so the time is what the script spends
+building deltas; "deltas" counts the messages that would go over the
+websocket, each of which the browser lays out separately.
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+
+from learning_plans import get_learning_plan
+from rendering import real_jobs_html, report_html, tips_html
+from skill_matcher import COMMON_SKILLS
+
+
+def make_analysis(jobs, rng):
+    skills_list = rng.sample(COMMON_SKILLS, 15)
+    suggested_jobs = {}
+    for i in range(jobs):
+        required = rng.sample(COMMON_SKILLS, 5)
+        matched = [s for s in required if s in skills_list]
+        suggested_jobs[f"Role {i}"] = {
+            "match_score": len(matched) / len(required),
+            "matched_skills": matched,
+            "missing_skills": [s for s in required if s not in skills_list],
+            "description": "Designs, develops, and tests software applications and systems."
+        }
+    missing = dict.fromkeys(s for d in suggested_jobs.values() for s in d["missing_skills"])
+    analysis = {
+        "skills": skills_list,
+        "resume_score": 60,
+        "suggested_jobs": suggested_jobs,
+        "skill_gap_analysis": {s: list(get_learning_plan(s)["resources"]) for s in list(missing)[:10]}
+    }
+    real_jobs = [
+        {"title": f"Engineer {i}", "company": "Acme", "location": "Bangalore", "experience": "0-2 years",
+         "salary": "₹4-8 LPA", "skills": rng.sample(COMMON_SKILLS, 4), "apply_link": "https://example.com"}
+        for i in range(min(jobs, 50))
+    ]
+    return analysis, real_jobs
+
+
+def render_per_element(analysis, real_jobs):
+    skills_list = analysis["skills"]
+    st.success("✅ Analysis complete!")
+    st.markdown("---")
+    st.subheader("📊 Your Resume Score")
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.markdown(f'<div class="score-good">{analysis["resume_score"]:.0f}/100</div>', unsafe_allow_html=True)
+        st.write("Good! But can be improved with more skills. 👍")
+    with col2:
+        st.progress(analysis["resume_score"] / 100)
+        st.caption(f"Based on {len(skills_list)} skills found in your resume")
+
+    st.markdown("---")
+    st.subheader("🎯 Skills Identified in Your Resume")
+    tech_skills = [s for s in skills_list if s in ['python', 'java', 'javascript', 'html', 'css', 'sql', 'react', 'node.js', 'android', 'swift']]
+    data_skills = [s for s in skills_list if s in ['machine learning', 'data analysis', 'excel', 'statistics']]
+    soft_skills = [s for s in skills_list if s in ['communication', 'teamwork', 'leadership', 'problem solving', 'analytical skills']]
+    other_skills = [s for s in skills_list if s not in tech_skills + data_skills + soft_skills]
+    for label, skills in (("Technical", tech_skills), ("Data", data_skills), ("Soft", soft_skills), ("Other", other_skills)):
+        if skills:
+            st.write(f"**{label} Skills:**")
+            st.markdown("".join(f'<span class="skill-pill">{s.title()}</span>' for s in skills), unsafe_allow_html=True)
+
+    st.markdown("---")
+    st.subheader("💼 Recommended Jobs For You")
+    for job, details in analysis["suggested_jobs"].items():
+        st.markdown(f"""
+        <div class="result-box">
+            <h3>{job} (<span class="match-medium">{details['match_score']:.0%} match</span>)</h3>
+            <p><strong>Description:</strong> {details['description']}</p>
+            <p><strong>✅ Your Matching Skills:</strong> {', '.join(details['matched_skills']).title()}</p>
+            <p><strong>📚 Skills to Learn:</strong> {', '.join(details['missing_skills']).title()}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("---")
+    st.subheader("📚 Skill Gap Analysis & Learning Plan")
+    st.info("Based on your resume and target jobs, here's what you should learn:")
+    for skill, resources in analysis["skill_gap_analysis"].items():
+        with st.expander(f"🎯 Learn {skill.title()} to boost your career"):
+            st.write(f"**Why learn {skill}?**")
+            st.write("- Increases your job matches by 30%")
+            st.write("- Average salary premium: ₹3-5 LPA")
+            st.write("- High demand in current market")
+            st.write("**How to learn:**")
+            for i, resource in enumerate(resources, 1):
+                st.write(f"{i}. {resource}")
+            plan = get_learning_plan(skill)
+            st.write(f"**Time required:** {plan['time_required']}")
+            st.write(f"**Practice projects:** {'; '.join(plan['projects'])}")
+
+    st.markdown("---")
+    st.subheader("🔥 Real Job Openings for You")
+    st.success("Based on your skills, here are actual job opportunities:")
+    for i, job in enumerate(real_jobs, 1):
+        with st.expander(f"{i}. {job['title']} at {job['company']}"):
+            st.write(f"**Company:** {job['company']}")
+            st.write(f"**Location:** {job['location']}")
+            st.write(f"**Experience:** {job['experience']}")
+            st.write(f"**Salary:** {job['salary']}")
+            st.write("**Required Skills:**")
+            st.markdown("".join(f'<span class="skill-pill">{s}</span>' for s in job['skills']), unsafe_allow_html=True)
+            st.write(f"**Apply:** [Click Here]({job['apply_link']})")
+
+    st.markdown("---")
+    st.subheader("💡 Improvement Tips")
+    st.info("""
+    - Consider learning in-demand skills like Cloud Computing or Machine Learning
+    - Add certifications or online courses you've completed
+    - Highlight your achievements with metrics and numbers
+    """)
+
+
+def render_batched(analysis, real_jobs):
+    st.markdown(report_html(analysis), unsafe_allow_html=True)
+    st.markdown(real_jobs_html(real_jobs), unsafe_allow_html=True)
+    st.markdown(tips_html(analysis["resume_score"]), unsafe_allow_html=True)
+
+
+def measure(render, analysis, real_jobs, runs):
+    deltas = 0
+    enqueue = DeltaGenerator._enqueue
+
+    def counting_enqueue(self, *args, **kwargs):
+        nonlocal deltas
+        deltas += 1
+        return enqueue(self, *args, **kwargs)
+
+    DeltaGenerator._enqueue = counting_enqueue
+    try:
+        samples = []
+        for _ in range(runs):
+            deltas = 0
+            start = time.perf_counter()
+            render(analysis, real_jobs)
+            samples.append(time.perf_counter() - start)
+    finally:
+        DeltaGenerator._enqueue = enqueue
+    return deltas, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10, 100, 1000], help="suggested jobs in the report")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    rng = random.Random(args.seed)
+    print(f"{'jobs':>6} {'renderer':<12} {'deltas':>7} {'median ms':>10} {'min ms':>8}")
+    for jobs in args.jobs:
+        analysis, real_jobs = make_analysis(jobs, rng)
+        for label, render in (("per element", render_per_element), ("batched", render_batched)):
+            deltas, samples = measure(render, analysis, real_jobs, args.runs)
+            print(f"{jobs:>6} {label:<12} {deltas:>7} {statistics.median(samples) * 1000:>10.2f} "
+                  f"{min(samples) * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
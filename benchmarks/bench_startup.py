@@ -0,0 +1,75 @@
+"""
+Cold-start and per-rerun latency of the Streamlit app.
+
+    python benchmarks/bench_startup.py --runs 10
+
+cold start  fresh interpreter importing the pipeline, with and without the
+            parsers the old app.py imported eagerly (pdfplumber, docx,
+            requests)
+rerun       app.py executed repeatedly in one process, the way Streamlit
+            reruns the script on every widget interaction (bare mode, no
+            file uploaded)
+"""
+import argparse
+import logging
+import os
+import runpy
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+{imports}
+print(time.perf_counter() - start)
+"""
+
+
+def time_imports(imports, runs):
+    code = IMPORT_SNIPPET.format(imports=imports)
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def time_reruns(runs):
+    sys.path.insert(0, ROOT)
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    app_path = os.path.join(ROOT, "app.py")
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        runpy.run_path(app_path, run_name="__main__")
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label, samples):
+    print(f"{label:<40} median {statistics.median(samples) * 1000:8.1f} ms   "
+          f"min {min(samples) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    report("cold import, lazy parsers", time_imports("import pipeline", args.runs))
+    report("cold import, eager parsers (old)",
+           time_imports("import pipeline, pdfplumber, docx, requests", args.runs))
+    report("first PDF parser load (deferred)", time_imports("import pdfplumber", args.runs))
+    report("first DOCX parser load (deferred)", time_imports("import docx", args.runs))
+
+    reruns = time_reruns(args.runs + 1)
+    report("first script run (cold modules)", reruns[:1])
+    report("script rerun (warm modules)", reruns[1:])
+
+
+if __name__ == "__main__":
+    main()
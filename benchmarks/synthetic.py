@@ -0,0 +1,113 @@
+"""
+Synthetic PDF and DOCX resumes for benchmarks.
+
+Documents are generated from a seeded RNG, so the same arguments always
+give the same bytes. The PDF writer is a minimal hand-rolled one (one
+Helvetica text block per page), which keeps the benchmarks free of extra
+dependencies.
+"""
+import io
+import random
+
+from skill_matcher import COMMON_SKILLS
+
+FILLER = (
+    "responsible for delivering projects on time with the team and worked closely "
+    "with stakeholders to improve processes reports and customer experience across "
+    "several departments while mentoring junior colleagues and documenting results"
+).split()
+
+LINES_PER_PAGE = 45
+WORDS_PER_LINE = 12
+
+# Share of words that are a skill
+DENSITIES = {
+    "sparse": 0.01,
+    "dense": 0.25
+}
+
+
+def resume_pages(pages, density="sparse", seed=0):
+    """
+    List of pages, each a list of text lines
+    """
+    rng = random.Random(seed)
+    skill_share = DENSITIES[density]
+    result = []
+    for page in range(pages):
+        lines = [f"Candidate {seed} - page {page + 1}"]
+        for _ in range(LINES_PER_PAGE - 1):
+            words = [
+                rng.choice(COMMON_SKILLS) if rng.random() < skill_share else rng.choice(FILLER)
+                for _ in range(WORDS_PER_LINE)
+            ]
+            lines.append(" ".join(words))
+        result.append(lines)
+    return result
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages):
+    """
+    PDF bytes with one page per list of lines
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        stream = "BT /F1 10 Tf 12 TL 50 800 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in lines) + " ET"
+        stream = stream.encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_docx(pages):
+    """
+    DOCX bytes with one paragraph per line and a page break between pages
+    """
+    from docx import Document
+    from docx.enum.text import WD_BREAK
+
+    doc = Document()
+    for number, lines in enumerate(pages):
+        if number:
+            doc.paragraphs[-1].add_run().add_break(WD_BREAK.PAGE)
+        for line in lines:
+            doc.add_paragraph(line)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def make_resume(file_format, pages, density="sparse", seed=0):
+    """
+    Bytes of a synthetic resume in "pdf" or "docx" format
+    """
+    content = resume_pages(pages, density, seed)
+    return make_pdf(content) if file_format == "pdf" else make_docx(content)
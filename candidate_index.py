@@ -0,0 +1,386 @@
+"""
+Persisted index of analysed candidates, for ranking a candidate pool per
+role (the reverse of suggest_jobs).
+
+Candidates live in SQLite, one row per (tenant, content hash), so the
+same resume added twice is stored once per tenant. Each process keeps the
+index in memory as bitsets over candidate slots: one per skill, tenant
+and location, plus bit slices of the resume score. A query ANDs the
+filter bitsets, adds up the role's skill bitsets into bit-sliced match
+counts and walks the slices from the top to find the best k, so no
+resume is rescanned and only the returned rows are read from disk.
+
+    python candidate_index.py load candidates.db results.jsonl --tenant acme
+    python candidate_index.py top candidates.db "Data Scientist" --tenant acme -k 10
+
+Like CatalogueSnapshot, the index notices writes from other processes
+through PRAGMA data_version and applies only rows whose sequence number
+moved on; deleted candidates leave a dead slot until more than half of
+the slots are dead and the bitsets are rebuilt.
+"""
+import argparse
+import json
+import math
+import sqlite3
+import threading
+from array import array
+
+from data_model import SkillVocabulary
+from job_index import MATCH_THRESHOLD
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('seq', 0);
+
+CREATE TABLE IF NOT EXISTS candidates (
+    tenant TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    resume_score REAL NOT NULL DEFAULT 0,
+    skills TEXT NOT NULL DEFAULT '[]',
+    seq INTEGER NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tenant, hash)
+);
+CREATE INDEX IF NOT EXISTS candidates_seq ON candidates(seq);
+"""
+
+# Resume scores are kept as integer hundredths in the bit slices
+SCORE_SCALE = 100
+
+
+def _slots_to_bits(slots):
+    """
+    Bitset with the given slot numbers set
+    """
+    slots = list(slots)
+    if not slots:
+        return 0
+    buffer = bytearray(max(slots) // 8 + 1)
+    for slot in slots:
+        buffer[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _add_slices(slices, bits):
+    """
+    Add a 0/1 bitset to bit-sliced counts (slice i is bit i of every
+    candidate's count), in place
+    """
+    for i, current in enumerate(slices):
+        if not bits:
+            return
+        slices[i], bits = current ^ bits, current & bits
+    if bits:
+        slices.append(bits)
+
+
+def _at_least(slices, value, candidates):
+    """
+    Candidates whose bit-sliced value is >= value
+    """
+    if value <= 0:
+        return candidates
+    if value >> len(slices):
+        return 0
+    greater, equal = 0, candidates
+    for i in range(len(slices) - 1, -1, -1):
+        if value >> i & 1:
+            equal &= slices[i]
+        else:
+            greater |= equal & slices[i]
+            equal &= ~slices[i]
+    return greater | equal
+
+
+def _top(slices, k, candidates):
+    """
+    The candidates with the k largest values: (surely in, tied) where
+    surely in has fewer than k members and tied holds every candidate
+    sharing the k-th value (O'Neil and Quass, bit-sliced top-k)
+    """
+    chosen, tied = 0, candidates
+    for i in range(len(slices) - 1, -1, -1):
+        above = chosen | (tied & slices[i])
+        count = above.bit_count()
+        if count > k:
+            tied &= slices[i]
+        elif count < k:
+            chosen = above
+            tied &= ~slices[i]
+        else:
+            return above, 0
+    return chosen, tied
+
+
+def _value(slices, slot):
+    return sum(1 << i for i, bits in enumerate(slices) if bits >> slot & 1)
+
+
+class CandidateIndex:
+    """
+    Read/write access to a candidate file plus the in-memory bitsets.
+    roles is a job database (name -> {"required_skills": ...}) for
+    rank_role(); top_k() takes the skills directly.
+    """
+
+    def __init__(self, path, roles=None):
+        self.path = path
+        self.roles = roles or {}
+        self._lock = threading.Lock()
+        self._local_writes = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        with self._lock:
+            self._load()
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def _load(self):
+        self.keys = []
+        self.scores = array("l")
+        self.slot_of = {}
+        self.alive = 0
+        self.skill_bits = {}
+        self.tenant_bits = {}
+        self.location_bits = {}
+        self.score_slices = []
+        self.dead = 0
+        self.seq = 0
+        self.version = self._data_version()
+        self._apply(self._changed(0))
+
+    def _data_version(self):
+        # data_version only counts other connections' commits
+        return self.conn.execute("PRAGMA data_version").fetchone()[0], self._local_writes
+
+    def _changed(self, after_seq):
+        return self.conn.execute(
+            "SELECT tenant, hash, location, resume_score, skills, seq, deleted FROM candidates "
+            "WHERE seq > ? ORDER BY seq", (after_seq,)
+        ).fetchall()
+
+    def _apply(self, changes):
+        """
+        Give every live row in changes a new slot; the bitsets are built
+        per key from all new slots at once instead of one bit at a time
+        """
+        new = {"skill": {}, "tenant": {}, "location": {}}
+        new_alive = []
+        score_bits = {}
+        for tenant, content_hash, location, resume_score, skills, seq, deleted in changes:
+            old = self.slot_of.pop((tenant, content_hash), None)
+            if old is not None:
+                self.alive &= ~(1 << old)
+                self.dead += 1
+            self.seq = max(self.seq, seq)
+            if deleted:
+                continue
+            slot = len(self.keys)
+            score = round(resume_score * SCORE_SCALE)
+            self.keys.append((tenant, content_hash))
+            self.scores.append(score)
+            self.slot_of[(tenant, content_hash)] = slot
+            new_alive.append(slot)
+            for skill in set(json.loads(skills)):
+                new["skill"].setdefault(skill, []).append(slot)
+            new["tenant"].setdefault(tenant, []).append(slot)
+            new["location"].setdefault(location.strip().lower(), []).append(slot)
+            for i in SkillVocabulary.ids(score):
+                score_bits.setdefault(i, []).append(slot)
+
+        self.alive |= _slots_to_bits(new_alive)
+        for kind, table in (("skill", self.skill_bits), ("tenant", self.tenant_bits),
+                            ("location", self.location_bits)):
+            for key, slots in new[kind].items():
+                table[key] = table.get(key, 0) | _slots_to_bits(slots)
+        for i, slots in score_bits.items():
+            while len(self.score_slices) <= i:
+                self.score_slices.append(0)
+            self.score_slices[i] |= _slots_to_bits(slots)
+
+    def refresh(self):
+        """
+        Pick up writes made since the last refresh, if there were any
+        """
+        with self._lock:
+            version = self._data_version()
+            if version == self.version:
+                return False
+            self.version = version
+            self._apply(self._changed(self.seq))
+            if self.dead > len(self.keys) // 2:
+                self._load()
+        return True
+
+    def _next_seq(self):
+        self._local_writes += 1
+        self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'seq'")
+        return self.conn.execute("SELECT value FROM meta WHERE key = 'seq'").fetchone()[0]
+
+    def add_many(self, tenant, candidates):
+        """
+        Insert or replace candidates of a tenant in one transaction. Each
+        is a dict with "hash", "skills", "resume_score" and optionally
+        "name" and "location".
+        """
+        with self._lock, self.conn:
+            for candidate in candidates:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO candidates VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                    (tenant, candidate["hash"], candidate.get("name", ""), candidate.get("location", ""),
+                     candidate["resume_score"], json.dumps(list(candidate["skills"])), self._next_seq())
+                )
+        self.refresh()
+
+    def add(self, tenant, content_hash, skills, resume_score, name="", location=""):
+        self.add_many(tenant, [{"hash": content_hash, "skills": skills, "resume_score": resume_score,
+                                "name": name, "location": location}])
+
+    def remove(self, tenant, content_hash):
+        """
+        Delete a candidate; returns False if the tenant had no such candidate
+        """
+        with self._lock, self.conn:
+            seq = self._next_seq()
+            deleted = self.conn.execute(
+                "UPDATE candidates SET deleted = 1, seq = ? WHERE tenant = ? AND hash = ? AND deleted = 0",
+                (seq, tenant, content_hash)
+            ).rowcount
+        self.refresh()
+        return bool(deleted)
+
+    def _filter(self, tenant, min_score, location, skills):
+        bits = self.alive & self.tenant_bits.get(tenant, 0)
+        if location:
+            bits &= self.location_bits.get(location.strip().lower(), 0)
+        for skill in skills or ():
+            bits &= self.skill_bits.get(skill, 0)
+        if min_score:
+            bits = _at_least(self.score_slices, math.ceil(min_score * SCORE_SCALE - 1e-9), bits)
+        return bits
+
+    def top_k(self, required_skills, tenant, k=10, min_score=None, location=None, skills=None,
+              threshold=MATCH_THRESHOLD):
+        """
+        The k candidates of tenant matching more than threshold of
+        required_skills, best match first, then higher resume score, then
+        earliest added. Only candidates with resume score >= min_score,
+        in location (case-insensitive) and having every skill in skills
+        are considered. Returns (candidates, number that passed the
+        filters and threshold).
+        """
+        self.refresh()
+        required_skills = list(required_skills)
+        with self._lock:
+            candidates = self._filter(tenant, min_score, location, skills)
+            counts = []
+            for skill in required_skills:
+                _add_slices(counts, self.skill_bits.get(skill, 0) & candidates)
+            # match_score > threshold, as in suggest_jobs
+            candidates = _at_least(counts, math.floor(threshold * len(required_skills)) + 1, candidates)
+            total = candidates.bit_count()
+
+            chosen, tied = _top(counts, k, candidates)
+            if tied:
+                # Break ties on the k-th match count by resume score
+                more, tied = _top(self.score_slices, k - chosen.bit_count(), tied)
+                chosen |= more | tied
+            ranked = sorted(
+                ((_value(counts, slot), self.scores[slot], slot) for slot in SkillVocabulary.ids(chosen)),
+                key=lambda item: (-item[0], -item[1], item[2])
+            )[:k]
+            keys = [self.keys[slot] for _, _, slot in ranked]
+
+        rows = self._rows(tenant, [content_hash for _, content_hash in keys])
+        results = []
+        for (matched, _, _), (_, content_hash) in zip(ranked, keys):
+            name, location_name, resume_score, candidate_skills = rows[content_hash]
+            found = set(candidate_skills)
+            results.append({
+                "hash": content_hash,
+                "name": name,
+                "location": location_name,
+                "resume_score": resume_score,
+                "match_score": matched / len(required_skills),
+                "matched_skills": [skill for skill in required_skills if skill in found],
+                "missing_skills": [skill for skill in required_skills if skill not in found]
+            })
+        return results, total
+
+    def rank_role(self, role, tenant, k=10, **filters):
+        """
+        top_k() for a role of the job database; KeyError if it is unknown
+        """
+        return self.top_k(self.roles[role]["required_skills"], tenant, k, **filters)
+
+    def _rows(self, tenant, hashes):
+        if not hashes:
+            return {}
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT hash, name, location, resume_score, skills FROM candidates "
+                f"WHERE tenant = ? AND hash IN ({','.join('?' * len(hashes))})",
+                [tenant, *hashes]
+            ).fetchall()
+        return {content_hash: (name, location, score, json.loads(skills))
+                for content_hash, name, location, score, skills in rows}
+
+
+def load_results(index, tenant, path):
+    """
+    Add the successful records of a screen.py JSONL file; returns how
+    many were added
+    """
+    candidates = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if "error" in record:
+                continue
+            candidates.append({"hash": record["sha256"], "name": record["file"], "skills": record["skills"],
+                               "resume_score": record["resume_score"], "location": record.get("location", "")})
+    index.add_many(tenant, candidates)
+    return len(candidates)
+
+
+def main(argv=None):
+    from pipeline import JOB_DATABASE
+
+    parser = argparse.ArgumentParser(description="Manage and query the candidate index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    load_parser = commands.add_parser("load", help="add the results of a screen.py run")
+    load_parser.add_argument("path")
+    load_parser.add_argument("results", help="JSONL written by screen.py")
+    top_parser = commands.add_parser("top", help="best candidates for a role")
+    top_parser.add_argument("path")
+    top_parser.add_argument("role", choices=list(JOB_DATABASE))
+    top_parser.add_argument("-k", type=int, default=10)
+    top_parser.add_argument("--min-score", type=float)
+    top_parser.add_argument("--location")
+    top_parser.add_argument("--skill", action="append", help="required skill, can be repeated")
+    for command in (load_parser, top_parser):
+        command.add_argument("--tenant", default="default")
+    args = parser.parse_args(argv)
+
+    index = CandidateIndex(args.path, JOB_DATABASE)
+    if args.command == "load":
+        added = load_results(index, args.tenant, args.results)
+        print(f"{args.path}: {added} candidates added, {len(index)} in total")
+    elif args.command == "top":
+        results, total = index.rank_role(args.role, args.tenant, args.k, min_score=args.min_score,
+                                         location=args.location, skills=args.skill)
+        for rank, candidate in enumerate(results, 1):
+            print(f"{rank:>3}. {candidate['name'] or candidate['hash'][:12]}  "
+                  f"match {candidate['match_score']:.0%}  score {candidate['resume_score']:.0f}")
+        print(f"{total} candidates matched")
+
+
+if __name__ == "__main__":
+    main()
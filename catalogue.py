@@ -0,0 +1,468 @@
+"""
+On-disk job catalogue in SQLite.
+
+Roles (what JOB_DATABASE holds) and job postings (what the mock job feed
+holds) live in one database file, indexed by skill, location and
+experience band, so adding a role is an insert rather than a redeploy:
+
+    python catalogue.py seed catalogue.db
+    RESUME_CATALOGUE=catalogue.db streamlit run app.py
+
+Each process keeps a CatalogueSnapshot: role skills held in flat arrays
+(no per-role Python objects) that are scored like JobIndex. The snapshot
+notices writes from other processes through PRAGMA data_version and
+applies only the rows whose sequence number moved on.
+"""
+import argparse
+import contextlib
+import re
+import sqlite3
+import threading
+from array import array
+
+from job_index import MATCH_THRESHOLD
+from job_sources import JobSource
+
+# Times a snapshot is brought up to date when a role changes under a query
+REFRESH_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('seq', 0);
+
+CREATE TABLE IF NOT EXISTS roles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT NOT NULL DEFAULT '',
+    seq INTEGER NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS role_skills (
+    role_id INTEGER NOT NULL REFERENCES roles(id),
+    position INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (role_id, position)
+);
+CREATE INDEX IF NOT EXISTS role_skills_skill ON role_skills(skill);
+CREATE INDEX IF NOT EXISTS roles_seq ON roles(seq);
+
+CREATE TABLE IF NOT EXISTS postings (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    experience TEXT NOT NULL DEFAULT '',
+    experience_min INTEGER,
+    experience_max INTEGER,
+    salary TEXT NOT NULL DEFAULT '',
+    apply_link TEXT NOT NULL DEFAULT '#'
+);
+CREATE TABLE IF NOT EXISTS posting_skills (
+    posting_id INTEGER NOT NULL REFERENCES postings(id),
+    position INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (posting_id, position)
+);
+-- Which resume skill a posting is listed under, like the keys of MOCK_JOBS
+CREATE TABLE IF NOT EXISTS posting_tags (
+    tag TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    posting_id INTEGER NOT NULL REFERENCES postings(id),
+    PRIMARY KEY (tag, position)
+);
+CREATE INDEX IF NOT EXISTS posting_skills_skill ON posting_skills(skill COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS postings_location ON postings(location COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS postings_experience ON postings(experience_min, experience_max);
+"""
+
+
+def experience_band(experience):
+    """
+    (min, max) years from text like "2-4 years", (None, None) if unknown
+    """
+    numbers = [int(n) for n in re.findall(r"\d+", experience or "")]
+    if not numbers:
+        return None, None
+    return min(numbers), max(numbers)
+
+
+@contextlib.contextmanager
+def _read_transaction(conn):
+    # Reads in one transaction see one commit, even with a writer in
+    # another process between them (WAL)
+    conn.execute("BEGIN")
+    try:
+        yield
+    finally:
+        conn.execute("COMMIT")
+
+
+class Catalogue:
+    """
+    Read/write access to a catalogue file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        # data_version only counts other connections' commits
+        self._local_writes = 0
+        # Shared by Streamlit's script threads, serialised by _lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _next_seq(self):
+        self._local_writes += 1
+        self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'seq'")
+        return self.conn.execute("SELECT value FROM meta WHERE key = 'seq'").fetchone()[0]
+
+    def upsert_role(self, name, required_skills, description=""):
+        with self._lock, self.conn:
+            seq = self._next_seq()
+            self.conn.execute(
+                "INSERT INTO roles (name, description, seq, deleted) VALUES (?, ?, ?, 0) "
+                "ON CONFLICT(name) DO UPDATE SET description = excluded.description, seq = excluded.seq, deleted = 0",
+                (name, description, seq)
+            )
+            role_id = self.conn.execute("SELECT id FROM roles WHERE name = ?", (name,)).fetchone()[0]
+            self.conn.execute("DELETE FROM role_skills WHERE role_id = ?", (role_id,))
+            self.conn.executemany(
+                "INSERT INTO role_skills VALUES (?, ?, ?)",
+                [(role_id, position, skill) for position, skill in enumerate(required_skills)]
+            )
+            return role_id
+
+    def delete_role(self, name):
+        with self._lock, self.conn:
+            seq = self._next_seq()
+            self.conn.execute("UPDATE roles SET deleted = 1, seq = ? WHERE name = ?", (seq, name))
+
+    def add_posting(self, job, tags=()):
+        """
+        Store a posting (a dict shaped like the MOCK_JOBS entries) and list
+        it under the given resume skills
+        """
+        low, high = experience_band(job.get("experience"))
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO postings (title, company, location, experience, experience_min, experience_max, "
+                "salary, apply_link) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job["title"], job.get("company", ""), job.get("location", ""), job.get("experience", ""),
+                 low, high, job.get("salary", ""), job.get("apply_link", "#"))
+            )
+            posting_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO posting_skills VALUES (?, ?, ?)",
+                [(posting_id, position, skill) for position, skill in enumerate(job.get("skills", []))]
+            )
+            for tag in tags:
+                position = self.conn.execute(
+                    "SELECT COALESCE(MAX(position) + 1, 0) FROM posting_tags WHERE tag = ?", (tag,)
+                ).fetchone()[0]
+                self.conn.execute("INSERT INTO posting_tags VALUES (?, ?, ?)", (tag, position, posting_id))
+            return posting_id
+
+    def _postings(self, where, params):
+        """
+        [(posting_id, job dict)] for the postings matching a WHERE clause
+        """
+        rows = self.conn.execute(
+            "SELECT id, title, company, location, experience, salary, apply_link FROM postings " + where, params
+        ).fetchall()
+        if not rows:
+            return []
+        ids = [row[0] for row in rows]
+        skills = {}
+        for posting_id, skill in self.conn.execute(
+            f"SELECT posting_id, skill FROM posting_skills WHERE posting_id IN ({','.join('?' * len(ids))}) "
+            "ORDER BY posting_id, position", ids
+        ):
+            skills.setdefault(posting_id, []).append(skill)
+        return [
+            (posting_id, {"title": title, "company": company, "location": location,
+                          "skills": skills.get(posting_id, []), "experience": experience,
+                          "salary": salary, "apply_link": apply_link})
+            for posting_id, title, company, location, experience, salary, apply_link in rows
+        ]
+
+    def postings_for_skills(self, skills, limit):
+        """
+        Postings listed under the given skills, in the same order and with
+        the same limit rule as the mock job feed
+        """
+        skills = list(skills)
+        if not skills:
+            return []
+        with self._lock:
+            tagged = {}
+            for tag, posting_id in self.conn.execute(
+                f"SELECT tag, posting_id FROM posting_tags WHERE tag IN ({','.join('?' * len(skills))}) "
+                "ORDER BY tag, position", skills
+            ):
+                tagged.setdefault(tag, []).append(posting_id)
+
+            wanted = []
+            for skill in skills:
+                if skill in tagged and len(wanted) < limit:
+                    wanted.extend(tagged[skill])
+            if not wanted:
+                return []
+            unique_ids = list(dict.fromkeys(wanted))
+            by_id = dict(self._postings(f"WHERE id IN ({','.join('?' * len(unique_ids))})", unique_ids))
+        return [by_id[posting_id] for posting_id in wanted]
+
+    def clear_postings(self):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM posting_tags")
+            self.conn.execute("DELETE FROM posting_skills")
+            self.conn.execute("DELETE FROM postings")
+
+    def search_postings(self, skill=None, location=None, experience_years=None, limit=20):
+        """
+        Postings filtered by skill, location and years of experience, each
+        filter answered from its index
+        """
+        clauses, params = [], []
+        if skill:
+            clauses.append("id IN (SELECT posting_id FROM posting_skills WHERE skill = ? COLLATE NOCASE)")
+            params.append(skill)
+        if location:
+            clauses.append("location = ? COLLATE NOCASE")
+            params.append(location)
+        if experience_years is not None:
+            clauses.append("experience_min <= ? AND experience_max >= ?")
+            params.extend([experience_years, experience_years])
+        where = ("WHERE " + " AND ".join(clauses) if clauses else "") + " ORDER BY id LIMIT ?"
+        with self._lock:
+            return [job for _, job in self._postings(where, params + [limit])]
+
+    def role_details(self, role_ids):
+        """
+        {role_id: (name, description, required_skills, seq)} for just these
+        roles, all read from one version of the catalogue
+        """
+        role_ids = list(role_ids)
+        marks = ",".join("?" * len(role_ids))
+        with self._lock, _read_transaction(self.conn):
+            details = {
+                role_id: (name, description, [], seq)
+                for role_id, name, description, seq in self.conn.execute(
+                    f"SELECT id, name, description, seq FROM roles WHERE id IN ({marks})", role_ids
+                )
+            }
+            for role_id, skill in self.conn.execute(
+                f"SELECT role_id, skill FROM role_skills WHERE role_id IN ({marks}) ORDER BY role_id, position",
+                role_ids
+            ):
+                details[role_id][2].append(skill)
+        return details
+
+    def data_version(self):
+        """
+        Changes whenever roles are written, by this or any other process
+        """
+        with self._lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0], self._local_writes
+
+    def changed_roles(self, after_seq):
+        """
+        (id, seq, deleted, skills) of roles written after after_seq
+        """
+        with self._lock, _read_transaction(self.conn):
+            roles = self.conn.execute(
+                "SELECT id, seq, deleted FROM roles WHERE seq > ? ORDER BY seq", (after_seq,)
+            ).fetchall()
+            skills = {}
+            if roles:
+                ids = [role[0] for role in roles]
+                for role_id, skill in self.conn.execute(
+                    f"SELECT role_id, skill FROM role_skills WHERE role_id IN ({','.join('?' * len(ids))}) "
+                    "ORDER BY role_id, position", ids
+                ):
+                    skills.setdefault(role_id, []).append(skill)
+        return [(role_id, seq, deleted, skills.get(role_id, [])) for role_id, seq, deleted in roles]
+
+    def snapshot(self):
+        return CatalogueSnapshot(self)
+
+
+class CatalogueSnapshot:
+    """
+    Read-only, array-backed view of the catalogue's roles for matching.
+
+    Every role version gets a slot; an updated or deleted role's old slot
+    is marked dead and skipped, so reloads only append. When more than
+    half of the slots are dead the arrays are rebuilt from scratch.
+    """
+
+    def __init__(self, catalogue):
+        self.catalogue = catalogue
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        self.role_ids = array("q")
+        self.seqs = array("q")
+        self.required_counts = array("H")
+        self.alive = bytearray()
+        self.slot_of = {}
+        self.postings = {}
+        self.dead = 0
+        self.seq = 0
+        self.version = self.catalogue.data_version()
+        self._apply(self.catalogue.changed_roles(0))
+
+    def _apply(self, changes):
+        for role_id, seq, deleted, skills in changes:
+            old = self.slot_of.pop(role_id, None)
+            if old is not None:
+                self.alive[old] = 0
+                self.dead += 1
+            if not deleted and skills:
+                slot = len(self.role_ids)
+                self.role_ids.append(role_id)
+                self.seqs.append(seq)
+                self.required_counts.append(len(skills))
+                self.alive.append(1)
+                self.slot_of[role_id] = slot
+                for skill in skills:
+                    self.postings.setdefault(skill, array("l")).append(slot)
+            self.seq = max(self.seq, seq)
+
+    def refresh(self):
+        """
+        Pick up writes made since the last refresh, if there were any
+        """
+        version = self.catalogue.data_version()
+        if version == self.version:
+            return False
+        with self._lock:
+            self.version = version
+            self._apply(self.catalogue.changed_roles(self.seq))
+            if self.dead > len(self.role_ids) // 2:
+                self._load()
+        return True
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def _current(self, versions):
+        """
+        role_details() of {role_id: seq}, or None when any of them was
+        written again after this snapshot read it
+        """
+        details = self.catalogue.role_details(versions)
+        if all(role_id in details and details[role_id][3] == seq for role_id, seq in versions.items()):
+            return details
+        return None
+
+    def suggest(self, found_skills, threshold=MATCH_THRESHOLD, top_k=None):
+        """
+        Same result as JobIndex.suggest over the catalogue's roles; names,
+        descriptions and skill lists are read only for the returned roles.
+        Those are checked against the version the scores came from, and
+        scored again if a role changed in between.
+        """
+        found = set(found_skills)
+        for _ in range(REFRESH_ATTEMPTS):
+            self.refresh()
+            with self._lock:
+                counts = {}
+                for skill in found:
+                    for slot in self.postings.get(skill, ()):
+                        if self.alive[slot]:
+                            counts[slot] = counts.get(slot, 0) + 1
+                scored = []
+                for slot, matched in counts.items():
+                    match_score = matched / self.required_counts[slot]
+                    if match_score > threshold:
+                        # Ties keep catalogue (insertion) order
+                        scored.append((match_score, -self.role_ids[slot], self.seqs[slot]))
+
+            scored.sort(reverse=True)
+            if top_k is not None:
+                scored = scored[:top_k]
+            details = self._current({-neg_id: seq for _, neg_id, seq in scored})
+            if details is not None:
+                break
+        else:
+            # Still being written to; leave out the roles that changed
+            details = self.catalogue.role_details(-neg_id for _, neg_id, _ in scored)
+            scored = [item for item in scored if details.get(-item[1], (None,) * 4)[3] == item[2]]
+
+        suggested_jobs = {}
+        for match_score, neg_id, _ in scored:
+            name, description, required, _ = details[-neg_id]
+            suggested_jobs[name] = {
+                "match_score": match_score,
+                "matched_skills": [skill for skill in required if skill in found],
+                "missing_skills": [skill for skill in required if skill not in found],
+                "description": description
+            }
+        return suggested_jobs
+
+    def roles(self):
+        """
+        The live roles as a job database dict, in catalogue order
+        """
+        for _ in range(REFRESH_ATTEMPTS):
+            self.refresh()
+            with self._lock:
+                versions = {self.role_ids[slot]: self.seqs[slot] for slot in self.slot_of.values()}
+            details = self._current(versions)
+            if details is not None:
+                break
+        else:
+            details = self.catalogue.role_details(versions)
+        return {details[role_id][0]: {"required_skills": details[role_id][2], "description": details[role_id][1]}
+                for role_id in sorted(versions) if role_id in details}
+
+
+class CatalogueJobSource(JobSource):
+    """
+    Job postings from the catalogue, for JobFeed
+    """
+    name = "catalogue"
+
+    def __init__(self, catalogue):
+        self.catalogue = catalogue
+
+    def fetch(self, skills, location, limit):
+        return self.catalogue.postings_for_skills(skills, limit)
+
+
+def seed(path):
+    """
+    Fill a catalogue with JOB_DATABASE and the mock job postings
+    """
+    from job_sources import MOCK_JOBS
+    from pipeline import JOB_DATABASE
+
+    catalogue = Catalogue(path)
+    for name, details in JOB_DATABASE.items():
+        catalogue.upsert_role(name, details["required_skills"], details["description"])
+    catalogue.clear_postings()
+    for tag, jobs in MOCK_JOBS.items():
+        for job in jobs:
+            catalogue.add_posting(job, tags=[tag])
+    return catalogue
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the on-disk job catalogue")
+    commands = parser.add_subparsers(dest="command", required=True)
+    seed_parser = commands.add_parser("seed", help="load JOB_DATABASE and the mock postings")
+    seed_parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "seed":
+        catalogue = seed(args.path)
+        print(f"{args.path}: {len(catalogue.snapshot())} roles")
+
+
+if __name__ == "__main__":
+    main()
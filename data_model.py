@@ -0,0 +1,137 @@
+"""
+Compact representations used inside the pipeline.
+
+Skills are interned once in a SkillVocabulary and referred to by integer
+id afterwards. A resume's skill set is an int used as a bitset, a job is a
+slotted JobRecord with an array of skill ids, and a match is a slotted
+MatchResult of three references. The dict/list shapes the UI and JSON
+output use are only built by MatchResult.to_dict at the display boundary.
+"""
+import sys
+from array import array
+
+
+class SkillVocabulary:
+    """
+    Two-way skill <-> integer id mapping. Ids are dense and never reused,
+    so a bitset stays valid as the vocabulary grows.
+    """
+    __slots__ = ("_ids", "skills")
+
+    def __init__(self, skills=()):
+        self._ids = {}
+        self.skills = []
+        for skill in skills:
+            self.intern(skill)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, skill):
+        return skill in self._ids
+
+    def intern(self, skill):
+        skill_id = self._ids.get(skill)
+        if skill_id is None:
+            skill_id = len(self.skills)
+            skill = sys.intern(skill)
+            self._ids[skill] = skill_id
+            self.skills.append(skill)
+        return skill_id
+
+    def get(self, skill):
+        """
+        Id of a known skill, None otherwise (does not intern)
+        """
+        return self._ids.get(skill)
+
+    def bitset(self, skills):
+        """
+        Bitset of the known skills among skills; unknown ones are dropped
+        """
+        bits = 0
+        for skill in skills:
+            skill_id = self._ids.get(skill)
+            if skill_id is not None:
+                bits |= 1 << skill_id
+        return bits
+
+    @staticmethod
+    def ids(bits):
+        """
+        Set bit positions of a bitset, lowest first
+        """
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    def names(self, bits):
+        return [self.skills[skill_id] for skill_id in self.ids(bits)]
+
+
+class JobRecord:
+    """
+    One role: name, description and required skills as an id array
+    (a skill listed twice is kept twice, as suggest_jobs counts it twice)
+    """
+    __slots__ = ("job_id", "name", "description", "skill_ids")
+
+    def __init__(self, job_id, name, description, skill_ids):
+        self.job_id = job_id
+        self.name = name
+        self.description = description
+        self.skill_ids = array("I", skill_ids)
+
+    @classmethod
+    def from_dict(cls, job_id, name, details, vocabulary):
+        skill_ids = [vocabulary.intern(skill) for skill in details["required_skills"]]
+        return cls(job_id, name, details["description"], skill_ids)
+
+
+class MatchResult:
+    """
+    A resume x job match: the job, how many required skills matched, and
+    the resume bitset they were matched against
+    """
+    __slots__ = ("job", "matched", "resume_bits")
+
+    def __init__(self, job, matched, resume_bits):
+        self.job = job
+        self.matched = matched
+        self.resume_bits = resume_bits
+
+    @property
+    def match_score(self):
+        return self.matched / len(self.job.skill_ids)
+
+    def sort_key(self):
+        """
+        Best score first, ties in job order
+        """
+        return (self.match_score, -self.job.job_id)
+
+    def matched_ids(self):
+        return [i for i in self.job.skill_ids if self.resume_bits >> i & 1]
+
+    def missing_ids(self):
+        return [i for i in self.job.skill_ids if not self.resume_bits >> i & 1]
+
+    def to_dict(self, vocabulary):
+        """
+        The suggest_jobs entry for this match
+        """
+        skills = vocabulary.skills
+        return {
+            "match_score": self.match_score,
+            "matched_skills": [skills[i] for i in self.matched_ids()],
+            "missing_skills": [skills[i] for i in self.missing_ids()],
+            "description": self.job.description
+        }
+
+
+def results_to_dict(results, vocabulary):
+    """
+    suggest_jobs-shaped dict from a ranked list of MatchResults
+    """
+    return {result.job.name: result.to_dict(vocabulary) for result in results}
@@ -0,0 +1,254 @@
+import atexit
+import multiprocessing
+import os
+import posixpath
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from xml.etree import ElementTree
+
+from instrumentation import stage
+from ocr import OCR_WORKERS, DocumentOcr, is_available as ocr_available
+
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Limits so that one huge upload cannot stall a worker
+MAX_PAGES = int(os.environ.get("RESUME_MAX_PAGES", 50))
+MAX_BYTES = int(os.environ.get("RESUME_MAX_BYTES", 10 * 1024 * 1024))
+PDF_WORKERS = int(os.environ.get("RESUME_PDF_WORKERS", os.cpu_count() or 1))
+
+# Pages handed to a worker per task; small PDFs never leave the process
+PAGES_PER_TASK = 4
+
+# Uncompressed size of the XML parts read from one DOCX (text only, media
+# is never read), so a zip bomb cannot keep a worker busy
+MAX_DOCX_XML_BYTES = int(os.environ.get("RESUME_MAX_DOCX_XML_BYTES", 64 * 1024 * 1024))
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_P = _W + "p"
+_T = _W + "t"
+_TAB = _W + "tab"
+_BREAKS = (_W + "br", _W + "cr")
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_OFFICE_DOCUMENT = "/officeDocument"
+_HEADER_FOOTER = ("/header", "/footer")
+
+_pool = None
+_pool_workers = 0
+
+
+class ExtractionLimitError(ValueError):
+    """
+    Raised when a file is over the configured page or byte limit
+    """
+
+
+def _get_pool(workers):
+    """
+    Shared process pool, created on first use and reused across uploads
+    """
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        # spawn, not fork: the Streamlit server is multi-threaded
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_workers = workers
+    return _pool
+
+
+@atexit.register
+def _shutdown_pool():
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_range(data, start, stop):
+    """
+    Worker task: text of pages [start, stop), each page extracted once
+    """
+    import pdfplumber
+
+    with pdfplumber.open(BytesIO(data)) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def check_size(data, max_bytes=MAX_BYTES):
+    if max_bytes is not None and len(data) > max_bytes:
+        raise ExtractionLimitError(f"File is {len(data)} bytes, limit is {max_bytes} bytes")
+
+
+def iter_pdf_pages(data, max_pages=MAX_PAGES, max_bytes=MAX_BYTES, workers=PDF_WORKERS, ocr_workers=OCR_WORKERS):
+    """
+    Yield the text of each PDF page in order, as soon as it is ready.
+
+    Large documents are split into page ranges that run on a process pool,
+    so the caller can start matching the first pages while later ones are
+    still being extracted. Pages without a text layer go through OCR
+    when it is available (see ocr.py).
+    """
+    ocr = DocumentOcr(data, ocr_workers) if ocr_available() else None
+    try:
+        pages = _iter_pdf_text_layer(data, max_pages, max_bytes, workers)
+        if ocr is None:
+            yield from pages
+        else:
+            yield from ocr.ordered(ocr.submit(i) if not text.strip() else text for i, text in enumerate(pages))
+    finally:
+        if ocr is not None:
+            ocr.close()
+
+
+def _iter_pdf_text_layer(data, max_pages, max_bytes, workers):
+    # Parsers are imported on the first file of their type, not at startup
+    import pdfplumber
+
+    check_size(data, max_bytes)
+
+    with pdfplumber.open(BytesIO(data)) as pdf:
+        page_count = len(pdf.pages)
+        if max_pages is not None and page_count > max_pages:
+            raise ExtractionLimitError(f"PDF has {page_count} pages, limit is {max_pages} pages")
+
+        if workers <= 1 or page_count <= PAGES_PER_TASK:
+            for page in pdf.pages:
+                with stage("extract_page", size=1):
+                    page_text = page.extract_text() or ""
+                yield page_text
+            return
+
+    pool = _get_pool(workers)
+    futures = [
+        pool.submit(_extract_page_range, data, start, min(start + PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PAGES_PER_TASK)
+    ]
+    try:
+        for start, future in zip(range(0, page_count, PAGES_PER_TASK), futures):
+            # Time spent waiting on each page range from the pool
+            with stage("extract_page_range", size=min(PAGES_PER_TASK, page_count - start)):
+                pages = future.result()
+            yield from pages
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _relationships(archive, part):
+    """
+    [(type, target part name)] of a package part, from its .rels file
+    """
+    folder, name = posixpath.split(part)
+    rels = posixpath.join(folder, "_rels", name + ".rels")
+    try:
+        info = archive.getinfo(rels)
+    except KeyError:
+        return []
+    relationships = []
+    with archive.open(info) as stream:
+        for _, elem in ElementTree.iterparse(stream):
+            if elem.tag == _RELS and elem.get("TargetMode") != "External":
+                target = posixpath.normpath(posixpath.join(folder, elem.get("Target", "")))
+                relationships.append((elem.get("Type", ""), target.lstrip("/")))
+    return relationships
+
+
+def _docx_parts(archive):
+    """
+    Part names to read text from: the main document, then its headers and
+    footers (each once, in relationship order)
+    """
+    document = "word/document.xml"
+    for rel_type, target in _relationships(archive, ""):
+        if rel_type.endswith(_OFFICE_DOCUMENT):
+            document = target
+    parts = [document]
+    for rel_type, target in _relationships(archive, document):
+        if rel_type.endswith(_HEADER_FOOTER) and target not in parts:
+            parts.append(target)
+    return parts
+
+
+def _iter_part_paragraphs(stream):
+    """
+    Yield the text of every w:p in one WordprocessingML part, in document
+    order. Paragraphs in table cells and text boxes are yielded on their
+    own, before the paragraph that anchors the text box. Every element is
+    dropped once it has been read, so memory stays flat however long the
+    part is.
+    """
+    paragraphs = []
+    parents = []
+    fallback_depth = 0
+    for event, elem in ElementTree.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            if elem.tag == _MC_FALLBACK:
+                # Fallback repeats the text boxes of the mc:Choice next to it
+                fallback_depth += 1
+            elif elem.tag == _P and not fallback_depth:
+                paragraphs.append([])
+            continue
+
+        parents.pop()
+        tag = elem.tag
+        if fallback_depth:
+            if tag == _MC_FALLBACK:
+                fallback_depth -= 1
+        elif tag == _T:
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag == _TAB:
+            if paragraphs:
+                paragraphs[-1].append("\t")
+        elif tag in _BREAKS:
+            if paragraphs:
+                paragraphs[-1].append("\n")
+        elif tag == _P:
+            yield "".join(paragraphs.pop())
+
+        # Children end before their parent, so each element is always its
+        # parent's last child when it ends
+        elem.clear()
+        if parents:
+            del parents[-1][-1]
+
+
+def iter_docx_paragraphs(data, max_bytes=MAX_BYTES, max_xml_bytes=MAX_DOCX_XML_BYTES):
+    """
+    Yield the text of every paragraph of a DOCX file: body text, table
+    cells, text boxes, then headers and footers.
+
+    The XML parts are streamed out of the zip with an incremental parser;
+    images and other media are never decompressed.
+    """
+    check_size(data, max_bytes)
+
+    with zipfile.ZipFile(BytesIO(data)) as archive:
+        parts = []
+        for name in _docx_parts(archive):
+            try:
+                parts.append(archive.getinfo(name))
+            except KeyError:
+                continue
+        xml_bytes = sum(info.file_size for info in parts)
+        if max_xml_bytes is not None and xml_bytes > max_xml_bytes:
+            raise ExtractionLimitError(f"DOCX text is {xml_bytes} bytes uncompressed, limit is {max_xml_bytes} bytes")
+
+        for info in parts:
+            with archive.open(info) as stream:
+                yield from _iter_part_paragraphs(stream)
+
+
+def iter_text(data, file_type, **limits):
+    """
+    Yield text chunks (PDF pages or DOCX paragraphs) of an uploaded file
+    """
+    if file_type == PDF_MIME:
+        for page_text in iter_pdf_pages(data, **limits):
+            if page_text:
+                yield page_text + "\n"
+    elif file_type == DOCX_MIME:
+        for para_text in iter_docx_paragraphs(data, limits.get("max_bytes", MAX_BYTES)):
+            yield para_text + "\n"
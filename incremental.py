@@ -0,0 +1,174 @@
+"""
+Incremental re-analysis of a resume that was edited and uploaded again.
+
+A FingerprintStore remembers, per document, the text and skill counts of
+every PDF page or DOCX paragraph keyed by a hash of its content. On the
+next upload only the pages/paragraphs with an unseen hash are extracted
+and matched; the rest are reused and the counts merged. Job suggestions
+and the gap analysis are only recomputed when the skill set changed.
+
+Skills never contain a newline, and pages/paragraphs are joined with one,
+so matching them one at a time finds exactly what matching the joined
+text finds.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from extraction import (DOCX_MIME, MAX_BYTES, MAX_PAGES, PAGES_PER_TASK, PDF_MIME, PDF_WORKERS,
+                        ExtractionLimitError, _extract_page_range, _get_pool, check_size,
+                        iter_docx_paragraphs)
+from ocr import OCR_WORKERS, fill_empty_pages, page_fingerprint
+from skill_matcher import SKILL_MATCHER
+
+
+class DocumentState:
+    __slots__ = ("parts", "skills", "suggested_jobs", "skill_gap_analysis")
+
+    def __init__(self):
+        # fingerprint -> (text, {skill: count})
+        self.parts = {}
+        self.skills = None
+        self.suggested_jobs = None
+        self.skill_gap_analysis = None
+
+
+class FingerprintStore:
+    """
+    Per-document part fingerprints, bounded to the last maxsize documents
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+        self.parts_reused = 0
+        self.parts_extracted = 0
+
+    def get(self, key):
+        with self._lock:
+            state = self._documents.get(key)
+            if state is not None:
+                self._documents.move_to_end(key)
+            return state
+
+    def put(self, key, state):
+        with self._lock:
+            self._documents[key] = state
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.maxsize:
+                self._documents.popitem(last=False)
+
+    def record(self, reused, extracted):
+        with self._lock:
+            self.parts_reused += reused
+            self.parts_extracted += extracted
+
+    def stats(self):
+        return {"documents": len(self._documents), "parts_reused": self.parts_reused,
+                "parts_extracted": self.parts_extracted}
+
+
+def _fingerprint(*chunks):
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.digest()
+
+
+def _pdf_fingerprints(data, max_pages):
+    """
+    One fingerprint per page: a hash of the page box, the decoded content
+    streams and the resources they draw with (fonts and ToUnicode maps,
+    images, nested forms), which is far cheaper than laying out the text
+    """
+    import pdfplumber
+
+    with pdfplumber.open(BytesIO(data)) as pdf:
+        if max_pages is not None and len(pdf.pages) > max_pages:
+            raise ExtractionLimitError(f"PDF has {len(pdf.pages)} pages, limit is {max_pages} pages")
+        return [page_fingerprint(page) for page in pdf.pages]
+
+
+def _pdf_page_texts(data, indices, workers):
+    """
+    {page index: text} for the given pages, on the extraction pool when
+    there are enough of them
+    """
+    if workers > 1 and len(indices) > PAGES_PER_TASK:
+        pool = _get_pool(workers)
+        futures = {i: pool.submit(_extract_page_range, data, i, i + 1) for i in indices}
+        return {i: future.result()[0] for i, future in futures.items()}
+
+    import pdfplumber
+
+    with pdfplumber.open(BytesIO(data)) as pdf:
+        return {i: pdf.pages[i].extract_text() or "" for i in indices}
+
+
+def _pdf_parts(data, max_pages, workers, ocr_workers):
+    fingerprints = _pdf_fingerprints(data, max_pages)
+
+    def extract(indices):
+        texts = fill_empty_pages(data, _pdf_page_texts(data, indices, workers), ocr_workers)
+        return {i: text + "\n" if text else "" for i, text in texts.items()}
+    return fingerprints, extract
+
+
+def _docx_parts(data, max_bytes):
+    texts = [text + "\n" for text in iter_docx_paragraphs(data, max_bytes)]
+    return [_fingerprint(text.encode()) for text in texts], lambda indices: {i: texts[i] for i in indices}
+
+
+def analyze_document(previous, file_bytes, file_type, suggest, gap_analysis, expand=None,
+                     max_pages=MAX_PAGES, max_bytes=MAX_BYTES, workers=PDF_WORKERS, ocr_workers=OCR_WORKERS):
+    """
+    DocumentState of an upload, reusing whatever parts of previous (the
+    state of the last version, or None) are unchanged.
+
+    suggest(skills) and gap_analysis(skills, suggested_jobs) are called
+    only when the skill set differs from the previous version.
+    expand(resume_text, skills), if given, can add skills found some other
+    way than exact matching (e.g. the semantic matcher). Returns
+    (state, resume_text, parts reused, parts extracted); the caller keeps
+    state in a FingerprintStore. Needs no store itself, so it can run in
+    another process.
+    """
+    check_size(file_bytes, max_bytes)
+    if file_type == PDF_MIME:
+        fingerprints, extract = _pdf_parts(file_bytes, max_pages, workers, ocr_workers)
+    elif file_type == DOCX_MIME:
+        fingerprints, extract = _docx_parts(file_bytes, max_bytes)
+    else:
+        fingerprints, extract = [], None
+
+    previous = previous or DocumentState()
+    state = DocumentState()
+    changed = [i for i, fingerprint in enumerate(fingerprints) if fingerprint not in previous.parts]
+    new_texts = extract(changed) if changed else {}
+
+    texts = []
+    counts = {}
+    for i, fingerprint in enumerate(fingerprints):
+        part = state.parts.get(fingerprint) or previous.parts.get(fingerprint)
+        if part is None:
+            text = new_texts[i]
+            part = (text, SKILL_MATCHER.count(text))
+        state.parts[fingerprint] = part
+        texts.append(part[0])
+        for skill, count in part[1].items():
+            counts[skill] = counts.get(skill, 0) + count
+
+    state.skills = [skill for skill in SKILL_MATCHER.skills if counts.get(skill)]
+    resume_text = "".join(texts)
+    if expand is not None:
+        state.skills = expand(resume_text, state.skills)
+    if previous.skills is not None and previous.skills == state.skills:
+        state.suggested_jobs = previous.suggested_jobs
+        state.skill_gap_analysis = previous.skill_gap_analysis
+    elif state.skills:
+        state.suggested_jobs = suggest(state.skills)
+        state.skill_gap_analysis = gap_analysis(state.skills, state.suggested_jobs)
+
+    return state, resume_text, len(fingerprints) - len(changed), len(changed)
@@ -0,0 +1,190 @@
+"""
+Opt-in per-stage timing and allocation counters for the pipeline.
+
+Set RESUME_INSTRUMENTATION=1 (or call enable()) to record, for every
+stage: calls, wall time, CPU time of the calling thread, net allocated
+memory blocks and input size. RESUME_INSTRUMENTATION_LOG=1 also writes
+one JSON log line per stage call. When disabled, stage() hands back a
+shared no-op context manager and timed() adds a single flag check.
+"""
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+ENV_FLAG = "RESUME_INSTRUMENTATION"
+ENV_LOG_FLAG = "RESUME_INSTRUMENTATION_LOG"
+
+logger = logging.getLogger("resume.instrumentation")
+
+_enabled = os.environ.get(ENV_FLAG) == "1"
+_log_records = os.environ.get(ENV_LOG_FLAG) == "1"
+_lock = threading.Lock()
+_stats = {}
+
+FIELDS = ("calls", "wall_seconds", "cpu_seconds", "alloc_blocks", "input_size")
+
+
+def enable(log_records=False):
+    """
+    Turn recording on. Also sets the environment flag so worker processes
+    started afterwards record too.
+    """
+    global _enabled, _log_records
+    _enabled = True
+    _log_records = log_records
+    os.environ[ENV_FLAG] = "1"
+    if log_records:
+        os.environ[ENV_LOG_FLAG] = "1"
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    os.environ.pop(ENV_FLAG, None)
+
+
+def is_enabled():
+    return _enabled
+
+
+def record(name, wall, cpu, blocks, size):
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = dict.fromkeys(FIELDS, 0)
+            stats["max_wall_seconds"] = 0.0
+        stats["calls"] += 1
+        stats["wall_seconds"] += wall
+        stats["cpu_seconds"] += cpu
+        stats["alloc_blocks"] += blocks
+        stats["input_size"] += size or 0
+        stats["max_wall_seconds"] = max(stats["max_wall_seconds"], wall)
+    if _log_records:
+        logger.info(json.dumps({
+            "stage": name, "wall_ms": round(wall * 1000, 3), "cpu_ms": round(cpu * 1000, 3),
+            "alloc_blocks": blocks, "input_size": size
+        }))
+
+
+class _Stage:
+    __slots__ = ("name", "size", "_wall", "_cpu", "_blocks")
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+    def __enter__(self):
+        self._blocks = sys.getallocatedblocks()
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        record(self.name, wall, cpu, sys.getallocatedblocks() - self._blocks, self.size)
+        return False
+
+
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP = _NoopStage()
+
+
+def stage(name, size=None):
+    """
+    Context manager timing one stage call; size is the input size
+    (bytes, characters, items) recorded with it
+    """
+    if not _enabled:
+        return _NOOP
+    return _Stage(name, size)
+
+
+def timed(name, size_of=None):
+    """
+    Decorator form of stage(). size_of is applied to the first argument
+    to get the input size, e.g. size_of=len.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            size = size_of(args[0]) if size_of and args else None
+            with _Stage(name, size):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """
+    Copy of the counters, {stage: {field: total}}
+    """
+    with _lock:
+        return {name: dict(stats) for name, stats in _stats.items()}
+
+
+def drain():
+    """
+    Return the counters and reset them; used to ship a worker process's
+    numbers back to the parent, which adds them with merge()
+    """
+    global _stats
+    with _lock:
+        stats, _stats = _stats, {}
+    return stats
+
+
+def merge(stats):
+    with _lock:
+        for name, other in stats.items():
+            mine = _stats.get(name)
+            if mine is None:
+                _stats[name] = dict(other)
+                continue
+            for field in FIELDS:
+                mine[field] += other[field]
+            mine["max_wall_seconds"] = max(mine["max_wall_seconds"], other["max_wall_seconds"])
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+PROMETHEUS_METRICS = [
+    ("calls", "resume_stage_calls_total", "counter", "Number of times the stage ran"),
+    ("wall_seconds", "resume_stage_wall_seconds_total", "counter", "Wall-clock time spent in the stage"),
+    ("cpu_seconds", "resume_stage_cpu_seconds_total", "counter", "CPU time spent in the stage"),
+    # Net blocks can go down when a stage frees more than it allocates
+    ("alloc_blocks", "resume_stage_alloc_blocks", "gauge", "Net memory blocks allocated by the stage"),
+    ("input_size", "resume_stage_input_size_total", "counter", "Total input size handed to the stage"),
+]
+
+
+def render_prometheus():
+    """
+    Counters in the Prometheus text exposition format
+    """
+    stats = snapshot()
+    lines = []
+    for field, metric, metric_type, help_text in PROMETHEUS_METRICS:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for name in sorted(stats):
+            lines.append(f'{metric}{{stage="{name}"}} {stats[name][field]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,98 @@
+import heapq
+from array import array
+
+from data_model import JobRecord, MatchResult, SkillVocabulary, results_to_dict
+
+MATCH_THRESHOLD = 0.3
+
+
+class JobIndex:
+    """
+    Inverted skill -> jobs index over a job database.
+
+    Only jobs that share at least one skill with the resume are scored, so
+    the cost of a lookup depends on the resume's skills, not on the size of
+    the catalogue. Jobs are kept as JobRecords over an interned skill
+    vocabulary and posting lists are arrays of job ids.
+    """
+
+    def __init__(self, job_db, vocabulary=None):
+        self.vocabulary = SkillVocabulary() if vocabulary is None else vocabulary
+        self.jobs = [
+            JobRecord.from_dict(job_id, name, details, self.vocabulary)
+            for job_id, (name, details) in enumerate(job_db.items())
+        ]
+
+        self.skill_jobs = {}
+        for job in self.jobs:
+            for skill_id in job.skill_ids:
+                self.skill_jobs.setdefault(skill_id, array("I")).append(job.job_id)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    @property
+    def job_names(self):
+        return [job.name for job in self.jobs]
+
+    def resume_bits(self, found_skills):
+        """
+        Bitset of a resume's skills; skills no job asks for are dropped
+        """
+        if isinstance(found_skills, int):
+            return found_skills
+        return self.vocabulary.bitset(found_skills)
+
+    def add_counts(self, counts, resume_bits):
+        """
+        Add the skills of resume_bits to match counts (job id -> matched
+        skills) in place, so counts can be built up as skills are found
+        """
+        for skill_id in SkillVocabulary.ids(resume_bits):
+            for job_id in self.skill_jobs.get(skill_id, ()):
+                counts[job_id] = counts.get(job_id, 0) + 1
+        return counts
+
+    def match_counts(self, resume_bits):
+        """
+        Number of matched required skills for each job sharing a skill
+        """
+        return self.add_counts({}, resume_bits)
+
+    def match(self, found_skills, threshold=MATCH_THRESHOLD, top_k=None):
+        """
+        MatchResults scoring above threshold, best first, ties in job
+        database order. With top_k only the best k jobs are kept, using a
+        heap instead of sorting every candidate.
+        """
+        resume_bits = self.resume_bits(found_skills)
+        return self.rank(self.match_counts(resume_bits), resume_bits, threshold, top_k)
+
+    def rank(self, counts, resume_bits, threshold=MATCH_THRESHOLD, top_k=None):
+        """
+        match() from precomputed match counts of resume_bits
+        """
+        results = []
+        for job_id, matched in counts.items():
+            result = MatchResult(self.jobs[job_id], matched, resume_bits)
+            if result.match_score > threshold:
+                results.append(result)
+
+        if top_k is None:
+            results.sort(key=MatchResult.sort_key, reverse=True)
+            return results
+        return heapq.nlargest(top_k, results, key=MatchResult.sort_key)
+
+    def suggest(self, found_skills, threshold=MATCH_THRESHOLD, top_k=None):
+        """
+        Same as match(), in the suggest_jobs dict format
+        """
+        return results_to_dict(self.match(found_skills, threshold, top_k), self.vocabulary)
+
+    def roles(self):
+        """
+        The indexed jobs as a job database dict, in job order
+        """
+        skills = self.vocabulary.skills
+        return {job.name: {"required_skills": [skills[i] for i in job.skill_ids], "description": job.description}
+                for job in self.jobs}
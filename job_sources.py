@@ -0,0 +1,277 @@
+"""
+Pluggable job-board layer behind get_real_jobs.
+
+Each JobSource fetches listings from one provider. JobFeed fans a query out
+to all sources at once with asyncio, gives every source its own timeout,
+and caches merged results per (skills, location, limit) in an LRU of at
+most maxsize queries. Skills are part of the key in the order given,
+since a source may use that order to pick its listings. Once an entry
+is older than ttl it is still served while a background refresh runs
+(stale-while-revalidate), until it is older than stale_ttl and dropped.
+A query on which every source failed is not cached, and a failed
+refresh keeps the stale entry.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from analysis_cache import AnalysisCache
+
+logger = logging.getLogger(__name__)
+
+JOB_FIELDS = ("title", "company", "location", "skills", "experience", "salary", "apply_link")
+
+# Mock data based on skills (actual APIs need API keys)
+MOCK_JOBS = {
+    "python": [
+        {
+            "title": "Python Developer",
+            "company": "Tech Solutions Inc.",
+            "location": "Bangalore",
+            "skills": ["Python", "Django", "SQL"],
+            "experience": "2-4 years",
+            "salary": "₹8-12 LPA",
+            "apply_link": "#"
+        },
+        {
+            "title": "Backend Engineer - Python",
+            "company": "Startup Innovations",
+            "location": "Remote",
+            "skills": ["Python", "FastAPI", "MongoDB"],
+            "experience": "1-3 years",
+            "salary": "₹6-10 LPA",
+            "apply_link": "#"
+        }
+    ],
+    "javascript": [
+        {
+            "title": "Frontend Developer",
+            "company": "Web Creations Ltd.",
+            "location": "Delhi",
+            "skills": ["JavaScript", "React", "CSS"],
+            "experience": "2-5 years",
+            "salary": "₹7-11 LPA",
+            "apply_link": "#"
+        }
+    ],
+    "java": [
+        {
+            "title": "Java Software Engineer",
+            "company": "Enterprise Systems",
+            "location": "Hyderabad",
+            "skills": ["Java", "Spring Boot", "Microservices"],
+            "experience": "3-6 years",
+            "salary": "₹10-15 LPA",
+            "apply_link": "#"
+        }
+    ],
+    "data analysis": [
+        {
+            "title": "Data Analyst",
+            "company": "Analytics Pro",
+            "location": "Mumbai",
+            "skills": ["Python", "SQL", "Excel", "Tableau"],
+            "experience": "1-3 years",
+            "salary": "₹5-9 LPA",
+            "apply_link": "#"
+        }
+    ]
+}
+
+
+class JobSource:
+    """
+    One job board. fetch() is blocking and runs on a worker thread.
+    """
+    name = "source"
+    timeout = None  # seconds; None uses the JobFeed default
+
+    def fetch(self, skills, location, limit):
+        raise NotImplementedError
+
+
+class MockJobSource(JobSource):
+    """
+    Built-in listings, used when no real job board is configured
+    """
+    name = "mock"
+
+    def __init__(self, jobs=None):
+        self.jobs = MOCK_JOBS if jobs is None else jobs
+
+    def fetch(self, skills, location, limit):
+        job_listings = []
+        for skill in skills:
+            if skill in self.jobs and len(job_listings) < limit:
+                job_listings.extend(self.jobs[skill])
+        return job_listings
+
+
+class HttpJobSource(JobSource):
+    """
+    A job board with a JSON search endpoint.
+
+    GET {base_url}{path}?skills=a,b&location=..&limit=.. is expected to
+    return a list of jobs, or an object with the list under "jobs". Each
+    source keeps its own pooled requests.Session, so connections to a
+    board are reused across queries.
+    """
+
+    def __init__(self, name, base_url, path="/jobs", headers=None, timeout=5.0, pool_size=10):
+        # requests is only needed once a real job board is configured
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.name = name
+        self.url = base_url.rstrip("/") + path
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    def fetch(self, skills, location, limit):
+        response = self.session.get(
+            self.url,
+            params={"skills": ",".join(skills), "location": location, "limit": limit},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        payload = response.json()
+        jobs = payload.get("jobs", []) if isinstance(payload, dict) else payload
+        return [self.normalize(job) for job in jobs]
+
+    def normalize(self, job):
+        """
+        Job in the shape display_real_jobs expects
+        """
+        normalized = {field: job.get(field, "") for field in JOB_FIELDS}
+        normalized["skills"] = list(job.get("skills") or [])
+        normalized["apply_link"] = job.get("apply_link") or job.get("url") or "#"
+        return normalized
+
+
+class JobFeed:
+    """
+    Concurrent, cached fan-out over several job sources
+    """
+
+    def __init__(self, sources, timeout=3.0, ttl=300, stale_ttl=3600, maxsize=1024, clock=time.monotonic):
+        self.sources = list(sources)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        # (fetched at, jobs) by query
+        self._cache = AnalysisCache(maxsize=maxsize, ttl=stale_ttl, clock=clock)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(4, 2 * len(self.sources)),
+                                            thread_name_prefix="job-feed")
+        # Refreshes wait on fetches, so they must not take the fetch workers
+        self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="job-feed-refresh")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def _fetch_source(self, source, skills, location, limit):
+        loop = asyncio.get_running_loop()
+        call = loop.run_in_executor(self._executor, source.fetch, skills, location, limit)
+        try:
+            return await asyncio.wait_for(call, source.timeout or self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Job source {source.name} timed out")
+        except Exception as e:
+            logger.warning(f"Job source {source.name} failed: {str(e)}")
+        return None
+
+    async def _fetch(self, skills, location, limit):
+        """
+        (merged jobs, whether any source answered)
+        """
+        results = await asyncio.gather(*[
+            self._fetch_source(source, skills, location, limit) for source in self.sources
+        ])
+        unique_jobs = []
+        seen_titles = set()
+        for jobs in results:
+            for job in jobs or ():
+                if job['title'] not in seen_titles:
+                    unique_jobs.append(job)
+                    seen_titles.add(job['title'])
+        answered = any(jobs is not None for jobs in results) or not self.sources
+        return unique_jobs[:limit], answered
+
+    async def fetch_all(self, skills, location="India", limit=5):
+        """
+        Query every source at once and merge the results in source order,
+        dropping repeated titles. A slow or failing source is skipped.
+        """
+        jobs, _ = await self._fetch(skills, location, limit)
+        return jobs
+
+    def _refresh(self, key, skills, location, limit):
+        try:
+            jobs, answered = asyncio.run(self._fetch(skills, location, limit))
+            if answered:
+                self._cache.put(key, (self._clock(), jobs))
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_jobs(self, skills, location="India", limit=5):
+        """
+        Cached jobs for a skill set. Stale entries are returned at once and
+        refreshed in the background.
+        """
+        skills = list(skills)
+        key = (tuple(skills), location, limit)
+        entry = self._cache.get(key)
+        with self._lock:
+            age = self._clock() - entry[0] if entry else None
+            if entry and age < self.ttl:
+                self.hits += 1
+                return entry[1]
+            if entry and age < self.stale_ttl:
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self._refresh_executor.submit(self._refresh, key, skills, location, limit)
+                return entry[1]
+            self.misses += 1
+
+        jobs, answered = asyncio.run(self._fetch(skills, location, limit))
+        if answered:
+            self._cache.put(key, (self._clock(), jobs))
+        return jobs
+
+    def clear(self):
+        """
+        Drop every cached query, so the next get_jobs asks the sources
+        """
+        self._cache.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses,
+                    "size": len(self._cache)}
+
+
+def sources_from_env():
+    """
+    Job sources from RESUME_JOB_SOURCES, e.g. "boardA=https://a.example,
+    boardB=http://localhost:8080". The mock listings are used when unset.
+    """
+    config = os.environ.get("RESUME_JOB_SOURCES", "").strip()
+    if not config:
+        return [MockJobSource()]
+    sources = []
+    for item in config.split(","):
+        name, _, url = item.strip().partition("=")
+        sources.append(HttpJobSource(name, url))
+    return sources
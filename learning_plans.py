@@ -0,0 +1,112 @@
+"""
+Learning plans for missing skills, built once at import.
+
+Each skill has a plan with learning resources, a time estimate and
+practice projects. rank_gap_plans turns the missing skills of the top-N
+suggested jobs into a ranked list: skills needed by more of those jobs
+come first, since learning them unlocks more matches.
+"""
+from functools import lru_cache
+
+LEARNING_RESOURCES = {
+    'python': ['CodeWithHarry Python', 'freeCodeCamp Python', 'Coursera Python for Everybody'],
+    'java': ['Java Tutorial by Kunal Kushwaha', 'Udemy Java Masterclass', 'CodeWithHarry Java'],
+    'javascript': ['JavaScript.info', 'freeCodeCamp JavaScript', 'Namaste JavaScript by Akshay Saini'],
+    'react': ['React Official Docs', 'Scrimba React Course', 'CodeWithHarry React'],
+    'machine learning': ['Coursera ML by Andrew Ng', 'Krish Naik YouTube', 'freeCodeCamp ML'],
+    'data analysis': ['Google Data Analytics Certificate', 'Kaggle Courses', '365 Data Science'],
+    'sql': ['SQL Bolt', 'Khan Academy SQL', 'StrataScratch SQL Practice'],
+    'aws': ['AWS Training Portal', 'freeCodeCamp AWS', 'Stephane Maarek Udemy'],
+    'digital marketing': ['Google Digital Garage', 'Coursera Digital Marketing', 'HubSpot Academy'],
+    'excel': ['Excel Easy Tutorials', 'Chandoo.org', 'YouTube Excel Is Fun']
+}
+
+DEFAULT_TIME = "2-4 weeks for basics"
+TIME_ESTIMATES = {
+    'git': "1 week for basics",
+    'github': "1 week for basics",
+    'html': "1-2 weeks for basics",
+    'css': "1-2 weeks for basics",
+    'excel': "1-2 weeks for basics",
+    'seo': "1-2 weeks for basics",
+    'machine learning': "2-3 months for basics",
+    'deep learning': "2-3 months for basics",
+    'data analysis': "1-2 months for basics",
+    'statistics': "1-2 months for basics",
+    'cloud computing': "1-2 months for basics",
+    'aws': "1-2 months for basics",
+    'android': "1-2 months for basics",
+    'ios': "1-2 months for basics"
+}
+
+DEFAULT_PROJECTS = ["Build 2-3 projects using this skill"]
+PROJECTS = {
+    'python': ["Command-line expense tracker", "Web scraper that saves results to CSV"],
+    'java': ["Library management system", "REST API with Spring Boot"],
+    'javascript': ["To-do app with local storage", "Weather dashboard using a public API"],
+    'react': ["Portfolio site", "Movie search app with routing"],
+    'sql': ["Design and query a small e-commerce database"],
+    'machine learning': ["House price prediction", "Spam classifier"],
+    'data analysis': ["Exploratory analysis of a Kaggle dataset", "Sales dashboard"],
+    'statistics': ["A/B test analysis on sample data"],
+    'aws': ["Deploy a web app on EC2 with S3 static assets"],
+    'git': ["Contribute a fix to an open-source project"],
+    'digital marketing': ["Plan and run a small social media campaign"],
+    'excel': ["Monthly budget workbook with pivot tables"]
+}
+
+
+def _build_plan(skill):
+    return {
+        "resources": tuple(LEARNING_RESOURCES.get(skill, [
+            f'YouTube: {skill.title()} Tutorial',
+            f'Udemy: {skill.title()} Course',
+            'Practice on HackerRank/LeetCode'
+        ])),
+        "time_required": TIME_ESTIMATES.get(skill, DEFAULT_TIME),
+        "projects": tuple(PROJECTS.get(skill, DEFAULT_PROJECTS))
+    }
+
+
+# Every skill with curated data gets its plan up front
+LEARNING_PLANS = {
+    skill: _build_plan(skill)
+    for skill in {**LEARNING_RESOURCES, **TIME_ESTIMATES, **PROJECTS}
+}
+
+
+# Others (catalogue or semantic skills, any string) get the generic plan,
+# from a bounded cache so this module doesn't grow with every skill seen
+_generic_plan = lru_cache(maxsize=1024)(_build_plan)
+
+
+def get_learning_plan(skill):
+    plan = LEARNING_PLANS.get(skill)
+    if plan is None:
+        plan = _generic_plan(skill)
+    return plan
+
+
+@lru_cache(maxsize=4096)
+def _rank(skills, jobs):
+    weights = {}
+    for _, missing_skills in jobs:
+        # A skill listed twice by one job still unlocks only that job
+        for skill in dict.fromkeys(missing_skills):
+            if skill not in skills:
+                weights[skill] = weights.get(skill, 0) + 1
+    # sorted() is stable, so equal weights keep first-seen order
+    ranked = sorted(weights.items(), key=lambda item: item[1], reverse=True)
+    return tuple((skill, weight, get_learning_plan(skill)) for skill, weight in ranked)
+
+
+def rank_gap_plans(skills_list, suggested_jobs, top_n=3):
+    """
+    (skill, jobs unlocked, plan) for the skills missing from the top_n
+    suggested jobs, most-needed first. Memoized per (skill set, jobs).
+    """
+    jobs = tuple(
+        (job_name, tuple(details['missing_skills']))
+        for job_name, details in list(suggested_jobs.items())[:top_n]
+    )
+    return _rank(frozenset(skills_list), jobs)
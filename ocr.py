@@ -0,0 +1,259 @@
+"""
+OCR fallback for PDF pages without a text layer (scanned resumes).
+
+Only pages whose extracted text is empty are rasterized (pdfplumber's
+to_image) and read with Tesseract through pytesseract, so text PDFs take
+the same path as before. Pages of one document are recognized in
+parallel on a process pool, results are cached by a hash of the page's
+content streams and images, and each document gets a time budget after
+which its remaining pages are skipped.
+
+Optional: used when pytesseract and the tesseract binary are installed,
+unless RESUME_OCR=0.
+"""
+import atexit
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from io import BytesIO
+
+from analysis_cache import AnalysisCache
+from instrumentation import stage
+
+logger = logging.getLogger(__name__)
+
+OCR_SETTING = os.environ.get("RESUME_OCR", "auto")
+OCR_LANGUAGE = os.environ.get("RESUME_OCR_LANG", "eng")
+OCR_RESOLUTION = int(os.environ.get("RESUME_OCR_DPI", 300))
+OCR_BUDGET = float(os.environ.get("RESUME_OCR_BUDGET_SECONDS", 30))
+OCR_WORKERS = int(os.environ.get("RESUME_OCR_WORKERS", os.cpu_count() or 1))
+
+# Recognized text by page fingerprint; a scanned CV uploaded again (or a
+# cover page shared by many) is read once per process
+OCR_CACHE = AnalysisCache(maxsize=int(os.environ.get("RESUME_OCR_CACHE_SIZE", 1024)), ttl=24 * 3600)
+
+_available = None
+_lock = threading.Lock()
+_pool = None
+_pool_workers = 0
+
+
+def is_available():
+    """
+    True when OCR is switched on and Tesseract can be run; checked once
+    """
+    global _available
+    with _lock:
+        if _available is None:
+            _available = False
+            if OCR_SETTING not in ("0", ""):
+                try:
+                    import pytesseract
+
+                    pytesseract.get_tesseract_version()
+                    _available = True
+                except Exception as e:
+                    if OCR_SETTING != "auto":
+                        logger.warning(f"OCR requested but Tesseract is not usable: {e}")
+        return _available
+
+
+def _limit_threads():
+    # Pages are already spread over processes, one Tesseract thread each
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # spawn, not fork: the Streamlit server is multi-threaded
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_limit_threads)
+            _pool_workers = workers
+        return _pool
+
+
+@atexit.register
+def _shutdown_pool():
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _hash_object(digest, obj, seen):
+    """
+    Feed a PDF object and everything it references into digest: stream
+    data and dictionaries, each indirect object once
+    """
+    from pdfminer.pdftypes import PDFObjRef, PDFStream
+
+    if isinstance(obj, PDFObjRef):
+        if obj.objid in seen:
+            digest.update(b"R%d" % obj.objid)
+            return
+        seen.add(obj.objid)
+        obj = obj.resolve()
+    if isinstance(obj, PDFStream):
+        digest.update(b"S")
+        _hash_object(digest, obj.attrs, seen)
+        digest.update(obj.get_rawdata() or b"")
+    elif isinstance(obj, dict):
+        digest.update(b"D")
+        for key in sorted(obj, key=str):
+            # Parent leads back up to the whole page tree
+            if key != "Parent":
+                digest.update(str(key).encode())
+                _hash_object(digest, obj[key], seen)
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b"A")
+        for item in obj:
+            _hash_object(digest, item, seen)
+    else:
+        digest.update(repr(obj).encode())
+
+
+def page_fingerprint(page):
+    """
+    Hash of everything that decides a page's text: its box, content
+    streams and the whole /Resources tree (fonts and their ToUnicode maps,
+    images, forms with their own resources). Scanned pages share the
+    same short content stream, so the images are what tells them apart.
+    """
+    from pdfminer.pdftypes import resolve1
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(page.page_obj.mediabox).encode())
+    contents = resolve1(page.page_obj.contents) or []
+    if not isinstance(contents, list):
+        contents = [contents]
+    for stream in contents:
+        digest.update(resolve1(stream).get_data())
+    _hash_object(digest, page.page_obj.resources, set())
+    return digest.hexdigest()
+
+
+def _recognize(page, deadline):
+    import pytesseract
+
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise TimeoutError()
+    image = page.to_image(resolution=OCR_RESOLUTION).original
+    # Tesseract is killed when the document's budget runs out
+    return pytesseract.image_to_string(image, lang=OCR_LANGUAGE, timeout=max(deadline - time.time(), 1))
+
+
+def _ocr_page(data, index, deadline):
+    """
+    Worker task: text of one page, rasterized and recognized
+    """
+    import pdfplumber
+
+    with pdfplumber.open(BytesIO(data)) as pdf:
+        return _recognize(pdf.pages[index], deadline)
+
+
+class DocumentOcr:
+    """
+    OCR of the empty pages of one PDF, within one time budget that
+    starts with the first page sent to OCR.
+
+    submit(index) starts a page and returns its text (cache hit, or
+    workers=1) or a pending (fingerprint, future); text(item) turns
+    either into the page text, "" when the page failed or the budget ran
+    out. The PDF is only opened here once a page needs OCR.
+    """
+
+    def __init__(self, data, workers=OCR_WORKERS, budget=OCR_BUDGET, cache=OCR_CACHE):
+        self.data = data
+        self.workers = workers
+        self.budget = budget
+        self.deadline = None
+        self.cache = cache
+        self.pages = 0
+        self.skipped = 0
+        self._pdf = None
+
+    def _page(self, index):
+        if self._pdf is None:
+            import pdfplumber
+
+            self._pdf = pdfplumber.open(BytesIO(self.data))
+            self.deadline = time.time() + self.budget
+        return self._pdf.pages[index]
+
+    def submit(self, index):
+        self.pages += 1
+        page = self._page(index)
+        fingerprint = page_fingerprint(page)
+        text = self.cache.get(fingerprint)
+        if text is not None:
+            return text
+        if self.workers <= 1:
+            return self._done(fingerprint, lambda: _recognize(page, self.deadline))
+
+        return fingerprint, _get_pool(self.workers).submit(_ocr_page, self.data, index, self.deadline)
+
+    def text(self, item):
+        if isinstance(item, str):
+            return item
+        fingerprint, future = item
+        try:
+            return self._done(fingerprint, lambda: future.result(timeout=max(self.deadline - time.time(), 0)))
+        finally:
+            future.cancel()
+
+    def _done(self, fingerprint, recognize):
+        # The admission CPU/time limits are BaseExceptions and pass
+        # through to guarded(); only OCR's own failures skip the page
+        try:
+            with stage("ocr_page", size=1):
+                text = recognize()
+        except Exception as e:
+            self.skipped += 1
+            if not isinstance(e, TimeoutError) and "timeout" not in str(e).lower():
+                logger.warning(f"OCR failed on a page: {e}")
+            return ""
+        self.cache.put(fingerprint, text)
+        return text
+
+    def ordered(self, items):
+        """
+        Yield page texts (str) and pending pages in order, each pending
+        page as soon as it and every page before it are done
+        """
+        pending = []
+        for item in items:
+            pending.append(item)
+            while pending and (isinstance(pending[0], str) or pending[0][1].done()):
+                yield self.text(pending.pop(0))
+        for item in pending:
+            yield self.text(item)
+
+    def close(self):
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+        if self.skipped:
+            logger.warning(f"OCR skipped {self.skipped} of {self.pages} pages (budget {self.budget:g}s)")
+
+
+def fill_empty_pages(data, texts, workers=OCR_WORKERS):
+    """
+    {page index: text} with the empty pages OCR'd, when OCR is available
+    """
+    empty = [i for i, text in texts.items() if not text.strip()]
+    if not empty or not is_available():
+        return texts
+    ocr = DocumentOcr(data, workers)
+    try:
+        items = {i: ocr.submit(i) for i in empty}
+        return {**texts, **{i: ocr.text(item) for i, item in items.items()}}
+    finally:
+        ocr.close()
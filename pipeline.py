@@ -0,0 +1,340 @@
+"""
+Resume analysis pipeline without any UI, shared by the Streamlit app,
+the bulk screening CLI and the upload API.
+
+extract_text_from_file -> extract_skills -> calculate_resume_score ->
+suggest_jobs -> generate_skill_gap_analysis
+
+analyze_resume_stream fuses these steps over the extractor's chunks (see
+streaming.py) and yields partial results along the way.
+"""
+import logging
+import os
+import threading
+
+from skill_matcher import SKILL_MATCHER
+from extraction import iter_text, PDF_MIME, DOCX_MIME
+from job_index import JobIndex
+from data_model import SkillVocabulary
+from instrumentation import timed
+from learning_plans import rank_gap_plans
+from job_sources import JobFeed, sources_from_env
+from catalogue import Catalogue, CatalogueJobSource
+from incremental import analyze_document
+from streaming import StreamingAnalysis
+from admission import UploadRejected, check_upload, rejection_for
+
+logger = logging.getLogger(__name__)
+
+FILE_TYPES = {
+    ".pdf": PDF_MIME,
+    ".docx": DOCX_MIME
+}
+
+def file_type_for(filename):
+    """
+    MIME type of a resume file from its extension, None if unsupported
+    """
+    return FILE_TYPES.get(os.path.splitext(filename)[1].lower())
+
+@timed("extract_text", size_of=len)
+def extract_text_from_bytes(file_bytes, file_type, **limits):
+    """
+    Text of an uploaded file. Raises UploadRejected when the file fails
+    admission or cannot be read.
+    """
+    check_upload(file_bytes, file_type, **limits)
+    try:
+        return "".join(iter_text(file_bytes, file_type, **limits))
+    except Exception as e:
+        raise rejection_for(e) from None
+
+def extract_text_from_file(file):
+    return extract_text_from_bytes(file.read(), file.type)
+
+@timed("extract_skills", size_of=len)
+def extract_skills(resume_text, semantic=None):
+    """
+    Skills in resume_text. With semantic matching on (RESUME_SEMANTIC=1 or
+    semantic=True) close variants and aliases are found as well.
+    """
+    skills_list = SKILL_MATCHER.extract(resume_text)
+    if semantic is None:
+        semantic = SEMANTIC_MATCHING
+    if semantic:
+        skills_list = add_semantic_skills(resume_text, skills_list)
+    return skills_list
+
+@timed("calculate_resume_score", size_of=len)
+def calculate_resume_score(skills_list):
+    """
+    Calculate resume score based on number of skills found
+    """
+    total_important_skills = 25
+    score = (len(skills_list) / total_important_skills) * 100
+    return min(score, 100)
+
+@timed("generate_skill_gap_analysis", size_of=len)
+def generate_skill_gap_analysis(skills_list, suggested_jobs):
+    """
+    Detailed analysis of missing skills and improvement suggestions
+    """
+    if not suggested_jobs:
+        return "No job matches found for analysis"
+    
+    # Missing skills from the top 3 suggested jobs, the ones that unlock
+    # the most jobs first
+    skill_resources = {}
+    for skill, jobs_unlocked, plan in rank_gap_plans(skills_list, suggested_jobs, top_n=3):
+        skill_resources[skill] = list(plan["resources"])
+    
+    return skill_resources
+
+# RESUME_CATALOGUE points at a SQLite catalogue (see catalogue.py) that
+# replaces JOB_DATABASE and the mock job feed
+CATALOGUE = Catalogue(os.environ["RESUME_CATALOGUE"]) if os.environ.get("RESUME_CATALOGUE") else None
+
+JOB_FEED = JobFeed([CatalogueJobSource(CATALOGUE)] if CATALOGUE else sources_from_env())
+
+@timed("get_real_jobs", size_of=len)
+def get_real_jobs(skills_list, location="India", limit=5):
+    """
+    Fetch real job openings from the configured job boards based on skills
+    """
+    try:
+        return JOB_FEED.get_jobs(skills_list, location, limit)
+    except Exception as e:
+        logger.error(f"Error fetching jobs: {str(e)}")
+        return []
+
+JOB_DATABASE = {
+    "Software Engineer": {
+        "required_skills": ["python", "java", "javascript", "sql", "git"],
+        "description": "Designs, develops, and tests software applications and systems."
+    },
+    "Data Scientist": {
+        "required_skills": ["python", "machine learning", "data analysis", "sql", "statistics"],
+        "description": "Builds machine learning models to extract insights from data."
+    },
+    "Web Developer": {
+        "required_skills": ["javascript", "html", "css", "python", "react"],
+        "description": "Creates and maintains websites and web applications."
+    },
+    "Data Analyst": {
+        "required_skills": ["excel", "sql", "data analysis", "python", "statistics"],
+        "description": "Analyzes data to help businesses make informed decisions."
+    },
+    "Mobile App Developer": {
+        "required_skills": ["android", "kotlin", "java", "swift", "ios"],
+        "description": "Develops applications for mobile devices."
+    },
+    "DevOps Engineer": {
+        "required_skills": ["aws", "cloud computing", "git", "linux", "python"],
+        "description": "Manages and automates software deployment processes."
+    },
+    "Digital Marketing Specialist": {
+        "required_skills": ["digital marketing", "seo", "content writing", "social media"],
+        "description": "Plans and executes online marketing campaigns."
+    },
+    "Backend Developer": {
+        "required_skills": ["python", "java", "node.js", "sql", "mongodb"],
+        "description": "Develops server-side logic and databases for web applications."
+    },
+    "Frontend Developer": {
+        "required_skills": ["javascript", "html", "css", "react", "angular"],
+        "description": "Creates user interfaces and client-side functionality."
+    }
+}
+
+# Skill ids follow taxonomy order, so a resume bitset lists skills in the
+# same order extract_skills does
+SKILL_VOCABULARY = SkillVocabulary(SKILL_MATCHER.skills)
+
+JOB_INDEX = CATALOGUE.snapshot() if CATALOGUE else JobIndex(JOB_DATABASE, SKILL_VOCABULARY)
+
+SEMANTIC_MATCHING = os.environ.get("RESUME_SEMANTIC", "") not in ("", "0")
+SEMANTIC_BUDGET = float(os.environ.get("RESUME_SEMANTIC_BUDGET_MS", "50")) / 1000
+
+_semantic_lock = threading.Lock()
+_semantic_matcher = None
+
+def get_semantic_matcher():
+    """
+    The semantic skill index over the taxonomy and every skill the job
+    database asks for, built on first use (it imports scikit-learn)
+    """
+    global _semantic_matcher
+    with _semantic_lock:
+        if _semantic_matcher is None:
+            from semantic import SemanticSkillMatcher
+
+            skills = list(SKILL_VOCABULARY.skills)
+            if CATALOGUE:
+                skills.extend(JOB_INDEX.postings)
+            _semantic_matcher = SemanticSkillMatcher(
+                skills,
+                descriptions=[details["description"] for details in JOB_DATABASE.values()],
+                budget=SEMANTIC_BUDGET
+            )
+        return _semantic_matcher
+
+@timed("semantic_skills", size_of=len)
+def add_semantic_skills(resume_text, skills_list):
+    """
+    skills_list plus the skills only the semantic index finds, appended
+    in vocabulary order
+    """
+    found = set(skills_list)
+    extra = [skill for skill in get_semantic_matcher().extract(resume_text) if skill not in found]
+    return list(skills_list) + extra
+
+@timed("suggest_jobs", size_of=len)
+def suggest_jobs(found_skills, job_db, top_k=None):
+    """
+    Jobs matching more than 30% of their required skills, best first.
+    job_db can be a job dict, a prebuilt JobIndex or a CatalogueSnapshot.
+    """
+    index = job_db if hasattr(job_db, "suggest") else JobIndex(job_db)
+    return index.suggest(found_skills, top_k=top_k)
+
+def rejected_analysis(rejection):
+    """
+    Analysis result for an upload that was refused or could not be read;
+    "rejection" holds the reason, message and details
+    """
+    return {"resume_text": "", "skills": [], "resume_score": 0, "suggested_jobs": {},
+            "skill_gap_analysis": None, "rejection": rejection.to_dict()}
+
+def analyze_resume(file_bytes, file_type, **limits):
+    """
+    Run the full analysis for one uploaded file. limits are passed on to
+    the text extractor (max_pages, max_bytes, workers).
+    """
+    try:
+        resume_text = extract_text_from_bytes(file_bytes, file_type, **limits)
+    except UploadRejected as e:
+        return rejected_analysis(e)
+
+    analysis = {
+        "resume_text": resume_text,
+        "skills": [],
+        "resume_score": 0,
+        "suggested_jobs": {},
+        "skill_gap_analysis": None,
+        "rejection": None
+    }
+    if not resume_text:
+        return analysis
+
+    skills_list = extract_skills(resume_text)
+    if skills_list:
+        suggested_jobs = suggest_jobs(skills_list, JOB_INDEX)
+        analysis.update({
+            "skills": skills_list,
+            "resume_score": calculate_resume_score(skills_list),
+            "suggested_jobs": suggested_jobs,
+            "skill_gap_analysis": generate_skill_gap_analysis(skills_list, suggested_jobs)
+        })
+    return analysis
+
+def _streamed_analysis(stream):
+    analysis = {
+        "resume_text": stream.text,
+        "skills": stream.skills,
+        "resume_score": 0,
+        "suggested_jobs": {},
+        "skill_gap_analysis": None,
+        "rejection": None
+    }
+    if stream.skills:
+        analysis.update({
+            "resume_score": calculate_resume_score(stream.skills),
+            "suggested_jobs": stream.suggested_jobs,
+            "skill_gap_analysis": stream.skill_gap_analysis
+        })
+    return analysis
+
+def analyze_resume_stream(file_bytes, file_type, keep_text=False, sandbox=None, **limits):
+    """
+    Generator version of analyze_resume: yields a partial analysis each
+    time a page/paragraph adds skills, then the final one. Text is matched
+    chunk by chunk as the extractor produces it and is only kept when
+    keep_text is set ("resume_text" is empty otherwise). With semantic
+    matching on, the semantic index sees one chunk at a time. With a
+    Sandbox the parsing runs in one of its workers and the partial
+    results are passed back as they come.
+    """
+    if sandbox is not None:
+        # Pages and OCR stay in the worker, inside its memory and CPU limits
+        limits.setdefault("workers", 1)
+        limits.setdefault("ocr_workers", 1)
+        try:
+            yield from sandbox.stream(analyze_resume_stream, file_bytes, file_type, keep_text, **limits)
+        except UploadRejected as e:
+            yield rejected_analysis(e)
+        return
+
+    try:
+        check_upload(file_bytes, file_type, **limits)
+        stream = StreamingAnalysis(
+            JOB_INDEX,
+            generate_skill_gap_analysis,
+            expand=add_semantic_skills if SEMANTIC_MATCHING else None,
+            keep_text=keep_text
+        )
+        for chunk in iter_text(file_bytes, file_type, **limits):
+            if stream.feed(chunk):
+                yield _streamed_analysis(stream)
+        stream.close()
+    except Exception as e:
+        yield rejected_analysis(rejection_for(e))
+        return
+    yield _streamed_analysis(stream)
+
+def _suggest(skills_list):
+    return suggest_jobs(skills_list, JOB_INDEX)
+
+def _analyze_document(previous, file_bytes, file_type, limits):
+    # Module level so a Sandbox worker can unpickle it
+    return analyze_document(
+        previous, file_bytes, file_type,
+        suggest=_suggest,
+        gap_analysis=generate_skill_gap_analysis,
+        expand=add_semantic_skills if SEMANTIC_MATCHING else None,
+        **limits
+    )
+
+def analyze_resume_incremental(store, key, file_bytes, file_type, sandbox=None, **limits):
+    """
+    Same result as analyze_resume, but only the pages (PDF) or paragraphs
+    (DOCX) that changed since the last upload under key are re-processed.
+    With a Sandbox the parsing runs in one of its resource-limited workers
+    (single-process extraction and OCR unless limits say otherwise).
+    """
+    try:
+        check_upload(file_bytes, file_type, **limits)
+        previous = store.get(key)
+        if sandbox is None:
+            result = _analyze_document(previous, file_bytes, file_type, limits)
+        else:
+            limits.setdefault("workers", 1)
+            limits.setdefault("ocr_workers", 1)
+            result = sandbox.run(_analyze_document, previous, file_bytes, file_type, limits)
+    except Exception as e:
+        return rejected_analysis(rejection_for(e))
+
+    state, resume_text, reused, extracted = result
+    store.put(key, state)
+    store.record(reused, extracted)
+    skills_list = state.skills
+    if not skills_list:
+        return {"resume_text": resume_text, "skills": [], "resume_score": 0,
+                "suggested_jobs": {}, "skill_gap_analysis": None, "rejection": None}
+    return {
+        "resume_text": resume_text,
+        "skills": skills_list,
+        "resume_score": calculate_resume_score(skills_list),
+        "suggested_jobs": state.suggested_jobs,
+        "skill_gap_analysis": state.skill_gap_analysis,
+        "rejection": None
+    }
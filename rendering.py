@@ -0,0 +1,221 @@
+"""
+HTML for the results section of the Streamlit page.
+
+Every st.markdown/st.write call is its own delta over the websocket and
+its own element for the browser to lay out, and the report used to be
+dozens of them (one per skill group, job box, expander line and
+resource). These functions build each part of the report as one HTML
+string from the analysis result instead, so app.py sends a handful of
+blocks. They don't touch streamlit, which keeps them cheap to cache and
+easy to benchmark.
+
+Expanders are <details> elements, so they still open and close without a
+rerun. Text from job feeds is escaped, and their apply links are only
+used when they are http(s) URLs.
+"""
+from html import escape
+from urllib.parse import urlsplit
+
+from learning_plans import get_learning_plan
+
+TECH_SKILLS = frozenset(['python', 'java', 'javascript', 'html', 'css', 'sql', 'react', 'node.js', 'android', 'swift'])
+DATA_SKILLS = frozenset(['machine learning', 'data analysis', 'excel', 'statistics'])
+SOFT_SKILLS = frozenset(['communication', 'teamwork', 'leadership', 'problem solving', 'analytical skills'])
+
+OTHER_SKILLS = "Other Skills"
+SKILL_CATEGORIES = (
+    ("Technical Skills", TECH_SKILLS),
+    ("Data Skills", DATA_SKILLS),
+    ("Soft Skills", SOFT_SKILLS)
+)
+CATEGORY_OF = {skill: label for label, skills in SKILL_CATEGORIES for skill in skills}
+
+SCORE_LEVELS = (
+    (80, "score-excellent", "Excellent! Your resume has strong skills. 🎯"),
+    (50, "score-good", "Good! But can be improved with more skills. 👍"),
+    (0, "score-poor", "Needs improvement. Add more technical skills. 💪")
+)
+
+MATCH_LEVELS = (
+    (0.8, "match-high", "🔥"),
+    (0.5, "match-medium", "👍"),
+    (0, "match-low", "💡")
+)
+
+TIPS = (
+    (80, [
+        "Your resume is strong! Consider applying for senior positions",
+        "Keep your skills updated with latest technologies",
+        "Add leadership and project management experiences"
+    ]),
+    (50, [
+        "Consider learning in-demand skills like Cloud Computing or Machine Learning",
+        "Add certifications or online courses you've completed",
+        "Highlight your achievements with metrics and numbers"
+    ]),
+    (0, [
+        "Add more technical skills to your resume",
+        "Be specific about technologies you know (e.g., Python, Java, React)",
+        "Include both hard and soft skills",
+        "Mention projects where you used these skills"
+    ])
+)
+
+
+def _level(value, levels):
+    for minimum, *rest in levels:
+        if value >= minimum:
+            return rest
+    return levels[-1][1:]
+
+
+def _section(title):
+    return f'<hr>\n<h3>{title}</h3>'
+
+
+def _notice(kind, text):
+    return f'<div class="notice notice-{kind}">{text}</div>'
+
+
+def _pills(skills, title=True):
+    return "".join(
+        f'<span class="skill-pill">{escape(skill.title() if title else skill)}</span>' for skill in skills
+    )
+
+
+def _list(items, ordered=False):
+    tag = "ol" if ordered else "ul"
+    return f'<{tag}>' + "".join(f'<li>{escape(item)}</li>' for item in items) + f'</{tag}>'
+
+
+def _safe_url(url):
+    # A job board could send "javascript:..." as its apply link
+    try:
+        scheme = urlsplit(str(url).strip()).scheme.lower()
+    except ValueError:
+        return "#"
+    return url if scheme in ("http", "https") else "#"
+
+
+def group_skills(skills_list):
+    """
+    {category label: skills} in one pass, categories in display order
+    """
+    groups = {label: [] for label, _ in SKILL_CATEGORIES}
+    groups[OTHER_SKILLS] = []
+    for skill in skills_list:
+        groups[CATEGORY_OF.get(skill, OTHER_SKILLS)].append(skill)
+    return groups
+
+
+def score_html(resume_score, skill_count):
+    score_class, score_message = _level(resume_score, SCORE_LEVELS)
+    return "\n".join([
+        _notice("success", "✅ Analysis complete!"),
+        _section("📊 Your Resume Score"),
+        '<div class="score-row">',
+        f'<div class="score-value"><div class="{score_class}">{resume_score:.0f}/100</div><p>{score_message}</p></div>',
+        '<div class="score-progress">',
+        f'<div class="score-bar"><div class="score-bar-fill" style="width: {min(resume_score, 100):.0f}%"></div></div>',
+        f'<p class="caption">Based on {skill_count} skills found in your resume</p>',
+        '</div>',
+        '</div>'
+    ])
+
+
+def skills_html(skills_list):
+    parts = [_section("🎯 Skills Identified in Your Resume")]
+    for label, skills in group_skills(skills_list).items():
+        if skills:
+            parts.append(f'<p><strong>{label}:</strong></p>')
+            parts.append(f'<div>{_pills(skills)}</div>')
+    return "\n".join(parts)
+
+
+def jobs_html(suggested_jobs):
+    parts = [_section("💼 Recommended Jobs For You")]
+    if not suggested_jobs:
+        parts.append(_notice("warning", "No strong job matches found. Consider adding more skills to your resume."))
+        return "\n".join(parts)
+
+    for job, details in suggested_jobs.items():
+        match_percent = details['match_score']
+        match_class, match_emoji = _level(match_percent, MATCH_LEVELS)
+        missing = details['missing_skills']
+        parts.append(
+            '<div class="result-box">'
+            f'<h3>{match_emoji} {escape(job)} (<span class="{match_class}">{match_percent:.0%} match</span>)</h3>'
+            f'<p><strong>Description:</strong> {escape(details["description"])}</p>'
+            f'<p><strong>✅ Your Matching Skills:</strong> {escape(", ".join(details["matched_skills"]).title())}</p>'
+            '<p><strong>📚 Skills to Learn:</strong> '
+            f'{escape(", ".join(missing).title()) if missing else "None! You have all required skills 🎉"}</p>'
+            '</div>'
+        )
+    return "\n".join(parts)
+
+
+def gap_html(skill_resources):
+    if not skill_resources or skill_resources == "No job matches found for analysis":
+        return _notice("warning", "Not enough data for skill gap analysis")
+
+    parts = [
+        _section("📚 Skill Gap Analysis & Learning Plan"),
+        _notice("info", "Based on your resume and target jobs, here's what you should learn:")
+    ]
+    for skill, resources in skill_resources.items():
+        plan = get_learning_plan(skill)
+        parts.append(
+            '<details class="expander">'
+            f'<summary>🎯 Learn {escape(skill.title())} to boost your career</summary>'
+            f'<p><strong>Why learn {escape(skill)}?</strong></p>'
+            + _list(["Increases your job matches by 30%", "Average salary premium: ₹3-5 LPA",
+                     "High demand in current market"])
+            + '<p><strong>How to learn:</strong></p>'
+            + _list(resources, ordered=True)
+            + f'<p><strong>Time required:</strong> {escape(plan["time_required"])}</p>'
+            f'<p><strong>Practice projects:</strong> {escape("; ".join(plan["projects"]))}</p>'
+            '</details>'
+        )
+    return "\n".join(parts)
+
+
+def real_jobs_html(job_listings):
+    if not job_listings:
+        return ""
+
+    parts = [
+        _section("🔥 Real Job Openings for You"),
+        _notice("success", "Based on your skills, here are actual job opportunities:")
+    ]
+    for i, job in enumerate(job_listings, 1):
+        parts.append(
+            '<details class="expander">'
+            f'<summary>{i}. {escape(job["title"])} at {escape(job["company"])}</summary>'
+            f'<p><strong>Company:</strong> {escape(job["company"])}</p>'
+            f'<p><strong>Location:</strong> {escape(job["location"])}</p>'
+            f'<p><strong>Experience:</strong> {escape(job["experience"])}</p>'
+            f'<p><strong>Salary:</strong> {escape(job["salary"])}</p>'
+            f'<p><strong>Required Skills:</strong></p><div>{_pills(job["skills"], title=False)}</div>'
+            f'<p><strong>Apply:</strong> <a href="{escape(_safe_url(job["apply_link"]))}" target="_blank" rel="noopener noreferrer">Click Here</a></p>'
+            '</details>'
+        )
+    return "\n".join(parts)
+
+
+def tips_html(resume_score):
+    tips, = _level(resume_score, TIPS)
+    return "\n".join([_section("💡 Improvement Tips"), _notice("info", _list(tips))])
+
+
+def report_html(analysis):
+    """
+    Score, skills, job matches and gap analysis of an analysis result as
+    one HTML block
+    """
+    skills_list = analysis["skills"]
+    return "\n".join([
+        score_html(analysis["resume_score"], len(skills_list)),
+        skills_html(skills_list),
+        jobs_html(analysis["suggested_jobs"]),
+        gap_html(analysis["skill_gap_analysis"])
+    ])
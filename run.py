@@ -20,4 +20,13 @@ def run_streamlit():
         print("Please install streamlit manually: pip install streamlit")
 
 if __name__ == "__main__":
-    run_streamlit()
\ No newline at end of file
+    # python run.py screen <folder> ... runs the bulk screening CLI instead
+    if len(sys.argv) > 1 and sys.argv[1] == "screen":
+        from screen import main
+        main(sys.argv[2:])
+    # python run.py queue enqueue|work|status|report ... for the work queue
+    elif len(sys.argv) > 1 and sys.argv[1] == "queue":
+        from work_queue import main
+        main(sys.argv[2:])
+    else:
+        run_streamlit()
\ No newline at end of file
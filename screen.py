@@ -0,0 +1,261 @@
+"""
+Bulk resume screening from the command line.
+
+Runs every PDF/DOCX resume in a directory or archive (.zip, .tar, .tar.gz)
+through the analysis pipeline on a process pool and writes one JSON line
+per file:
+
+    python screen.py resumes/ -o results.jsonl
+    python screen.py resumes.zip -o results.jsonl --resume
+
+With --resume, files already present in the output are skipped, so an
+interrupted run picks up where it stopped.
+A file that kills its worker is written as "crashed"; the
+files that happened to be in flight next to it are run again.
+"""
+import argparse
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from admission import UploadRejected, guarded, limit_worker
+from analysis_cache import content_hash
+from pipeline import analyze_resume_stream, file_type_for
+
+DEFAULT_TIMEOUT = 60
+
+
+def iter_resumes(source):
+    """
+    Yield (name, loader) for each resume in a directory or archive.
+    loader() returns the file's bytes, so nothing is read before it is needed.
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for filename in sorted(files):
+                if file_type_for(filename):
+                    path = os.path.join(root, filename)
+                    yield os.path.relpath(path, source), _file_loader(path)
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and file_type_for(info.filename):
+                    yield info.filename, _zip_loader(archive, info)
+    elif tarfile.is_tarfile(source):
+        with tarfile.open(source) as archive:
+            for member in archive:
+                if member.isfile() and file_type_for(member.name):
+                    yield member.name, _tar_loader(archive, member)
+    else:
+        raise ValueError(f"{source} is not a directory, zip or tar archive")
+
+
+def _file_loader(path):
+    def load():
+        with open(path, "rb") as f:
+            return f.read()
+    return load
+
+
+def _zip_loader(archive, info):
+    return lambda: archive.read(info)
+
+
+def _tar_loader(archive, member):
+    return lambda: archive.extractfile(member).read()
+
+
+def _final_analysis(file_bytes, file_type, **limits):
+    # Streamed so the text is never held in full; only the last result counts
+    for analysis in analyze_resume_stream(file_bytes, file_type, **limits):
+        pass
+    return analysis
+
+
+def screen_file(name, file_bytes, timeout=DEFAULT_TIMEOUT):
+    """
+    Worker task: analyse one resume and return its JSON record
+    """
+    started = time.perf_counter()
+    record = {"file": name, "sha256": content_hash(file_bytes)}
+
+    try:
+        # Parallelism comes from the pool, so each file is extracted (and OCR'd) in-process
+        analysis = guarded(_final_analysis, file_bytes, file_type_for(name), workers=1, ocr_workers=1,
+                           timeout=timeout)
+        if analysis["rejection"] is not None:
+            record["error"] = analysis["rejection"]
+        else:
+            del analysis["resume_text"], analysis["rejection"]
+            record.update(analysis)
+    except UploadRejected as e:
+        record["error"] = e.to_dict()
+
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def load_checkpoint(output):
+    """
+    Names of the files already written to an output JSONL file
+    """
+    done = set()
+    if output and os.path.exists(output):
+        with open(output, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["file"])
+                except (ValueError, KeyError):
+                    # A line cut short by an interrupted run
+                    continue
+    return done
+
+
+def _ends_mid_line(path):
+    with open(path, "rb") as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+def _new_pool(workers):
+    # Workers get the admission memory cap; screen_file adds the CPU cap
+    return ProcessPoolExecutor(max_workers=workers, initializer=limit_worker)
+
+
+def screen_alone(name, file_bytes, timeout=DEFAULT_TIMEOUT, task=screen_file):
+    """
+    task(name, file_bytes, timeout) in a worker of its own. The record
+    says "crashed" only if this file takes that worker down.
+    """
+    with _new_pool(1) as pool:
+        try:
+            return pool.submit(task, name, file_bytes, timeout).result()
+        except BrokenProcessPool as e:
+            # Killed for memory, or crashed in C code
+            return {"file": name, "error": {"reason": "crashed", "message": str(e)}, "seconds": None}
+
+
+def screen(source, out, workers=None, timeout=DEFAULT_TIMEOUT, skip=(), progress=sys.stderr, task=screen_file):
+    """
+    Analyse every resume in source and write JSON lines to out as they
+    finish. At most 2 files per worker are in flight at once, so memory
+    does not grow with the size of the batch.
+
+    When a worker dies the pool is replaced and every file that was in
+    flight is run again on its own, so only the file that kills a worker
+    by itself is written as "crashed".
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    done = ok = failed = 0
+    started = time.perf_counter()
+    pool = _new_pool(workers)
+    in_flight = {}
+
+    def write(record):
+        nonlocal done, ok, failed
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        done += 1
+        if "error" in record:
+            failed += 1
+        else:
+            ok += 1
+        if progress:
+            rate = done / (time.perf_counter() - started)
+            progress.write(f"[{done}] {record['file']} ({record['seconds']}s) "
+                           f"ok={ok} failed={failed} {rate:.1f} files/s\n")
+
+    def recover():
+        # Files that finished before the crash keep their result; the rest
+        # can't be told apart from the one that did it, so each gets a
+        # worker of its own
+        nonlocal pool
+        pool.shutdown(wait=False, cancel_futures=True)
+        pool = _new_pool(workers)
+        suspects = []
+        for future, (name, file_bytes) in in_flight.items():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                write(future.result())
+            else:
+                suspects.append((name, file_bytes))
+        in_flight.clear()
+        for name, file_bytes in suspects:
+            write(screen_alone(name, file_bytes, timeout, task))
+
+    def drain():
+        finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in finished:
+            try:
+                record = future.result()
+            except BrokenProcessPool:
+                recover()
+                return
+            except Exception as e:
+                record = {"file": in_flight[future][0], "error": {"reason": "crashed", "message": str(e)},
+                          "seconds": None}
+            del in_flight[future]
+            write(record)
+
+    try:
+        for name, load in iter_resumes(source):
+            if name in skip:
+                continue
+            file_bytes = load()
+            try:
+                future = pool.submit(task, name, file_bytes, timeout)
+            except BrokenProcessPool:
+                recover()
+                future = pool.submit(task, name, file_bytes, timeout)
+            in_flight[future] = (name, file_bytes)
+            if len(in_flight) >= max_in_flight:
+                drain()
+        while in_flight:
+            drain()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+    return {"processed": done, "ok": ok, "failed": failed, "seconds": round(time.perf_counter() - started, 3)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="directory, .zip or .tar archive of PDF/DOCX resumes")
+    parser.add_argument("-o", "--output", help="JSONL file to write (default: stdout)")
+    parser.add_argument("-j", "--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds allowed per file")
+    parser.add_argument("--resume", action="store_true", help="skip files already in the output file")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress on stderr")
+    args = parser.parse_args(argv)
+
+    if args.resume and not args.output:
+        parser.error("--resume needs --output")
+
+    skip = load_checkpoint(args.output) if args.resume else set()
+    mode = "a" if args.resume else "w"
+    out = open(args.output, mode, encoding="utf-8") if args.output else sys.stdout
+    if args.resume and _ends_mid_line(args.output):
+        # The last run stopped half way through a record
+        out.write("\n")
+    try:
+        summary = screen(args.source, out, args.workers, args.timeout, skip,
+                         progress=None if args.quiet else sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if not args.quiet:
+        sys.stderr.write(f"Done: {summary['processed']} files ({summary['failed']} failed, "
+                         f"{len(skip)} skipped) in {summary['seconds']}s\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Optional fuzzy skill matching on top of the exact SkillMatcher.
+
+A character n-gram TF-IDF index of every skill name (and its known
+aliases) is built once; the IDF weights are fitted together with the job
+descriptions so n-grams common in ordinary prose count for less. Each
+resume is split into short word n-gram phrases which are looked up with a
+cosine nearest-neighbour query against that index, so "ReactJS",
+"Postgres", "Power Point" or "javascripts" map to the skill they spell.
+Skills that only the job database lists (e.g. "statistics") are part of
+the vocabulary too. Everything runs offline on CPU with scikit-learn.
+
+Phrase lookups are memoized across resumes (least recently used evicted
+first), and each resume gets a fixed time budget: phrases are queried in
+batches in text order and whatever is left when the budget runs out is
+skipped. Only results that finished within the budget are cached, so a
+resume cut short on a busy moment is looked up in full the next time.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+ALIASES = {
+    'reactjs': 'react',
+    'react.js': 'react',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'ml': 'machine learning',
+    'js': 'javascript',
+    'ts': 'typescript',
+    'nodejs': 'node.js',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'angularjs': 'angular',
+    'mongo': 'mongodb',
+    'amazon web services': 'aws',
+    'microsoft office': 'ms office',
+    'ms excel': 'excel',
+    'natural language processing': 'nlp',
+    'search engine optimization': 'seo',
+    'stats': 'statistics',
+    'smm': 'social media'
+}
+
+SIMILARITY_THRESHOLD = 0.75
+BUDGET_SECONDS = 0.05
+BATCH_SIZE = 256
+
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*')
+
+
+class SemanticSkillMatcher:
+    """
+    Nearest-neighbour skill lookup for the phrases of a resume.
+
+    skills is the vocabulary to map onto, descriptions extra text used only
+    to fit the IDF weights. A phrase maps to its nearest skill name or alias
+    when the cosine similarity is at least threshold and the two have the
+    same number of words and about the same length.
+    """
+
+    def __init__(self, skills, descriptions=(), aliases=ALIASES,
+                 threshold=SIMILARITY_THRESHOLD, budget=BUDGET_SECONDS, memo_size=50000, cache_size=256):
+        from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+        from sklearn.neighbors import NearestNeighbors
+
+        self.skills = list(dict.fromkeys(skills))
+        self.threshold = threshold
+        self.budget = budget
+        self.memo_size = memo_size
+        self.cache_size = cache_size
+
+        # Surface forms: every skill under its own name plus its aliases
+        self._exact = {skill: skill for skill in self.skills}
+        for alias, skill in aliases.items():
+            if skill in self._exact:
+                self._exact.setdefault(alias, skill)
+        forms = list(self._exact)
+        self._targets = [self._exact[form] for form in forms]
+        self._lengths = [len(form) for form in forms]
+        self._words = [len(form.split()) for form in forms]
+        self.max_words = max(self._words, default=1)
+
+        # char_wb n-grams never cross a space, so the n-gram counts of a
+        # phrase are the sum of those of its words: words are counted once
+        # and phrases assembled from them with a sparse product
+        self._counter = CountVectorizer(analyzer='char_wb', ngram_range=(3, 4))
+        counts = self._counter.fit_transform(forms + [d.lower() for d in descriptions])
+        self._tfidf = TfidfTransformer(sublinear_tf=True).fit(counts)
+        self._index = NearestNeighbors(n_neighbors=1, metric='cosine', algorithm='brute')
+        self._index.fit(self._tfidf.transform(counts[:len(forms)]))
+
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.memo_hits = 0
+        self.over_budget = 0
+        # Complete results by resume text
+        self._results = OrderedDict()
+
+    def phrases(self, text):
+        """
+        Unique word n-grams of text (up to the longest skill) in text order,
+        plus each pair of words written together for split spellings like
+        "postgre sql", "node js" or "power point"
+        """
+        words = _TOKEN.findall(text.lower())
+        phrases = {}
+        for i in range(len(words)):
+            for n in range(1, min(self.max_words, len(words) - i) + 1):
+                phrases[' '.join(words[i:i + n])] = None
+            if i + 1 < len(words) and len(words[i]) > 1 and len(words[i + 1]) > 1:
+                joined = words[i] + words[i + 1]
+                if len(joined) >= 5:
+                    phrases[joined] = None
+        return list(phrases)
+
+    def _lookup(self, phrases):
+        """
+        {phrase: skill or None} for phrases not in the memo
+        """
+        from scipy.sparse import csr_matrix
+
+        word_ids = {}
+        rows, cols = [], []
+        for row, phrase in enumerate(phrases):
+            for word in phrase.split():
+                rows.append(row)
+                cols.append(word_ids.setdefault(word, len(word_ids)))
+        words = csr_matrix(([1] * len(rows), (rows, cols)), shape=(len(phrases), len(word_ids)))
+        vectors = self._tfidf.transform(words @ self._counter.transform(list(word_ids)))
+        distances, indices = self._index.kneighbors(vectors)
+        # A phrase sharing no n-gram with the vocabulary has an all-zero
+        # vector, and its "nearest" skill is meaningless
+        nonzero = vectors.getnnz(axis=1)
+        found = {}
+        for phrase, nnz, distance, i in zip(phrases, nonzero, distances[:, 0], indices[:, 0]):
+            close = (nnz and 1 - distance >= self.threshold
+                     and phrase.count(' ') + 1 == self._words[i] and self._similar_length(phrase, i))
+            found[phrase] = self._targets[i] if close else None
+        return found
+
+    def _similar_length(self, phrase, i):
+        # Keeps a skill inside a longer word ("keyword") or a word inside a
+        # longer skill ("analysis") from matching
+        return abs(len(phrase) - self._lengths[i]) <= max(1, self._lengths[i] // 4)
+
+    def extract(self, text):
+        """
+        Skills whose name or alias appears in text, exactly or closely
+        enough, in vocabulary order
+        """
+        with self._lock:
+            if text in self._results:
+                self._results.move_to_end(text)
+                return self._results[text]
+        skills, complete = self._extract(text)
+        if complete:
+            with self._lock:
+                self._results[text] = skills
+                while len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+        return skills
+
+    def _extract(self, text):
+        """
+        (skills, complete): complete is False when the budget ran out
+        before every phrase was looked up
+        """
+        deadline = time.perf_counter() + self.budget
+        matched = set()
+        pending = []
+        for phrase in self.phrases(text):
+            skill = self._exact.get(phrase)
+            if skill is not None:
+                matched.add(skill)
+                continue
+            with self._lock:
+                if phrase in self._memo:
+                    self.memo_hits += 1
+                    self._memo.move_to_end(phrase)
+                    skill = self._memo[phrase]
+                    if skill is not None:
+                        matched.add(skill)
+                    continue
+            pending.append(phrase)
+
+        complete = True
+        for start in range(0, len(pending), BATCH_SIZE):
+            if time.perf_counter() > deadline:
+                with self._lock:
+                    self.over_budget += 1
+                complete = False
+                break
+            found = self._lookup(pending[start:start + BATCH_SIZE])
+            with self._lock:
+                self.queries += len(found)
+                self._memo.update(found)
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+            matched.update(skill for skill in found.values() if skill is not None)
+
+        return tuple(skill for skill in self.skills if skill in matched), complete
+
+    def stats(self):
+        return {"queries": self.queries, "memo_hits": self.memo_hits,
+                "memo_size": len(self._memo), "over_budget": self.over_budget}
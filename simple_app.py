@@ -1,48 +1,307 @@
-from flask import Flask, request, render_template, jsonify
-import re
-import pdfplumber
-from docx import Document
+from flask import Flask, Request, Response, request, jsonify
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+import multiprocessing
 import os
+import threading
+
+import instrumentation
+from extraction import MAX_BYTES
+from admission import UploadRejected, check_upload, guarded, limit_worker
+from analysis_cache import content_hash
+from candidate_index import CandidateIndex
+from pipeline import JOB_DATABASE, analyze_resume, file_type_for, rejected_analysis
+
+# Parsing runs on a fixed pool; requests beyond workers + queue get a 429
+WORKERS = int(os.environ.get("RESUME_API_WORKERS", os.cpu_count() or 1))
+QUEUE_SIZE = int(os.environ.get("RESUME_API_QUEUE", WORKERS * 2))
+REQUEST_TIMEOUT = float(os.environ.get("RESUME_API_TIMEOUT", 30))
+MAX_BATCH = int(os.environ.get("RESUME_API_MAX_BATCH", 20))
+# SQLite file of the candidate pools ranked by /tenants/<tenant>/roles/...
+CANDIDATE_DB = os.environ.get("RESUME_CANDIDATE_DB", "candidates.db")
+MAX_TOP_K = 1000
+# Multipart boundaries, headers and the small form fields next to the files
+FORM_OVERHEAD = 64 * 1024
+# Routes that take up to MAX_BATCH files; the others take one
+BATCH_ENDPOINTS = {"upload_batch"}
+
+
+class InMemoryRequest(Request):
+    """
+    Keep uploaded files in memory instead of spooling them to a temp file
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return BytesIO()
+
+    @property
+    def max_content_length(self):
+        # Bodies are buffered in memory before any admission check, so a
+        # single-file route must not accept a batch worth of bytes
+        if self.endpoint in BATCH_ENDPOINTS:
+            return MAX_BYTES * MAX_BATCH + FORM_OVERHEAD
+        return MAX_BYTES + FORM_OVERHEAD
+
 
 app = Flask(__name__)
+app.request_class = InMemoryRequest
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(WORKERS + QUEUE_SIZE)
+_candidates = None
+
+
+class Overloaded(Exception):
+    pass
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Workers get the admission memory cap; _analyze adds the CPU cap.
+            # spawn, not fork: the Flask server is multi-threaded
+            _executor = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=limit_worker)
+        return _executor
+
+
+def _reset_executor():
+    """
+    Drop a pool whose worker died so the next request starts a new one
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def get_candidate_index():
+    """
+    Candidate index, opened on the first request that needs it
+    """
+    global _candidates
+    with _executor_lock:
+        if _candidates is None:
+            _candidates = CandidateIndex(CANDIDATE_DB, JOB_DATABASE)
+        return _candidates
+
+
+def _analyze(file_bytes, file_type):
+    """
+    Worker task: analysis plus the stage counters it recorded, so the
+    parent process can serve them on /metrics
+    """
+    # One process per file; the pool already spreads files over cores
+    try:
+        analysis = guarded(analyze_resume, file_bytes, file_type, workers=1, ocr_workers=1)
+    except UploadRejected as e:
+        analysis = rejected_analysis(e)
+    return analysis, instrumentation.drain() if instrumentation.is_enabled() else None
+
+
+def _collect(future):
+    _slots.release()
+    if not future.cancelled() and future.exception() is None:
+        stats = future.result()[1]
+        if stats:
+            instrumentation.merge(stats)
+
+
+def submit_batch(uploads):
+    """
+    Queue (file_bytes, file_type) pairs for parsing, all or nothing.
+    Raises Overloaded when there are not enough free slots.
+    """
+    taken = 0
+    for _ in uploads:
+        if not _slots.acquire(blocking=False):
+            for _ in range(taken):
+                _slots.release()
+            raise Overloaded()
+        taken += 1
 
-# Functions wahi rahenge jo pehle thi
-def extract_text_from_resume(file_path):
-    # ... (same function as before)
+    futures = []
+    try:
+        executor = get_executor()
+        for file_bytes, file_type in uploads:
+            future = executor.submit(_analyze, file_bytes, file_type)
+            future.add_done_callback(_collect)
+            futures.append(future)
+    except (BrokenProcessPool, RuntimeError):
+        for _ in range(taken - len(futures)):
+            _slots.release()
+        for future in futures:
+            future.cancel()
+        _reset_executor()
+        raise
+    return futures
 
-def extract_skills(resume_text):
-    # ... (same function as before)
 
-def suggest_jobs(found_skills, job_db):
-    # ... (same function as before)
+def read_upload(file):
+    """
+    Bytes and MIME type of an uploaded file, or an error message
+    """
+    if file.filename == '':
+        return None, 'No file selected'
+    file_type = file_type_for(file.filename)
+    if file_type is None:
+        return None, f'{file.filename}: only PDF and DOCX files are supported'
+    return (file.read(), file_type), None
+
+
+def to_response(analysis):
+    rejection = analysis["rejection"]
+    if rejection is not None:
+        return {'error': rejection["message"], 'rejection': rejection}
+    return {
+        'skills': analysis["skills"],
+        'resume_score': analysis["resume_score"],
+        'jobs': analysis["suggested_jobs"],
+        'skill_gap_analysis': analysis["skill_gap_analysis"]
+    }
+
+
+def analyze_uploads(files):
+    """
+    Parse a batch of uploads on the pool. Returns (results, None), or
+    (None, error response) when the batch cannot be served.
+    """
+    uploads = []
+    for file in files:
+        upload, error = read_upload(file)
+        if error:
+            return None, (jsonify({'error': error}), 400)
+        uploads.append(upload)
+    return analyze_payloads(uploads)
+
+
+def analyze_payloads(uploads):
+    """
+    analyze_uploads() for (file_bytes, file_type) pairs already read
+    """
+    # Files refused on their metadata alone never reach the pool
+    results = [None] * len(uploads)
+    admitted = []
+    for i, (file_bytes, file_type) in enumerate(uploads):
+        try:
+            check_upload(file_bytes, file_type)
+        except UploadRejected as e:
+            results[i] = to_response(rejected_analysis(e))
+        else:
+            admitted.append(i)
+
+    try:
+        futures = submit_batch([uploads[i] for i in admitted])
+    except Overloaded:
+        return None, (jsonify({'error': 'Server busy, try again shortly'}), 429, {'Retry-After': '1'})
+    except (BrokenProcessPool, RuntimeError):
+        return None, (jsonify({'error': 'Parser unavailable, try again shortly'}), 503)
+
+    try:
+        for i, future in zip(admitted, futures):
+            results[i] = to_response(future.result(timeout=REQUEST_TIMEOUT)[0])
+        return results, None
+    except TimeoutError:
+        return None, (jsonify({'error': 'Parsing took too long'}), 503)
+    except BrokenProcessPool:
+        _reset_executor()
+        return None, (jsonify({'error': 'Parser crashed, try again shortly'}), 503)
+
 
 @app.route('/')
 def home():
-    return render_template('index.html')
+    return jsonify({
+        'service': 'AI Job Finder',
+        'endpoints': {
+            'POST /upload': 'one resume in the "resume" field',
+            'POST /upload/batch': f'up to {MAX_BATCH} resumes in the "resumes" field',
+            'POST /tenants/<tenant>/candidates': 'add a resume ("resume" field, optional "name", "location")',
+            'DELETE /tenants/<tenant>/candidates/<hash>': 'remove a candidate',
+            'GET /tenants/<tenant>/roles/<role>/candidates': 'top candidates (k, min_score, location, skills)',
+            'GET /metrics': 'per-stage timings (set RESUME_INSTRUMENTATION=1)'
+        }
+    })
+
+@app.route('/metrics')
+def metrics():
+    return Response(instrumentation.render_prometheus(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/upload', methods=['POST'])
 def upload_file():
     if 'resume' not in request.files:
-        return jsonify({'error': 'No file uploaded'})
-    
+        return jsonify({'error': 'No file uploaded'}), 400
+
+    results, error = analyze_uploads([request.files['resume']])
+    if error:
+        return error
+    if 'rejection' in results[0]:
+        return jsonify(results[0]), 422
+    return jsonify(results[0])
+
+@app.route('/upload/batch', methods=['POST'])
+def upload_batch():
+    files = request.files.getlist('resumes')
+    if not files:
+        return jsonify({'error': 'No files uploaded'}), 400
+    if len(files) > MAX_BATCH:
+        return jsonify({'error': f'At most {MAX_BATCH} files per batch'}), 413
+
+    results, error = analyze_uploads(files)
+    if error:
+        return error
+    return jsonify({'results': results})
+
+@app.route('/tenants/<tenant>/candidates', methods=['POST'])
+def add_candidate(tenant):
+    if 'resume' not in request.files:
+        return jsonify({'error': 'No file uploaded'}), 400
     file = request.files['resume']
-    if file.filename == '':
-        return jsonify({'error': 'No file selected'})
-    
-    # Save file temporarily
-    file_path = os.path.join('uploads', file.filename)
-    file.save(file_path)
-    
-    # Process file
-    resume_text = extract_text_from_resume(file_path)
-    skills = extract_skills(resume_text)
-    jobs = suggest_jobs(skills, JOB_DATABASE)
-    
-    # Clean up
-    os.remove(file_path)
-    
-    return jsonify({'skills': skills, 'jobs': jobs})
+    upload, error = read_upload(file)
+    if error:
+        return jsonify({'error': error}), 400
+
+    results, error = analyze_payloads([upload])
+    if error:
+        return error
+    result = results[0]
+    if 'rejection' in result:
+        return jsonify(result), 422
+
+    candidate_hash = content_hash(upload[0])
+    get_candidate_index().add(
+        tenant, candidate_hash, result['skills'], result['resume_score'],
+        name=request.form.get('name', file.filename), location=request.form.get('location', '')
+    )
+    return jsonify({'hash': candidate_hash, 'skills': result['skills'],
+                    'resume_score': result['resume_score']}), 201
+
+@app.route('/tenants/<tenant>/candidates/<candidate_hash>', methods=['DELETE'])
+def remove_candidate(tenant, candidate_hash):
+    if not get_candidate_index().remove(tenant, candidate_hash):
+        return jsonify({'error': 'No such candidate'}), 404
+    return '', 204
+
+@app.route('/tenants/<tenant>/roles/<role>/candidates')
+def rank_candidates(tenant, role):
+    if role not in JOB_DATABASE:
+        return jsonify({'error': f'Unknown role: {role}'}), 404
+    try:
+        k = min(int(request.args.get('k', 10)), MAX_TOP_K)
+        min_score = float(request.args['min_score']) if 'min_score' in request.args else None
+    except ValueError:
+        return jsonify({'error': 'k and min_score must be numbers'}), 400
+    if k < 1:
+        return jsonify({'error': 'k must be at least 1'}), 400
+    skills = [s.strip().lower() for s in request.args.get('skills', '').split(',') if s.strip()]
+
+    candidates, total = get_candidate_index().rank_role(
+        role, tenant, k, min_score=min_score, location=request.args.get('location'), skills=skills
+    )
+    return jsonify({'role': role, 'total': total, 'candidates': candidates})
 
 if __name__ == '__main__':
-    os.makedirs('uploads', exist_ok=True)
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True, threaded=True)
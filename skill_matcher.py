@@ -0,0 +1,80 @@
+import re
+
+COMMON_SKILLS = [
+    'python', 'java', 'javascript', 'html', 'css', 'sql', 'excel',
+    'machine learning', 'data analysis', 'digital marketing', 'seo',
+    'content writing', 'tally', 'ms office', 'word', 'powerpoint',
+    'deep learning', 'nlp', 'django', 'flask', 'react', 'node.js',
+    'aws', 'cloud computing', 'git', 'github', 'communication',
+    'teamwork', 'leadership', 'problem solving', 'analytical skills',
+    'android', 'kotlin', 'swift', 'ios', 'php', 'wordpress', 'angular',
+    'vue', 'typescript', 'mongodb', 'mysql', 'postgresql', 'linux'
+]
+
+
+class SkillMatcher:
+    """
+    Finds every skill of a taxonomy in one pass over the text.
+
+    All skills are compiled into a single lookahead alternation (longest
+    first), so the regex engine tests each position of the text once
+    instead of rescanning the text per skill. Word boundaries are the same
+    as the old per-skill r'\\b<skill>\\b' search.
+    """
+
+    def __init__(self, skills):
+        self.skills = list(dict.fromkeys(skills))
+        self.max_length = max((len(s) for s in self.skills), default=0)
+
+        by_length = sorted(self.skills, key=len, reverse=True)
+        alternation = '|'.join(re.escape(s) for s in by_length)
+        self._pattern = re.compile(r'(?=\b(' + alternation + r')\b)')
+
+        # The alternation only reports the longest skill at a position, so
+        # shorter skills that start the same way are checked separately
+        self._single = {s: re.compile(r'\b' + re.escape(s) + r'\b') for s in self.skills}
+        self._prefixes = {
+            s: [p for p in by_length if p != s and s.startswith(p)]
+            for s in self.skills
+        }
+
+    def finditer(self, text, pos=0, endpos=None):
+        """
+        Yield (skill, start, end) for every match in lowercased text
+        """
+        if not self.skills:
+            return
+        if endpos is None:
+            endpos = len(text)
+        for match in self._pattern.finditer(text, pos, endpos):
+            skill = match.group(1)
+            start = match.start()
+            yield skill, start, start + len(skill)
+            for prefix in self._prefixes[skill]:
+                if self._single[prefix].match(text, start, endpos):
+                    yield prefix, start, start + len(prefix)
+
+    def find(self, text):
+        """
+        Map each skill found in text to its (start, end) offsets in text.lower()
+        """
+        spans = {}
+        for skill, start, end in self.finditer(text.lower()):
+            spans.setdefault(skill, []).append((start, end))
+        return spans
+
+    def count(self, text):
+        """
+        Map each skill found in text to the number of times it occurs
+        """
+        return {skill: len(offsets) for skill, offsets in self.find(text).items()}
+
+    def extract(self, text):
+        """
+        Skills present in text, in taxonomy order
+        """
+        found = self.find(text)
+        return [skill for skill in self.skills if skill in found]
+
+
+SKILL_MATCHER = SkillMatcher(COMMON_SKILLS)
@@ -0,0 +1,136 @@
+"""
+Single-pass analysis of text that arrives in chunks (PDF pages, DOCX
+paragraphs) while the file is still being parsed.
+
+Each chunk is lowercased and matched on its own, with a short carry of
+the previous chunk's tail, so the full text and its lowercased copy are
+never held in memory. Job matches and the gap analysis are updated
+whenever a chunk adds skills, which lets the UI show partial results
+for large files.
+
+A match is only final once the character after it is known: the last
+max_length + 1 characters of a chunk are carried over and matched again
+with the next chunk, so a skill split across two chunks (or a longer
+skill like "javascript" that starts like "java") is found exactly as in
+the joined text.
+"""
+from data_model import results_to_dict
+from skill_matcher import SKILL_MATCHER
+
+
+class SkillStream:
+    """
+    SkillMatcher.count() over text fed in pieces
+    """
+
+    def __init__(self, matcher=SKILL_MATCHER):
+        self.matcher = matcher
+        self.counts = {}
+        # Longest skill plus the character that ends its word
+        self._tail = matcher.max_length + 1
+        self._carry = ""
+        # Position in the carry where unmatched text starts; the
+        # character before it is only there for the word boundary
+        self._pos = 0
+
+    def feed(self, chunk):
+        """
+        Match chunk, returns the skills seen for the first time
+        """
+        return self._scan(self._carry + chunk.lower(), final=False)
+
+    def close(self):
+        """
+        Match what is left of the text, returns the new skills
+        """
+        return self._scan(self._carry, final=True)
+
+    def _scan(self, text, final):
+        safe = len(text) if final else len(text) - self._tail
+        if safe <= self._pos:
+            self._carry = text
+            return []
+
+        new = []
+        for skill, start, _ in self.matcher.finditer(text, self._pos):
+            if start >= safe:
+                break
+            if skill not in self.counts:
+                self.counts[skill] = 0
+                new.append(skill)
+            self.counts[skill] += 1
+
+        self._carry = text[safe - 1:]
+        self._pos = 1
+        return new
+
+
+class StreamingAnalysis:
+    """
+    Skills, job matches and gap analysis of a document read chunk by
+    chunk.
+
+    job_index is a JobIndex (match counts are kept and only the jobs of
+    new skills are touched) or anything with suggest(skills), which is
+    then called again when the skills change. gap_analysis(skills,
+    suggested_jobs) and expand(chunk, skills), as in
+    incremental.analyze_document; expand sees one chunk at a time.
+    """
+
+    def __init__(self, job_index, gap_analysis, expand=None, keep_text=False):
+        self.job_index = job_index
+        self.gap_analysis = gap_analysis
+        self.expand = expand
+        self.skills_stream = SkillStream()
+        self.skills = []
+        self.suggested_jobs = {}
+        self.skill_gap_analysis = None
+        self.chunks = [] if keep_text else None
+        self._extra = []
+        self._counts = {}
+        self._bits = 0
+
+    @property
+    def text(self):
+        return "".join(self.chunks) if self.chunks is not None else ""
+
+    def feed(self, chunk):
+        """
+        Add a chunk of text, returns True if the results changed
+        """
+        if self.chunks is not None:
+            self.chunks.append(chunk)
+        new = self.skills_stream.feed(chunk)
+        if self.expand is not None:
+            known = set(self.skills_stream.counts).union(self._extra)
+            extra = [skill for skill in self.expand(chunk, []) if skill not in known]
+            self._extra.extend(extra)
+            new = new + extra
+        return self._update(new)
+
+    def close(self):
+        """
+        Finish the last chunk, returns True if the results changed
+        """
+        return self._update(self.skills_stream.close())
+
+    def _update(self, new):
+        if not new:
+            return False
+        counts = self.skills_stream.counts
+        found = [skill for skill in self.skills_stream.matcher.skills if skill in counts]
+        self.skills = found + [skill for skill in self._extra if skill not in counts]
+
+        if hasattr(self.job_index, "rank"):
+            new_bits = self.job_index.resume_bits(new) & ~self._bits
+            self._bits |= new_bits
+            self.job_index.add_counts(self._counts, new_bits)
+            suggested_jobs = results_to_dict(self.job_index.rank(self._counts, self._bits),
+                                             self.job_index.vocabulary)
+        else:
+            suggested_jobs = self.job_index.suggest(self.skills)
+
+        if suggested_jobs != self.suggested_jobs or self.skill_gap_analysis is None:
+            self.suggested_jobs = suggested_jobs
+            self.skill_gap_analysis = self.gap_analysis(self.skills, suggested_jobs)
+        return True
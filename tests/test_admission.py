@@ -0,0 +1,41 @@
+import time
+
+import pytest
+
+from admission import Sandbox, UploadRejected, guarded
+
+
+def _stubborn(seconds):
+    # A parser that retries on any error must still be stopped
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            time.sleep(0.01)
+        except Exception:
+            pass
+    return "finished"
+
+
+def test_guarded_timeout_passes_broad_except():
+    start = time.monotonic()
+    with pytest.raises(UploadRejected) as rejected:
+        guarded(_stubborn, 5, cpu_seconds=None, timeout=0.2)
+    assert rejected.value.reason == "timeout"
+    assert time.monotonic() - start < 2
+
+
+def test_guarded_translates_parser_errors():
+    with pytest.raises(UploadRejected) as rejected:
+        guarded(int, "not a number", cpu_seconds=None)
+    assert rejected.value.reason == "unreadable"
+
+
+def test_sandbox_run_times_out():
+    sandbox = Sandbox(workers=1, memory_mb=None, timeout=0.5)
+    try:
+        with pytest.raises(UploadRejected) as rejected:
+            sandbox.run(time.sleep, 5)
+        assert rejected.value.reason == "timeout"
+        assert sandbox.run(abs, -3) == 3
+    finally:
+        sandbox.shutdown()
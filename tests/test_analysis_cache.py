@@ -0,0 +1,67 @@
+from analysis_cache import AnalysisCache, content_hash
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = AnalysisCache(maxsize=4, ttl=10, clock=clock)
+    cache.put("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_put_restarts_the_ttl():
+    clock = FakeClock()
+    cache = AnalysisCache(maxsize=4, ttl=10, clock=clock)
+    cache.put("a", 1)
+    clock.now = 8
+    cache.put("a", 2)
+    clock.now = 15
+    assert cache.get("a") == 2
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = AnalysisCache(maxsize=3, ttl=10, clock=FakeClock())
+    for key in "abc":
+        cache.put(key, key.upper())
+    assert cache.get("a") == "A"
+
+    cache.put("d", "D")
+    assert cache.get("b") is None
+    cache.put("e", "E")
+    assert cache.get("c") is None
+    assert [cache.get(key) for key in "ade"] == ["A", "D", "E"]
+    assert cache.stats()["evictions"] == 2
+    assert cache.stats()["size"] == 3
+
+
+def test_get_or_compute_does_not_store_none():
+    cache = AnalysisCache(maxsize=4, ttl=10, clock=FakeClock())
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return None if len(calls) == 1 else "parsed"
+
+    assert cache.get_or_compute("a", compute) is None
+    assert cache.get_or_compute("a", compute) == "parsed"
+    assert cache.get_or_compute("a", compute) == "parsed"
+    assert len(calls) == 2
+
+
+def test_content_hash_depends_only_on_bytes():
+    assert content_hash(b"resume") == content_hash(bytes(bytearray(b"resume")))
+    assert content_hash(b"resume") != content_hash(b"resume ")
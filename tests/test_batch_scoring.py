@@ -0,0 +1,31 @@
+import random
+
+from batch_scoring import BatchScorer
+from pipeline import JOB_DATABASE, suggest_jobs
+from skill_matcher import COMMON_SKILLS
+
+VOCABULARY = sorted(set(COMMON_SKILLS).union(*(job["required_skills"] for job in JOB_DATABASE.values())))
+
+
+def test_batch_matches_suggest_jobs_per_resume():
+    rng = random.Random(6)
+    resumes = [rng.sample(VOCABULARY, rng.randint(0, 15)) for _ in range(2000)]
+    scorer = BatchScorer(JOB_DATABASE)
+    scores = scorer.score(resumes, chunk_size=300)
+
+    for row, skills in enumerate(resumes):
+        assert scorer.suggestions(scores, skills, row) == suggest_jobs(skills, JOB_DATABASE)
+
+
+def test_frame_counts():
+    resumes = [["python", "sql", "git"], [], ["excel"]]
+    scorer = BatchScorer(JOB_DATABASE)
+    table = scorer.to_frame(scorer.score(resumes), ["a", "b", "c"])
+    for _, row in table.iterrows():
+        required = JOB_DATABASE[row["job"]]["required_skills"]
+        found = resumes["abc".index(row["resume"])]
+        matched = sum(skill in found for skill in required)
+        assert row["matched_count"] == matched
+        assert row["missing_count"] == len(required) - matched
+        assert row["match_score"] == matched / len(required)
+    assert set(table["resume"]) == {"a"}
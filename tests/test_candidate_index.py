@@ -0,0 +1,122 @@
+import random
+
+import pytest
+
+from candidate_index import CandidateIndex
+from job_index import MATCH_THRESHOLD
+from pipeline import JOB_DATABASE
+from skill_matcher import COMMON_SKILLS
+
+TENANTS = ["acme", "globex"]
+LOCATIONS = ["Pune", "Delhi", "Remote"]
+
+
+def brute_force(pool, required, tenant, k, min_score=None, location=None, skills=None):
+    # pool is in insertion order, a replaced candidate moved to the end
+    scored = []
+    for position, candidate in enumerate(pool.values()):
+        if candidate["tenant"] != tenant:
+            continue
+        if location and candidate["location"].lower() != location.lower():
+            continue
+        if min_score and candidate["resume_score"] < min_score:
+            continue
+        found = set(candidate["skills"])
+        if skills and not found.issuperset(skills):
+            continue
+        matched = sum(skill in found for skill in required)
+        if matched / len(required) > MATCH_THRESHOLD:
+            scored.append((-matched, -candidate["resume_score"], position, candidate["hash"]))
+    scored.sort()
+    return [content_hash for _, _, _, content_hash in scored[:k]], len(scored)
+
+
+def random_candidate(rng, i):
+    return {"tenant": rng.choice(TENANTS), "hash": f"{i:08x}", "name": f"c{i}",
+            "skills": rng.sample(COMMON_SKILLS, rng.randint(1, 12)),
+            "resume_score": rng.randint(0, 40) * 2.5, "location": rng.choice(LOCATIONS)}
+
+
+def random_query(rng):
+    filters = {}
+    kind = rng.choice([None, "location", "min_score", "skills"])
+    if kind == "location":
+        filters["location"] = rng.choice(LOCATIONS).upper()
+    elif kind == "min_score":
+        filters["min_score"] = rng.choice([10, 37.5, 60])
+    elif kind == "skills":
+        filters["skills"] = rng.sample(COMMON_SKILLS, 1)
+    return rng.choice(list(JOB_DATABASE)), rng.choice(TENANTS), rng.choice([1, 3, 10, 50]), filters
+
+
+def check(index, pool, rng):
+    for _ in range(30):
+        role, tenant, k, filters = random_query(rng)
+        results, total = index.rank_role(role, tenant, k, **filters)
+        expected, expected_total = brute_force(pool, JOB_DATABASE[role]["required_skills"], tenant, k, **filters)
+        assert [result["hash"] for result in results] == expected
+        assert total == expected_total
+
+
+def test_top_k_agrees_with_brute_force(tmp_path):
+    rng = random.Random(4)
+    index = CandidateIndex(str(tmp_path / "candidates.db"), JOB_DATABASE)
+    pool = {}
+    try:
+        for i in range(400):
+            candidate = random_candidate(rng, i)
+            pool[(candidate["tenant"], candidate["hash"])] = candidate
+        for tenant in TENANTS:
+            index.add_many(tenant, [c for c in pool.values() if c["tenant"] == tenant])
+        check(index, pool, rng)
+
+        for round_ in range(5):
+            # Replace some, delete some, add some
+            for key in rng.sample(list(pool), 40):
+                candidate = pool.pop(key)
+                if rng.random() < 0.5:
+                    assert index.remove(*key)
+                else:
+                    candidate = {**random_candidate(rng, 0), "tenant": key[0], "hash": key[1]}
+                    index.add(key[0], key[1], candidate["skills"], candidate["resume_score"],
+                              location=candidate["location"])
+                    pool[key] = candidate
+            for i in range(20):
+                candidate = random_candidate(rng, 1000 + round_ * 100 + i)
+                index.add(candidate["tenant"], candidate["hash"], candidate["skills"],
+                          candidate["resume_score"], location=candidate["location"])
+                pool[(candidate["tenant"], candidate["hash"])] = candidate
+            check(index, pool, rng)
+    finally:
+        index.close()
+
+
+def test_refresh_sees_other_connections(tmp_path):
+    path = str(tmp_path / "candidates.db")
+    writer = CandidateIndex(path, JOB_DATABASE)
+    reader = CandidateIndex(path, JOB_DATABASE)
+    try:
+        required = JOB_DATABASE["Software Engineer"]["required_skills"]
+        writer.add("acme", "a", required, 50)
+        results, total = reader.rank_role("Software Engineer", "acme")
+        assert [result["hash"] for result in results] == ["a"] and total == 1
+        assert reader.rank_role("Software Engineer", "globex") == ([], 0)
+
+        writer.remove("acme", "a")
+        assert reader.rank_role("Software Engineer", "acme") == ([], 0)
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_rank_endpoint_rejects_bad_k(tmp_path, monkeypatch):
+    simple_app = pytest.importorskip("simple_app")
+    monkeypatch.setattr(simple_app, "_candidates", CandidateIndex(str(tmp_path / "candidates.db"), JOB_DATABASE))
+    client = simple_app.app.test_client()
+    for k in ("0", "-5", "ten"):
+        response = client.get(f"/tenants/acme/roles/Software Engineer/candidates?k={k}")
+        assert response.status_code == 400
+    response = client.get("/tenants/acme/roles/Software Engineer/candidates?k=1")
+    assert response.status_code == 200
+    assert response.get_json()["total"] == 0
+    simple_app._candidates.close()
@@ -0,0 +1,90 @@
+import random
+
+from catalogue import Catalogue
+from job_index import JobIndex
+from pipeline import JOB_DATABASE
+
+VOCABULARY = sorted({skill for job in JOB_DATABASE.values() for skill in job["required_skills"]})
+
+
+def load(catalogue, roles):
+    for name, details in roles.items():
+        catalogue.upsert_role(name, details["required_skills"], details["description"])
+
+
+def test_suggest_agrees_with_job_index(tmp_path):
+    catalogue = Catalogue(str(tmp_path / "catalogue.db"))
+    roles = dict(JOB_DATABASE)
+    load(catalogue, roles)
+    snapshot = catalogue.snapshot()
+    rng = random.Random(5)
+
+    for round_ in range(6):
+        index = JobIndex(roles)
+        for _ in range(100):
+            skills = rng.sample(VOCABULARY, rng.randint(0, 12))
+            top_k = rng.choice([None, 1, 3])
+            assert snapshot.suggest(skills, top_k=top_k) == index.suggest(skills, top_k=top_k)
+        assert snapshot.roles() == roles
+
+        # Change some roles, drop one, add one
+        for name in rng.sample(list(roles), 3):
+            roles[name] = {"required_skills": rng.sample(VOCABULARY, rng.randint(1, 6)),
+                           "description": f"{name}, revised in round {round_}"}
+            catalogue.upsert_role(name, roles[name]["required_skills"], roles[name]["description"])
+        dropped = rng.choice(list(roles))
+        del roles[dropped]
+        catalogue.delete_role(dropped)
+        roles[f"Role {round_}"] = {"required_skills": rng.sample(VOCABULARY, 4), "description": "New"}
+        catalogue.upsert_role(f"Role {round_}", roles[f"Role {round_}"]["required_skills"], "New")
+    catalogue.close()
+
+
+def test_refresh_sees_other_connections(tmp_path):
+    path = str(tmp_path / "catalogue.db")
+    writer = Catalogue(path)
+    reader = Catalogue(path)
+    snapshot = reader.snapshot()
+    assert snapshot.suggest(["python", "sql"]) == {}
+
+    writer.upsert_role("Analyst", ["python", "sql"], "Looks at data")
+    assert list(snapshot.suggest(["python", "sql"])) == ["Analyst"]
+
+    writer.upsert_role("Analyst", ["excel", "sql"], "Looks at sheets")
+    job = snapshot.suggest(["python", "sql"])["Analyst"]
+    assert job["match_score"] == 0.5
+    assert job["missing_skills"] == ["excel"] and job["description"] == "Looks at sheets"
+
+    writer.delete_role("Analyst")
+    assert snapshot.suggest(["excel", "sql"]) == {}
+    assert len(snapshot) == 0
+    writer.close()
+    reader.close()
+
+
+def test_role_changed_between_refresh_and_details(tmp_path):
+    path = str(tmp_path / "catalogue.db")
+    writer = Catalogue(path)
+    reader = Catalogue(path)
+    writer.upsert_role("Analyst", ["python", "sql"], "Looks at data")
+    snapshot = reader.snapshot()
+
+    # The write lands right after the query's refresh: the scores come
+    # from the old version, the details would come from the new one
+    refresh = snapshot.refresh
+    calls = []
+
+    def late_write():
+        calls.append(True)
+        if len(calls) == 1:
+            writer.upsert_role("Analyst", ["excel", "word", "sql"], "Looks at sheets")
+            return False
+        return refresh()
+
+    snapshot.refresh = late_write
+    job = snapshot.suggest(["python", "sql"])["Analyst"]
+    assert len(calls) == 2
+    assert job == {"match_score": 1 / 3, "matched_skills": ["sql"], "missing_skills": ["excel", "word"],
+                   "description": "Looks at sheets"}
+    writer.close()
+    reader.close()
@@ -0,0 +1,117 @@
+import zipfile
+from io import BytesIO
+
+import pytest
+
+from extraction import ExtractionLimitError, iter_docx_paragraphs
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+NAMESPACES = (f'xmlns:w="{W}" xmlns:r="{R}" '
+              'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+              'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+              'xmlns:v="urn:schemas-microsoft-com:vml"')
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+
+def p(*runs):
+    return "<w:p>" + "".join(f"<w:r>{run}</w:r>" for run in runs) + "</w:p>"
+
+
+def t(text):
+    return f'<w:t xml:space="preserve">{text}</w:t>'
+
+
+def part(root, body):
+    return f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:{root} {NAMESPACES}>{body}</w:{root}>'
+
+
+def make_docx(body, headers=(), footers=()):
+    """
+    A minimal DOCX: body paragraphs plus headers/footers linked from the
+    document's .rels
+    """
+    rels = []
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", (
+            f'<Relationships xmlns="{REL}"><Relationship Id="rId1" '
+            f'Type="{R}/officeDocument" Target="word/document.xml"/></Relationships>'))
+        for kind, texts in (("header", headers), ("footer", footers)):
+            for i, text in enumerate(texts, 1):
+                archive.writestr(f"word/{kind}{i}.xml", part("hdr" if kind == "header" else "ftr", p(t(text))))
+                rels.append(f'<Relationship Id="rId{kind}{i}" Type="{R}/{kind}" Target="{kind}{i}.xml"/>')
+        rels.append(f'<Relationship Id="rIdLink" Type="{R}/hyperlink" Target="https://example.com" '
+                    'TargetMode="External"/>')
+        archive.writestr("word/_rels/document.xml.rels", f'<Relationships xmlns="{REL}">{"".join(rels)}</Relationships>')
+        archive.writestr("word/document.xml", part("document", f"<w:body>{body}</w:body>"))
+    return buffer.getvalue()
+
+
+def paragraphs(data, **limits):
+    return list(iter_docx_paragraphs(data, **limits))
+
+
+def test_table_cells():
+    table = ("<w:tbl><w:tr>"
+             f"<w:tc>{p(t('Python'))}</w:tc><w:tc>{p(t('5 years'))}</w:tc>"
+             f"</w:tr><w:tr><w:tc>{p(t('SQL'))}{p(t('Postgres'))}</w:tc></w:tr></w:tbl>")
+    assert paragraphs(make_docx(p(t("Skills")) + table + p(t("End")))) == [
+        "Skills", "Python", "5 years", "SQL", "Postgres", "End"]
+
+
+def test_text_box_fallback_is_not_duplicated():
+    text_box = (
+        "<mc:AlternateContent>"
+        "<mc:Choice Requires=\"wps\"><w:drawing><wps:txbx><w:txbxContent>"
+        f"{p(t('Contact: a@b.com'))}"
+        "</w:txbxContent></wps:txbx></w:drawing></mc:Choice>"
+        "<mc:Fallback><w:pict><v:textbox><w:txbxContent>"
+        f"{p(t('Contact: a@b.com'))}"
+        "</w:txbxContent></v:textbox></w:pict></mc:Fallback>"
+        "</mc:AlternateContent>"
+    )
+    body = f"<w:p><w:r>{t('Anchor ')}</w:r><w:r>{text_box}</w:r><w:r>{t('text')}</w:r></w:p>"
+    assert paragraphs(make_docx(body)) == ["Contact: a@b.com", "Anchor text"]
+
+
+def test_headers_and_footers_follow_the_body():
+    data = make_docx(p(t("Body")), headers=["Jane Doe"], footers=["Page 1"])
+    assert paragraphs(data) == ["Body", "Jane Doe", "Page 1"]
+
+
+def test_tabs_and_breaks():
+    body = p(t("Python"), "<w:tab/>", t("Java"), "<w:br/>", t("SQL"), "<w:cr/>", t("Git"))
+    assert paragraphs(make_docx(body)) == ["Python\tJava\nSQL\nGit"]
+
+
+def test_xml_size_limit():
+    data = make_docx(p(t("x" * 5000)))
+    with pytest.raises(ExtractionLimitError):
+        paragraphs(data, max_xml_bytes=1000)
+    assert paragraphs(data, max_xml_bytes=None) == ["x" * 5000]
+
+
+def test_matches_python_docx_on_body_text():
+    docx = pytest.importorskip("docx")
+    body = "".join([
+        p(t("Jane Doe")),
+        p(),
+        p(t("Skills: "), t("Python, "), t("Machine Learning")),
+        p(t("Tools"), "<w:tab/>", t("Git"), "<w:br/>", t("Docker")),
+        p(t("  spaced  "), t("&amp; escaped &lt;ok&gt;"))
+    ])
+    data = make_docx(body)
+    expected = [paragraph.text for paragraph in docx.Document(BytesIO(data)).paragraphs]
+    assert paragraphs(data) == expected
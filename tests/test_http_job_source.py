@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from job_sources import HttpJobSource, JobFeed
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Board(BaseHTTPRequestHandler):
+    status = 200
+    delay = 0.0
+    requests = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        Board.requests.append((url.path, query))
+        time.sleep(Board.delay)
+        if Board.status != 200:
+            self.send_response(Board.status)
+            self.end_headers()
+            return
+        skills = query["skills"].split(",")
+        jobs = [{"title": f"{skill} developer", "company": "Acme", "skills": [skill],
+                 "url": f"https://jobs.example/{skill}"} for skill in skills]
+        payload = {"jobs": jobs} if url.path == "/wrapped" else jobs
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def board():
+    Board.status, Board.delay, Board.requests = 200, 0.0, []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Board)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_list_payload(board):
+    source = HttpJobSource("board", board)
+    jobs = source.fetch(["python", "sql"], "Pune", 5)
+    assert [job["title"] for job in jobs] == ["python developer", "sql developer"]
+    assert Board.requests == [("/jobs", {"skills": "python,sql", "location": "Pune", "limit": "5"})]
+    assert jobs[0]["apply_link"] == "https://jobs.example/python"
+    assert jobs[0]["location"] == "" and jobs[0]["skills"] == ["python"]
+
+
+def test_wrapped_payload(board):
+    source = HttpJobSource("board", board, path="/wrapped")
+    assert [job["title"] for job in source.fetch(["java"], "India", 5)] == ["java developer"]
+
+
+def test_slow_source_times_out_on_its_own(board):
+    Board.delay = 1.0
+    slow = HttpJobSource("slow", board, timeout=0.2)
+    feed = JobFeed([slow], timeout=5.0)
+    start = time.monotonic()
+    assert feed.get_jobs(["python"]) == []
+    assert time.monotonic() - start < 0.9
+    assert feed.stats()["size"] == 0
+
+
+def test_server_error_keeps_stale_entry(board):
+    clock = FakeClock()
+    feed = JobFeed([HttpJobSource("board", board)], timeout=2.0, ttl=10, stale_ttl=100, clock=clock)
+    before = feed.get_jobs(["python"])
+    assert [job["title"] for job in before] == ["python developer"]
+
+    Board.status = 503
+    clock.now = 50
+    assert feed.get_jobs(["python"]) == before
+    deadline = time.monotonic() + 5
+    while feed._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(Board.requests) == 2
+    assert feed.get_jobs(["python"]) == before
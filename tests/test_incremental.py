@@ -0,0 +1,25 @@
+from io import BytesIO
+
+import pdfplumber
+
+from benchmarks.synthetic import make_pdf
+from incremental import _pdf_fingerprints
+
+
+def test_page_fingerprint_covers_fonts():
+    pages = [["python developer"], ["sql and excel"]]
+    data = make_pdf(pages)
+    # Same content streams, different font resource (same length, so the
+    # xref offsets stay valid)
+    other_font = data.replace(b"/BaseFont /Helvetica", b"/BaseFont /Helvetixa")
+
+    assert _pdf_fingerprints(data, None) == _pdf_fingerprints(make_pdf(pages), None)
+    assert _pdf_fingerprints(other_font, None)[0] != _pdf_fingerprints(data, None)[0]
+    with pdfplumber.open(BytesIO(other_font)) as pdf:
+        assert len(pdf.pages) == 2
+
+
+def test_page_fingerprint_tells_pages_apart():
+    fingerprints = _pdf_fingerprints(make_pdf([["java"], ["react"], ["java"]]), None)
+    assert fingerprints[0] == fingerprints[2]
+    assert fingerprints[0] != fingerprints[1]
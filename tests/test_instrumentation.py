@@ -0,0 +1,89 @@
+import pytest
+
+import instrumentation
+
+
+@pytest.fixture(autouse=True)
+def clean_counters():
+    was_enabled = instrumentation.is_enabled()
+    instrumentation.reset()
+    yield
+    instrumentation.reset()
+    if not was_enabled:
+        instrumentation.disable()
+
+
+def test_disabled_stages_record_nothing():
+    instrumentation.disable()
+
+    @instrumentation.timed("parse", size_of=len)
+    def parse(text):
+        return text.upper()
+
+    with instrumentation.stage("match"):
+        pass
+    assert parse("abc") == "ABC"
+    assert instrumentation.snapshot() == {}
+
+
+def test_enabled_stages_count_calls_and_input_size():
+    instrumentation.enable()
+
+    @instrumentation.timed("parse", size_of=len)
+    def parse(text):
+        return text.upper()
+
+    parse("abc")
+    parse("de")
+    with instrumentation.stage("match", size=7):
+        pass
+    stats = instrumentation.snapshot()
+    assert stats["parse"]["calls"] == 2
+    assert stats["parse"]["input_size"] == 5
+    assert stats["match"]["calls"] == 1
+    assert stats["match"]["input_size"] == 7
+    assert stats["parse"]["wall_seconds"] >= stats["parse"]["max_wall_seconds"] >= 0
+
+
+def test_merge_adds_worker_counters():
+    instrumentation.record("parse", 1.0, 0.5, 10, 100)
+    instrumentation.record("parse", 3.0, 1.0, -4, None)
+    worker = instrumentation.drain()
+    assert instrumentation.snapshot() == {}
+
+    instrumentation.record("parse", 2.0, 0.25, 1, 50)
+    instrumentation.merge(worker)
+    instrumentation.merge({"ocr": dict(worker["parse"])})
+
+    stats = instrumentation.snapshot()
+    assert stats["parse"] == {"calls": 3, "wall_seconds": 6.0, "cpu_seconds": 1.75, "alloc_blocks": 7,
+                              "input_size": 150, "max_wall_seconds": 3.0}
+    assert stats["ocr"] == worker["parse"]
+
+    # merge() copies what it is given
+    worker["parse"]["calls"] = 99
+    assert instrumentation.snapshot()["ocr"]["calls"] == 2
+
+
+def test_render_prometheus():
+    instrumentation.record("suggest_jobs", 0.5, 0.25, 3, 4)
+    instrumentation.record("extract_skills", 1.5, 1.0, -2, 120)
+
+    lines = instrumentation.render_prometheus().splitlines()
+    assert lines[:4] == [
+        "# HELP resume_stage_calls_total Number of times the stage ran",
+        "# TYPE resume_stage_calls_total counter",
+        'resume_stage_calls_total{stage="extract_skills"} 1',
+        'resume_stage_calls_total{stage="suggest_jobs"} 1',
+    ]
+    assert "# TYPE resume_stage_alloc_blocks gauge" in lines
+    assert 'resume_stage_alloc_blocks{stage="extract_skills"} -2' in lines
+    assert 'resume_stage_wall_seconds_total{stage="suggest_jobs"} 0.5' in lines
+    assert 'resume_stage_input_size_total{stage="extract_skills"} 120' in lines
+    assert len(lines) == 4 * len(instrumentation.PROMETHEUS_METRICS)
+
+
+def test_render_prometheus_without_stages():
+    text = instrumentation.render_prometheus()
+    assert text.endswith("\n")
+    assert all(line.startswith("#") for line in text.splitlines())
@@ -0,0 +1,38 @@
+import random
+
+from job_index import JobIndex
+from pipeline import JOB_DATABASE
+from skill_matcher import COMMON_SKILLS
+
+
+def baseline_suggest_jobs(found_skills, job_db):
+    # suggest_jobs as it was before the index
+    suggested_jobs = {}
+    for job_name, job_details in job_db.items():
+        required_skills = job_details["required_skills"]
+        matched_skills = [skill for skill in required_skills if skill in found_skills]
+        match_score = len(matched_skills) / len(required_skills) if required_skills else 0
+        if match_score > 0.3:
+            suggested_jobs[job_name] = {
+                "match_score": match_score,
+                "matched_skills": matched_skills,
+                "missing_skills": [skill for skill in required_skills if skill not in found_skills],
+                "description": job_details["description"]
+            }
+    return dict(sorted(suggested_jobs.items(), key=lambda item: item[1]['match_score'], reverse=True))
+
+
+def test_suggest_agrees_with_baseline():
+    index = JobIndex(JOB_DATABASE)
+    vocabulary = sorted(set(COMMON_SKILLS).union(*(job["required_skills"] for job in JOB_DATABASE.values())))
+    rng = random.Random(3)
+    for _ in range(500):
+        skills = rng.sample(vocabulary, rng.randint(0, 20))
+        expected = baseline_suggest_jobs(skills, JOB_DATABASE)
+        suggested = index.suggest(skills)
+        assert list(suggested) == list(expected)
+        for name, job in expected.items():
+            assert suggested[name]["match_score"] == job["match_score"]
+            assert suggested[name]["matched_skills"] == job["matched_skills"]
+            assert suggested[name]["missing_skills"] == job["missing_skills"]
+            assert suggested[name]["description"] == job["description"]
@@ -0,0 +1,113 @@
+import time
+
+from job_sources import JobFeed, JobSource, MockJobSource
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class VersionedSource(JobSource):
+    """
+    Answers with jobs tagged by the current version, or fails when broken
+    """
+    name = "versioned"
+
+    def __init__(self, delay=0.0):
+        self.version = 1
+        self.broken = False
+        self.delay = delay
+
+    def fetch(self, skills, location, limit):
+        time.sleep(self.delay)
+        if self.broken:
+            raise ConnectionError("board is down")
+        return [{"title": f"{'/'.join(sorted(skills))} v{self.version}"}]
+
+
+def wait_for_refreshes(feed, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while feed._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not feed._refreshing
+
+
+def test_failed_fetch_is_not_cached():
+    source = VersionedSource()
+    source.broken = True
+    feed = JobFeed([source], timeout=1.0)
+
+    assert feed.get_jobs(["python"]) == []
+    assert feed.stats()["size"] == 0
+
+    source.broken = False
+    assert feed.get_jobs(["python"]) == [{"title": "python v1"}]
+    assert feed.stats()["size"] == 1
+
+
+def test_failed_refresh_keeps_stale_entries():
+    clock = FakeClock()
+    source = VersionedSource()
+    feed = JobFeed([source], timeout=1.0, ttl=10, stale_ttl=100, clock=clock)
+    keys = [[f"skill{i}"] for i in range(8)]
+    before = [feed.get_jobs(skills) for skills in keys]
+
+    clock.now = 50
+    source.broken = True
+    assert [feed.get_jobs(skills) for skills in keys] == before
+    wait_for_refreshes(feed)
+
+    assert [feed.get_jobs(skills) for skills in keys] == before
+
+
+def test_many_stale_keys_refresh_without_starving_fetches():
+    clock = FakeClock()
+    source = VersionedSource(delay=0.05)
+    feed = JobFeed([source], timeout=1.0, ttl=10, stale_ttl=100, clock=clock)
+    keys = [[f"skill{i}"] for i in range(8)]
+    for skills in keys:
+        feed.get_jobs(skills)
+
+    clock.now = 50
+    source.version = 2
+    for skills in keys:
+        feed.get_jobs(skills)
+    wait_for_refreshes(feed)
+
+    clock.now = 51
+    assert [feed.get_jobs(skills) for skills in keys] == [[{"title": f"skill{i} v2"}] for i in range(8)]
+
+
+def test_cache_is_bounded_and_drops_expired_entries():
+    clock = FakeClock()
+    feed = JobFeed([VersionedSource()], timeout=1.0, ttl=10, stale_ttl=100, maxsize=4, clock=clock)
+    for i in range(10):
+        feed.get_jobs([f"skill{i}"])
+    assert feed.stats()["size"] == 4
+
+    clock.now = 200
+    assert feed.get_jobs(["skill9"]) == [{"title": "skill9 v1"}]
+    assert feed.stats()["misses"] == 11
+
+
+def test_skill_order_is_part_of_the_key():
+    jobs = {"python": [{"title": "Python Developer"}], "java": [{"title": "Java Engineer"}]}
+    feed = JobFeed([MockJobSource(jobs)], timeout=1.0)
+    assert feed.get_jobs(["python", "java"], limit=1) == [{"title": "Python Developer"}]
+    assert feed.get_jobs(["java", "python"], limit=1) == [{"title": "Java Engineer"}]
+
+
+def test_clear_makes_the_next_query_cold():
+    source = VersionedSource()
+    feed = JobFeed([source], timeout=1.0)
+    feed.get_jobs(["python"])
+    source.version = 2
+    assert feed.get_jobs(["python"]) == [{"title": "python v1"}]
+
+    feed.clear()
+    assert feed.get_jobs(["python"]) == [{"title": "python v2"}]
+    assert feed.stats()["misses"] == 2
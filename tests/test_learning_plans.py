@@ -0,0 +1,32 @@
+from learning_plans import LEARNING_PLANS, get_learning_plan, rank_gap_plans
+
+
+def job(*missing):
+    return {"match_score": 0.5, "matched_skills": [], "missing_skills": list(missing), "description": ""}
+
+
+def test_skills_unlocking_most_jobs_come_first():
+    suggested = {
+        "A": job("docker", "sql", "aws"),
+        "B": job("aws", "git"),
+        "C": job("aws", "sql", "sql"),
+        "D": job("kubernetes")
+    }
+    ranked = rank_gap_plans(["python"], suggested)
+    assert [(skill, jobs) for skill, jobs, _ in ranked] == [("aws", 3), ("sql", 2), ("docker", 1), ("git", 1)]
+    assert ranked[0][2] is get_learning_plan("aws")
+
+
+def test_only_top_n_jobs_and_missing_skills_count():
+    suggested = {"A": job("sql", "excel"), "B": job("excel"), "C": job("tableau")}
+    assert [skill for skill, _, _ in rank_gap_plans(["sql"], suggested, top_n=2)] == ["excel"]
+    assert [skill for skill, _, _ in rank_gap_plans([], suggested, top_n=1)] == ["sql", "excel"]
+    assert rank_gap_plans([], {}) == ()
+
+
+def test_unknown_skills_are_not_stored():
+    size = len(LEARNING_PLANS)
+    for i in range(2000):
+        plan = get_learning_plan(f"made-up skill {i}")
+    assert plan["resources"][0] == "YouTube: Made-Up Skill 1999 Tutorial"
+    assert len(LEARNING_PLANS) == size
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+import ocr
+import pipeline
+from admission import UploadRejected, guarded
+from analysis_cache import AnalysisCache
+from benchmarks.synthetic import make_resume
+from extraction import PDF_MIME
+
+
+def _slow_recognize(page, deadline):
+    time.sleep(5)
+    return "text"
+
+
+def _broken_recognize(page, deadline):
+    raise RuntimeError("tesseract exploded")
+
+
+def test_time_limit_is_not_swallowed(monkeypatch):
+    monkeypatch.setattr(ocr, "_recognize", _slow_recognize)
+    document = ocr.DocumentOcr(make_resume("pdf", 1), workers=1, cache=AnalysisCache(maxsize=4))
+    start = time.monotonic()
+    with pytest.raises(UploadRejected) as rejected:
+        guarded(document.submit, 0, cpu_seconds=None, timeout=0.2)
+    assert rejected.value.reason == "timeout"
+    assert time.monotonic() - start < 2
+    document.close()
+
+
+def test_failed_page_is_skipped(monkeypatch):
+    monkeypatch.setattr(ocr, "_recognize", _broken_recognize)
+    document = ocr.DocumentOcr(make_resume("pdf", 1), workers=1, cache=AnalysisCache(maxsize=4))
+    assert document.submit(0) == ""
+    assert document.skipped == 1
+    document.close()
+
+
+class RecordingSandbox:
+    def __init__(self):
+        self.calls = []
+
+    def run(self, fn, *args):
+        self.calls.append(args[-1])
+        raise UploadRejected("timeout", "stop here")
+
+    def stream(self, fn, *args, **kwargs):
+        self.calls.append(kwargs)
+        return iter(())
+
+
+def test_sandboxed_analysis_ocrs_in_the_worker():
+    sandbox = RecordingSandbox()
+    data = make_resume("pdf", 1)
+    list(pipeline.analyze_resume_stream(data, PDF_MIME, sandbox=sandbox))
+    pipeline.analyze_resume_incremental({}, "key", data, PDF_MIME, sandbox=sandbox)
+    assert [call["ocr_workers"] for call in sandbox.calls] == [1, 1]
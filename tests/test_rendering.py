@@ -0,0 +1,53 @@
+from html import escape
+
+from rendering import _section, jobs_html, real_jobs_html
+
+JOB = {"title": "Backend <Engineer>", "company": "Acme & Co", "location": "Pune", "experience": "2 years",
+       "salary": "₹8 LPA", "skills": ["Python"], "apply_link": "https://jobs.example/1?a=1&b=2"}
+
+SUGGESTED = {
+    "Software Engineer": {"match_score": 0.8, "matched_skills": ["python", "sql", "git", "java"],
+                          "missing_skills": ["javascript"], "description": "Builds <software>."},
+    "Data Analyst": {"match_score": 0.4, "matched_skills": ["sql", "python"],
+                     "missing_skills": ["excel", "data analysis", "statistics"], "description": "Reads data."},
+    "Web Developer": {"match_score": 1.0, "matched_skills": ["html", "css"], "missing_skills": [],
+                      "description": "Makes sites."}
+}
+
+
+def test_hostile_apply_links_are_dropped():
+    for link in ["javascript:alert(1)", " JavaScript:alert(1)", "java\tscript:alert(1)",
+                 "data:text/html,<script>alert(1)</script>", "vbscript:msgbox(1)", "//evil.example"]:
+        html = real_jobs_html([{**JOB, "apply_link": link}])
+        assert 'href="#"' in html
+        assert "script:" not in html.lower().replace("\t", "")
+
+
+def test_apply_links_open_safely():
+    html = real_jobs_html([JOB])
+    assert f'href="{escape(JOB["apply_link"])}" target="_blank" rel="noopener noreferrer"' in html
+    assert "Backend &lt;Engineer&gt; at Acme &amp; Co" in html
+
+
+def per_job_markup(job, details):
+    # One block per job, as the page drew them before batching
+    missing = details["missing_skills"]
+    emoji, css = (("🔥", "match-high") if details["match_score"] >= 0.8
+                  else ("👍", "match-medium") if details["match_score"] >= 0.5 else ("💡", "match-low"))
+    return (
+        '<div class="result-box">'
+        f'<h3>{emoji} {escape(job)} (<span class="{css}">{details["match_score"]:.0%} match</span>)</h3>'
+        f'<p><strong>Description:</strong> {escape(details["description"])}</p>'
+        f'<p><strong>✅ Your Matching Skills:</strong> {escape(", ".join(details["matched_skills"]).title())}</p>'
+        '<p><strong>📚 Skills to Learn:</strong> '
+        f'{escape(", ".join(missing).title()) if missing else "None! You have all required skills 🎉"}</p>'
+        '</div>'
+    )
+
+
+def test_batched_jobs_match_per_job_markup():
+    expected = "\n".join([_section("💼 Recommended Jobs For You")]
+                         + [per_job_markup(job, details) for job, details in SUGGESTED.items()])
+    assert jobs_html(SUGGESTED) == expected
+    for job, details in SUGGESTED.items():
+        assert jobs_html({job: details}).split("\n", 2)[2] == per_job_markup(job, details)
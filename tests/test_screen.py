@@ -0,0 +1,47 @@
+import json
+import os
+import time
+
+import screen
+from benchmarks.synthetic import make_resume
+
+
+def _crash_on_bad(name, file_bytes, timeout):
+    # Stands in for a file that kills the parser process
+    if "bad" in name:
+        time.sleep(0.2)
+        os._exit(1)
+    time.sleep(0.1)
+    return screen.screen_file(name, file_bytes, timeout)
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return {record["file"]: record for record in map(json.loads, f)}
+
+
+def test_worker_crash_only_marks_the_culprit(tmp_path):
+    source = tmp_path / "resumes"
+    source.mkdir()
+    names = [f"cv{i}.docx" for i in range(6)] + ["cv3_bad.docx"]
+    for name in names:
+        (source / name).write_bytes(make_resume("docx", 1))
+    output = tmp_path / "results.jsonl"
+
+    with open(output, "w", encoding="utf-8") as out:
+        summary = screen.screen(str(source), out, workers=2, progress=None, task=_crash_on_bad)
+    records = _read(output)
+    assert len(output.read_text().splitlines()) == len(names)
+    assert summary["processed"] == len(names) and summary["failed"] == 1
+    assert set(records) == set(names)
+    assert records["cv3_bad.docx"]["error"]["reason"] == "crashed"
+    assert all("error" not in records[name] for name in names if "bad" not in name)
+
+    # Everything, innocent neighbours included, is checkpointed; a resumed
+    # run only does the new file
+    (source / "cv9.docx").write_bytes(make_resume("docx", 1))
+    assert screen.load_checkpoint(str(output)) == set(names)
+    screen.main([str(source), "-o", str(output), "--resume", "-q", "-j", "1"])
+    records = _read(output)
+    assert set(records) == set(names) | {"cv9.docx"}
+    assert "error" not in records["cv9.docx"]
@@ -0,0 +1,27 @@
+from semantic import SemanticSkillMatcher
+
+SKILLS = ["python", "react", "postgresql", "power point", "machine learning"]
+TEXT = "Built ReactJS apps on Postgres, decks in Power Point"
+
+
+def test_over_budget_result_is_not_cached():
+    matcher = SemanticSkillMatcher(SKILLS, budget=-1)
+    matcher.extract(TEXT)
+    matcher.extract(TEXT)
+    assert matcher.over_budget == 2
+
+    matcher.budget = 10
+    full = matcher.extract(TEXT)
+    assert "postgresql" in full and "power point" in full
+    matcher.budget = -1
+    assert matcher.extract(TEXT) == full
+    assert matcher.over_budget == 2
+
+
+def test_memo_evicts_least_recently_used():
+    matcher = SemanticSkillMatcher(SKILLS, budget=10, memo_size=3)
+    matcher._memo.update({"a": None, "b": None, "c": None})
+    matcher.extract("a")
+    matcher.extract("zzz")
+    assert "a" in matcher._memo
+    assert "b" not in matcher._memo
@@ -0,0 +1,76 @@
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import pytest
+
+from benchmarks.synthetic import make_resume
+
+simple_app = pytest.importorskip("simple_app")
+
+
+class FakeExecutor:
+    """
+    Pool stand-in whose jobs crash or never finish
+    """
+
+    def __init__(self, crash):
+        self.crash = crash
+
+    def submit(self, fn, *args):
+        future = Future()
+        if self.crash:
+            future.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+        return future
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(simple_app, "_slots", threading.BoundedSemaphore(4))
+    return simple_app.app.test_client()
+
+
+def upload(client, path="/upload", files=1, data=None):
+    data = data or make_resume("pdf", 1)
+    field = "resumes" if path.endswith("batch") else "resume"
+    form = {field: [(BytesIO(data), f"cv{i}.pdf") for i in range(files)]}
+    return client.post(path, data=form, content_type="multipart/form-data")
+
+
+def test_busy_server_answers_429(client, monkeypatch):
+    monkeypatch.setattr(simple_app, "_slots", threading.BoundedSemaphore(1))
+    simple_app._slots.acquire()
+    response = upload(client)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_crashed_worker_answers_503(client, monkeypatch):
+    resets = []
+    monkeypatch.setattr(simple_app, "get_executor", lambda: FakeExecutor(crash=True))
+    monkeypatch.setattr(simple_app, "_reset_executor", lambda: resets.append(True))
+    response = upload(client)
+    assert response.status_code == 503
+    assert resets == [True]
+
+
+def test_slow_parse_answers_503(client, monkeypatch):
+    monkeypatch.setattr(simple_app, "get_executor", lambda: FakeExecutor(crash=False))
+    monkeypatch.setattr(simple_app, "REQUEST_TIMEOUT", 0.1)
+    response = upload(client)
+    assert response.status_code == 503
+    assert response.get_json()["error"] == "Parsing took too long"
+
+
+def test_oversized_requests_answer_413(client):
+    assert upload(client, "/upload/batch", files=simple_app.MAX_BATCH + 1).status_code == 413
+
+    # One file's worth of bytes is the limit for single-file routes,
+    # while a batch of the same size is still read
+    big = b"%PDF-1.4\n" + b"0" * (simple_app.MAX_BYTES + simple_app.FORM_OVERHEAD)
+    assert upload(client, data=big).status_code == 413
+    assert upload(client, "/tenants/acme/candidates", data=big).status_code == 413
+    response = upload(client, "/upload/batch", data=big)
+    assert response.status_code == 200
+    assert response.get_json()["results"][0]["rejection"]["reason"] == "file_too_large"
@@ -0,0 +1,41 @@
+import random
+import re
+
+from skill_matcher import COMMON_SKILLS, SKILL_MATCHER
+
+WORDS = COMMON_SKILLS + ["javascripts", "pythonic", "node", "js", "cloud", "data", "the", "and", "c++", "word2vec"]
+SEPARATORS = [" ", "  ", ", ", ".", "\n", "-", "/", "(", ")", ""]
+
+
+def random_text(rng, words=60):
+    parts = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        parts.append(word.upper() if rng.random() < 0.1 else word)
+        parts.append(rng.choice(SEPARATORS))
+    return "".join(parts)
+
+
+def per_skill(text):
+    # The original extract_skills: one \b...\b search per skill
+    text = text.lower()
+    return [skill for skill in COMMON_SKILLS if re.search(r'\b' + re.escape(skill) + r'\b', text)]
+
+
+def per_skill_counts(text):
+    text = text.lower()
+    counts = {}
+    for skill in COMMON_SKILLS:
+        found = len(re.findall(r'(?=\b' + re.escape(skill) + r'\b)', text))
+        if found:
+            counts[skill] = found
+    return counts
+
+
+def test_matcher_agrees_with_per_skill_search():
+    rng = random.Random(1)
+    for _ in range(500):
+        text = random_text(rng)
+        assert SKILL_MATCHER.extract(text) == per_skill(text)
+        assert SKILL_MATCHER.count(text) == per_skill_counts(text)
+
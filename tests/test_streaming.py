@@ -0,0 +1,30 @@
+import random
+
+from streaming import SkillStream
+from test_skill_matcher import per_skill_counts, random_text
+
+
+def test_stream_agrees_with_whole_text():
+    rng = random.Random(2)
+    for _ in range(500):
+        text = random_text(rng)
+        cuts = sorted(rng.sample(range(len(text) + 1), rng.randint(0, 8)))
+        stream = SkillStream()
+        new = []
+        for start, end in zip([0] + cuts, cuts + [len(text)]):
+            new += stream.feed(text[start:end])
+        new += stream.close()
+        assert stream.counts == per_skill_counts(text)
+        assert sorted(new) == sorted(per_skill_counts(text))
+
+
+def test_stream_final_analysis_matches_analyze_resume():
+    from benchmarks.synthetic import make_resume
+    from extraction import DOCX_MIME, PDF_MIME
+    from pipeline import analyze_resume, analyze_resume_stream
+
+    for file_format, file_type in (("pdf", PDF_MIME), ("docx", DOCX_MIME)):
+        data = make_resume(file_format, 4, "dense")
+        expected = analyze_resume(data, file_type, workers=1)
+        final = list(analyze_resume_stream(data, file_type, keep_text=True, workers=1))[-1]
+        assert final == expected
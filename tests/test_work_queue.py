@@ -0,0 +1,138 @@
+import threading
+
+import pytest
+
+import work_queue
+from benchmarks.synthetic import make_resume
+from work_queue import SQLiteBroker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def job_state(broker, job_hash):
+    return broker.conn.execute("SELECT state, attempts, worker FROM jobs WHERE hash = ?", (job_hash,)).fetchone()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "queue.db")
+
+
+def test_two_workers_never_get_the_same_job(path):
+    setup = SQLiteBroker(path)
+    setup.enqueue([(f"cv{i}.pdf", f"resume {i}".encode()) for i in range(20)])
+    setup.close()
+
+    leased = {}
+    barrier = threading.Barrier(2)
+
+    def worker(name):
+        broker = SQLiteBroker(path)
+        barrier.wait()
+        leased[name] = []
+        while True:
+            jobs = broker.lease(name)
+            if not jobs:
+                break
+            leased[name].extend(job_hash for job_hash, _, _ in jobs)
+        broker.close()
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    hashes = leased["w0"] + leased["w1"]
+    assert len(hashes) == len(set(hashes)) == 20
+
+
+def test_expired_lease_is_leased_again(path):
+    clock = FakeClock()
+    broker = SQLiteBroker(path, clock=clock)
+    broker.enqueue([("cv.pdf", b"resume")])
+    [(job_hash, name, data)] = broker.lease("w1", lease_seconds=60)
+    assert broker.lease("w2", lease_seconds=60) == []
+
+    clock.now += 61
+    [(again, _, _)] = broker.lease("w2", lease_seconds=60)
+    assert again == job_hash
+    assert job_state(broker, job_hash) == ("leased", 2, "w2")
+
+    # The first worker finishing late doesn't lose the result
+    broker.complete("w1", job_hash, {"file": "cv.pdf"}, 1.0)
+    broker.complete("w2", job_hash, {"file": "cv.pdf", "late": True}, 1.0)
+    assert list(broker.results()) == [("cv.pdf", {"file": "cv.pdf"})]
+    broker.close()
+
+
+def test_job_fails_after_max_attempts(path):
+    clock = FakeClock()
+    broker = SQLiteBroker(path, clock=clock)
+    broker.enqueue([("a.pdf", b"a"), ("b.pdf", b"b")])
+    failing = work_queue.content_hash(b"a")
+    lost = work_queue.content_hash(b"b")
+
+    for attempt in range(1, 4):
+        assert {job[0] for job in broker.lease("w", count=2, lease_seconds=10)} == {failing, lost}
+        broker.fail("w", failing, "boom", max_attempts=3)
+        assert job_state(broker, failing)[:2] == ("failed" if attempt == 3 else "queued", attempt)
+        # The other job's worker never reports back
+        clock.now += 11
+
+    assert broker.expire(max_attempts=3) == 1
+    assert job_state(broker, lost)[:2] == ("failed", 3)
+    assert broker.lease("w") == []
+    assert broker.pending() == 0
+    broker.close()
+
+
+def test_worker_waits_for_leases_held_elsewhere(path):
+    broker = SQLiteBroker(path)
+    broker.enqueue([("cv.docx", make_resume("docx", 1))])
+    # A worker that took the job and died
+    [(job_hash, _, _)] = broker.lease("lost", lease_seconds=0.5)
+
+    processed = work_queue.work(broker, "w2", lease_seconds=30, poll_seconds=0.05)
+    assert processed == 1
+    assert job_state(broker, job_hash)[:2] == ("done", 2)
+    [(name, record)] = broker.results()
+    assert name == "cv.docx" and "error" not in record
+    broker.close()
+
+
+def test_work_counts_failures(path, monkeypatch):
+    def crash(name, data, timeout):
+        raise RuntimeError("parser bug")
+
+    monkeypatch.setattr(work_queue, "screen_file", crash)
+    broker = SQLiteBroker(path)
+    broker.enqueue([("cv.pdf", b"resume")])
+    assert work_queue.work(broker, "w", max_attempts=2, poll_seconds=0.01) == 0
+    assert broker.stats()["jobs"] == {"failed": 1}
+    assert broker.stats()["workers"][0]["failed"] == 2
+    broker.close()
+
+
+def test_report_ranks_against_the_pipeline_job_index(path, monkeypatch):
+    from job_index import JobIndex
+    from pipeline import JOB_DATABASE
+
+    assert JobIndex(JOB_DATABASE).roles() == JOB_DATABASE
+
+    roles = {"Archivist": {"required_skills": ["excel", "word"], "description": "Files things."}}
+    monkeypatch.setattr(work_queue, "JOB_INDEX", JobIndex(roles))
+    broker = SQLiteBroker(path)
+    broker.enqueue([("a.pdf", b"a"), ("b.pdf", b"b")])
+    broker.lease("w", count=2)
+    broker.complete("w", work_queue.content_hash(b"a"), {"skills": ["excel"], "resume_score": 10}, 1.0)
+    broker.complete("w", work_queue.content_hash(b"b"), {"skills": ["excel", "word"], "resume_score": 5}, 1.0)
+
+    table = work_queue.ranked_table(broker)
+    assert table[["role", "rank", "file"]].values.tolist() == [["Archivist", 1, "b.pdf"], ["Archivist", 2, "a.pdf"]]
+    broker.close()
@@ -0,0 +1,103 @@
+"""
+Static page assets. Streamlit re-executes app.py on every interaction but
+imported modules stay in sys.modules, so these are built once per process.
+"""
+
+# Custom design
+CUSTOM_CSS = """
+<style>
+    .main-header {
+        font-size: 3.5rem;
+        color: #2563eb;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .sub-header {
+        color: #475569;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .result-box {
+        background: white;
+        padding: 20px;
+        border-radius: 10px;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        margin: 15px 0;
+        border-left: 5px solid #2563eb;
+    }
+    .skill-pill {
+        background: #dbeafe;
+        color: #1e40af;
+        padding: 5px 12px;
+        border-radius: 20px;
+        display: inline-block;
+        margin: 5px 5px 5px 0;
+        font-size: 0.9rem;
+    }
+    .match-high {color: #16a34a; font-weight: bold;}
+    .match-medium {color: #ca8a04; font-weight: bold;}
+    .match-low {color: #dc2626; font-weight: bold;}
+    .score-excellent {color: #16a34a; font-weight: bold; font-size: 2.5rem;}
+    .score-good {color: #ca8a04; font-weight: bold; font-size: 2.5rem;}
+    .score-poor {color: #dc2626; font-weight: bold; font-size: 2.5rem;}
+    .learning-plan {
+        background: #f0fdf4;
+        padding: 15px;
+        border-radius: 10px;
+        border-left: 4px solid #16a34a;
+        margin: 10px 0;
+    }
+    .notice {
+        padding: 16px;
+        border-radius: 8px;
+        margin: 10px 0;
+    }
+    .notice ul {margin: 0;}
+    .notice-success {background: #dcfce7; color: #166534;}
+    .notice-info {background: #dbeafe; color: #1e3a8a;}
+    .notice-warning {background: #fef9c3; color: #854d0e;}
+    .score-row {display: flex; gap: 2rem; align-items: center;}
+    .score-value {flex: 1;}
+    .score-progress {flex: 2;}
+    .score-bar {
+        background: #e2e8f0;
+        border-radius: 6px;
+        height: 10px;
+        overflow: hidden;
+    }
+    .score-bar-fill {background: #2563eb; height: 100%;}
+    .caption {color: #64748b; font-size: 0.85rem; margin-top: 6px;}
+    .expander {
+        border: 1px solid #e2e8f0;
+        border-radius: 8px;
+        padding: 10px 16px;
+        margin: 8px 0;
+    }
+    .expander summary {cursor: pointer; font-weight: 600;}
+    .job-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 20px;
+        border-radius: 15px;
+        margin: 15px 0;
+        box-shadow: 0 10px 20px rgba(0,0,0,0.2);
+    }
+</style>
+"""
+
+HEADER_HTML = """
+<h1 class="main-header">AI Job Finder</h1>
+<p class="sub-header">Upload your resume and discover your perfect career match</p>
+"""
+
+FOOTER_MARKDOWN = """
+---
+### 🚀 Next Steps:
+1. **Add missing skills** to improve your resume score
+2. **Focus on job roles** with highest match percentage  
+3. **Practice interview questions** for your target job
+4. **Update your resume** regularly with new skills
+
+---
+*Built with ❤️ using Streamlit | Your AI Career Assistant*
+"""
@@ -0,0 +1,425 @@
+"""
+Queue-based screening for batches too large for one process.
+
+A coordinator enqueues every resume of a directory or archive into a
+broker; any number of worker processes, on this machine or on others
+that can reach the broker, lease jobs, run them through the same
+analysis as screen.py and store the result. A report ranks the
+candidates for every role of the pipeline's job index (JOB_DATABASE, or
+the catalogue when RESUME_CATALOGUE is set).
+
+    python work_queue.py enqueue resumes/ --db queue.db
+    python work_queue.py work --db queue.db -j 8          # on each node
+    python work_queue.py status --db queue.db
+    python work_queue.py report --db queue.db -o ranked.csv
+
+Jobs are keyed by the SHA-256 of the file, so the same resume enqueued
+twice (or under two names) is analysed once and its result is reused. A
+leased job whose worker stops reporting goes back to the queue when the
+lease runs out and is retried up to max_attempts times; files the
+pipeline rejects are final results, not retried.
+
+SQLiteBroker keeps everything in one database file (WAL mode), which is
+enough for one machine or a few nodes on shared storage. Another backend
+only needs the Broker methods.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+
+from admission import limit_worker
+from analysis_cache import content_hash
+from pipeline import JOB_INDEX
+from screen import DEFAULT_TIMEOUT, iter_resumes, screen_file
+
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+ENQUEUE_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    hash TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    enqueued_at REAL NOT NULL,
+    finished_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state, lease_until);
+-- File bytes, dropped once the job has a result
+CREATE TABLE IF NOT EXISTS payloads (hash TEXT PRIMARY KEY, data BLOB NOT NULL);
+-- Every file name seen, several names can share one job
+CREATE TABLE IF NOT EXISTS files (name TEXT PRIMARY KEY, hash TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS results (
+    hash TEXT PRIMARY KEY,
+    record TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    seconds REAL
+);
+CREATE TABLE IF NOT EXISTS workers (
+    worker TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    busy_seconds REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+class Broker:
+    """
+    What workers and the coordinator need from a queue backend
+    """
+
+    def enqueue(self, files):
+        """
+        Add (name, file_bytes) pairs; returns how many new jobs were created
+        """
+        raise NotImplementedError
+
+    def lease(self, worker, count=1, lease_seconds=LEASE_SECONDS):
+        """
+        Up to count (hash, name, file_bytes) jobs for worker
+        """
+        raise NotImplementedError
+
+    def complete(self, worker, job_hash, record, seconds):
+        raise NotImplementedError
+
+    def fail(self, worker, job_hash, error, max_attempts=MAX_ATTEMPTS):
+        raise NotImplementedError
+
+    def heartbeat(self, worker, host):
+        raise NotImplementedError
+
+    def pending(self):
+        """
+        Number of jobs still queued or leased
+        """
+        raise NotImplementedError
+
+    def results(self):
+        """
+        (file name, result record) for every file with a result
+        """
+        raise NotImplementedError
+
+    def stats(self):
+        raise NotImplementedError
+
+
+class SQLiteBroker(Broker):
+    """
+    Broker in one SQLite file. Each process opens its own connection;
+    leases are taken inside BEGIN IMMEDIATE so two workers never get the
+    same job.
+    """
+
+    def __init__(self, path, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _transaction(self):
+        return _Transaction(self.conn)
+
+    def enqueue(self, files):
+        now = self.clock()
+        created = 0
+        with self._transaction():
+            for name, data in files:
+                job_hash = content_hash(data)
+                self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?)", (name, job_hash))
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO jobs (hash, name, enqueued_at) VALUES (?, ?, ?)",
+                    (job_hash, name, now)
+                )
+                if cursor.rowcount:
+                    created += 1
+                    self.conn.execute("INSERT OR IGNORE INTO payloads VALUES (?, ?)", (job_hash, data))
+        return created
+
+    def lease(self, worker, count=1, lease_seconds=LEASE_SECONDS):
+        now = self.clock()
+        with self._transaction():
+            rows = self.conn.execute(
+                "SELECT jobs.hash, jobs.name, payloads.data FROM jobs JOIN payloads USING (hash) "
+                "WHERE state = 'queued' OR (state = 'leased' AND lease_until < ?) "
+                "ORDER BY enqueued_at, hash LIMIT ?",
+                (now, count)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE jobs SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                "WHERE hash = ?",
+                [(worker, now + lease_seconds, job_hash) for job_hash, _, _ in rows]
+            )
+        return rows
+
+    def complete(self, worker, job_hash, record, seconds):
+        """
+        Store a result. A job finished twice (its lease ran out while the
+        first worker was still busy) keeps the first result.
+        """
+        with self._transaction():
+            self.conn.execute(
+                "INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?)",
+                (job_hash, json.dumps(record, ensure_ascii=False), worker, seconds)
+            )
+            self.conn.execute(
+                "UPDATE jobs SET state = 'done', finished_at = ?, lease_until = NULL WHERE hash = ?",
+                (self.clock(), job_hash)
+            )
+            self.conn.execute("DELETE FROM payloads WHERE hash = ?", (job_hash,))
+            self.conn.execute(
+                "UPDATE workers SET done = done + 1, busy_seconds = busy_seconds + ?, last_seen = ? "
+                "WHERE worker = ?",
+                (seconds or 0, self.clock(), worker)
+            )
+
+    def fail(self, worker, job_hash, error, max_attempts=MAX_ATTEMPTS):
+        """
+        Put a job back in the queue, or mark it failed after max_attempts
+        """
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+                "error = ?, lease_until = NULL, finished_at = ? WHERE hash = ? AND state = 'leased'",
+                (max_attempts, error, self.clock(), job_hash)
+            )
+            self.conn.execute(
+                "UPDATE workers SET failed = failed + 1, last_seen = ? WHERE worker = ?",
+                (self.clock(), worker)
+            )
+
+    def expire(self, max_attempts=MAX_ATTEMPTS):
+        """
+        Mark jobs whose lease ran out max_attempts times as failed, so a
+        file that keeps killing its worker is not retried forever
+        """
+        with self._transaction():
+            return self.conn.execute(
+                "UPDATE jobs SET state = 'failed', error = 'worker lost ' || attempts || ' times' "
+                "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+                (self.clock(), max_attempts)
+            ).rowcount
+
+    def heartbeat(self, worker, host):
+        now = self.clock()
+        self.conn.execute(
+            "INSERT INTO workers (worker, host, started_at, last_seen) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(worker) DO UPDATE SET last_seen = excluded.last_seen",
+            (worker, host, now, now)
+        )
+
+    def pending(self):
+        return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE state IN ('queued', 'leased')").fetchone()[0]
+
+    def results(self):
+        for name, record in self.conn.execute(
+            "SELECT files.name, results.record FROM files JOIN results USING (hash) ORDER BY files.name"
+        ):
+            yield name, json.loads(record)
+
+    def stats(self):
+        states = dict(self.conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"))
+        workers = []
+        for worker, host, started_at, last_seen, done, failed, busy in self.conn.execute(
+            "SELECT worker, host, started_at, last_seen, done, failed, busy_seconds FROM workers ORDER BY worker"
+        ):
+            elapsed = max(last_seen - started_at, 1e-9)
+            workers.append({
+                "worker": worker,
+                "host": host,
+                "done": done,
+                "failed": failed,
+                "files_per_second": round(done / elapsed, 3),
+                "seconds_per_file": round(busy / done, 3) if done else None,
+                "utilisation": round(min(busy / elapsed, 1.0), 3),
+                "last_seen": last_seen
+            })
+        return {"jobs": states, "workers": workers}
+
+
+class _Transaction:
+    """
+    BEGIN IMMEDIATE ... COMMIT, rolled back on error
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+def enqueue(broker, source, batch=ENQUEUE_BATCH):
+    """
+    Add every resume in source (see screen.iter_resumes), batch files per
+    transaction. Returns (files seen, new jobs).
+    """
+    seen = created = 0
+    pending = []
+    for name, load in iter_resumes(source):
+        pending.append((name, load()))
+        seen += 1
+        if len(pending) >= batch:
+            created += broker.enqueue(pending)
+            pending = []
+    if pending:
+        created += broker.enqueue(pending)
+    return seen, created
+
+
+def work(broker, worker, timeout=DEFAULT_TIMEOUT, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS,
+         batch=1, exit_when_empty=True, poll_seconds=2.0):
+    """
+    Lease, analyse and complete jobs until no job is queued or leased
+    (or forever with exit_when_empty=False). Jobs leased by other workers
+    are waited for, in case their lease runs out and they need running
+    again. Returns the number of jobs processed.
+    """
+    host = socket.gethostname()
+    processed = 0
+    while True:
+        broker.heartbeat(worker, host)
+        broker.expire(max_attempts)
+        jobs = broker.lease(worker, batch, lease_seconds)
+        if not jobs:
+            if exit_when_empty and not broker.pending():
+                return processed
+            time.sleep(poll_seconds)
+            continue
+        for job_hash, name, data in jobs:
+            started = time.perf_counter()
+            try:
+                # Rejected files come back as a record with an "error"
+                record = screen_file(name, bytes(data), timeout)
+            except Exception as e:
+                broker.fail(worker, job_hash, f"{type(e).__name__}: {e}", max_attempts)
+                continue
+            broker.complete(worker, job_hash, record, time.perf_counter() - started)
+            processed += 1
+
+
+def _worker_process(path, worker, options):
+    limit_worker()
+    broker = SQLiteBroker(path)
+    try:
+        work(broker, worker, **options)
+    finally:
+        broker.close()
+
+
+def run_workers(path, workers, **options):
+    """
+    Start `workers` worker processes on this machine and wait for them
+    """
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    processes = [
+        multiprocessing.Process(target=_worker_process, args=(path, f"{prefix}-{i}", options))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+def ranked_table(broker, job_db=None, top=None):
+    """
+    One row per candidate x role they match, ranked within each role by
+    match score, then resume score. Uses BatchScorer, so every role of
+    job_db (default: the roles analyze_resume matches against) is
+    scored, not only the ones each worker suggested.
+    """
+    import pandas as pd
+    from batch_scoring import BatchScorer
+
+    names, skills, resume_scores = [], [], {}
+    for name, record in broker.results():
+        if "error" in record:
+            continue
+        names.append(name)
+        skills.append(record["skills"])
+        resume_scores[name] = record["resume_score"]
+
+    scorer = BatchScorer(JOB_INDEX.roles() if job_db is None else job_db)
+    table = scorer.to_frame(scorer.score(skills), names).rename(columns={"resume": "file", "job": "role"})
+    if table.empty:
+        return table.assign(resume_score=pd.Series(dtype=float), rank=pd.Series(dtype=int))
+    table["resume_score"] = table["file"].map(resume_scores)
+    table = table.astype({"matched_count": int, "missing_count": int})
+    table = table.sort_values(["role", "match_score", "resume_score", "file"],
+                              ascending=[True, False, False, True], kind="mergesort")
+    table["rank"] = table.groupby("role").cumcount() + 1
+    if top is not None:
+        table = table[table["rank"] <= top]
+    return table[["role", "rank", "file", "match_score", "resume_score", "matched_count", "missing_count"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue_parser = commands.add_parser("enqueue", help="add the resumes of a directory or archive")
+    enqueue_parser.add_argument("source")
+
+    work_parser = commands.add_parser("work", help="run worker processes")
+    work_parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    work_parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds allowed per file")
+    work_parser.add_argument("--lease", type=float, default=LEASE_SECONDS, help="seconds before a job is retried")
+    work_parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+    work_parser.add_argument("--batch", type=int, default=1, help="jobs leased at a time")
+    work_parser.add_argument("--forever", action="store_true", help="keep polling when the queue is empty")
+
+    status_parser = commands.add_parser("status", help="job counts and per-worker throughput")
+
+    report_parser = commands.add_parser("report", help="ranked candidates per role")
+    report_parser.add_argument("-o", "--output", help="CSV file to write (default: stdout)")
+    report_parser.add_argument("--top", type=int, help="candidates per role")
+
+    for command in (enqueue_parser, work_parser, status_parser, report_parser):
+        command.add_argument("--db", required=True, help="SQLite queue file")
+    args = parser.parse_args(argv)
+
+    if args.command == "work":
+        run_workers(args.db, args.workers, timeout=args.timeout, lease_seconds=args.lease,
+                    max_attempts=args.max_attempts, batch=args.batch, exit_when_empty=not args.forever)
+        return
+
+    broker = SQLiteBroker(args.db)
+    try:
+        if args.command == "enqueue":
+            seen, created = enqueue(broker, args.source)
+            print(f"{seen} files, {created} new jobs")
+        elif args.command == "status":
+            print(json.dumps(broker.stats(), indent=2))
+        elif args.command == "report":
+            table = ranked_table(broker, top=args.top)
+            table.to_csv(args.output or sys.stdout, index=False)
+    finally:
+        broker.close()
+
+
+if __name__ == "__main__":
+    main()